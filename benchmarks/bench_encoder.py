@@ -0,0 +1,198 @@
+"""Encoder golden-vector check and microbenchmark.
+
+The golden corpus in ``golden/<model>.json`` pins payload -> bytes for every
+WT101 command (and the error raised for invalid input). The microbenchmark
+times each stage of ``encode_payload``: encoder lookup, module load (cache
+hit), the model encoder itself, ``normalize_downlink`` (incl. base64) and
+the whole call end to end.
+
+    python -m benchmarks.bench_encoder --check
+    python -m benchmarks.bench_encoder --bench --save-baseline
+    python -m benchmarks.bench_encoder --check --bench --compare
+
+Exits non-zero when a golden vector mismatches or a stage is slower than the
+saved baseline by more than ``--tolerance``. ``encoder.py`` is loaded by path,
+so neither check needs Home Assistant installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import importlib.util
+import json
+import platform
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from .common import REPO_ROOT
+
+ENCODER_FILE = REPO_ROOT / "custom_components" / "milesight" / "encoder.py"
+GOLDEN_DIR = Path(__file__).parent / "golden"
+BASELINE_FILE = Path(__file__).parent / "baselines" / "encoder.json"
+
+# Payloads exercised by the microbenchmark, from the cheapest command to a
+# multi-frame heating schedule.
+BENCH_PAYLOADS: Dict[str, Dict[str, Any]] = {
+    "reboot": {"reboot": 1},
+    "target_temperature": {"target_temperature": 21, "temperature_tolerance": 1},
+    "child_lock": {"child_lock_config": {"enable": 1}},
+    "heating_schedule_x4": {
+        "heating_schedule": [
+            {
+                "index": i,
+                "enable": 1,
+                "temperature_control_mode": 0,
+                "value": 21,
+                "report_interval": 10,
+                "execute_time": 360 * i,
+                "week_recycle": {"monday": 1, "friday": 1},
+            }
+            for i in range(1, 5)
+        ]
+    },
+}
+
+
+def load_encoder_module():
+    """Import encoder.py standalone (it only depends on the stdlib)."""
+    spec = importlib.util.spec_from_file_location("milesight_encoder", ENCODER_FILE)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses resolve annotations via sys.modules
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+def check_golden(encoder: Any) -> List[str]:
+    """Return a list of human-readable failures (empty when all vectors pass)."""
+    failures: List[str] = []
+    for path in sorted(GOLDEN_DIR.glob("*.json")):
+        vectors = json.loads(path.read_text())["vectors"]
+        for vector in vectors:
+            name = f"{path.stem}:{vector['name']}"
+            try:
+                out = encoder.encode_payload(vector["model"], vector["payload"])
+            except encoder.EncodeError as err:
+                expected_err = vector.get("error")
+                if expected_err is None or expected_err not in str(err):
+                    failures.append(f"{name}: unexpected error {err!r}")
+                continue
+            if "error" in vector:
+                failures.append(f"{name}: expected error {vector['error']!r}, got {out}")
+                continue
+            got = {
+                "confirmed": out["confirmed"],
+                "fport": out["fport"],
+                "hex": base64.b64decode(out["data"]).hex(),
+            }
+            if got != vector["expected"]:
+                failures.append(f"{name}: expected {vector['expected']}, got {got}")
+        print(f"{path.name}: {len(vectors)} vectors")
+    return failures
+
+
+def _time_per_call(func: Callable[[], Any], min_time: float) -> float:
+    """Best-of-5 time per call in microseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(number, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+
+def bench(encoder: Any, min_time: float) -> Dict[str, float]:
+    """Time each stage of encode_payload for every benchmark payload."""
+    results: Dict[str, float] = {}
+    path = encoder._find_encoder_path("wt101")
+    module = encoder._load_encoder(path)
+    results["lookup"] = _time_per_call(lambda: encoder._find_encoder_path("wt101"), min_time)
+    results["load_cached"] = _time_per_call(lambda: encoder._load_encoder(path), min_time)
+    for label, payload in BENCH_PAYLOADS.items():
+        raw = encoder._call_encoder(module, payload, path)
+        results[f"{label}.encode"] = _time_per_call(
+            lambda: encoder._call_encoder(module, payload, path), min_time
+        )
+        results[f"{label}.normalize"] = _time_per_call(
+            lambda: encoder.normalize_downlink(raw, path, payload), min_time
+        )
+        results[f"{label}.end_to_end"] = _time_per_call(
+            lambda: encoder.encode_payload("wt101", payload), min_time
+        )
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    """Return stages that regressed by more than ``tolerance`` (a fraction)."""
+    regressions: List[str] = []
+    for stage, value in results.items():
+        base = baseline.get(stage)
+        if not base:
+            continue
+        if value > base * (1 + tolerance):
+            regressions.append(f"{stage}: {value:.2f}us vs baseline {base:.2f}us (+{(value / base - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="verify the golden corpus")
+    parser.add_argument("--bench", action="store_true", help="run the microbenchmark")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="fail on regressions vs baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing repeat")
+    args = parser.parse_args()
+    if not (args.check or args.bench):
+        args.check = args.bench = True
+
+    encoder = load_encoder_module()
+    status = 0
+
+    if args.check:
+        failures = check_golden(encoder)
+        for failure in failures:
+            print(f"FAIL {failure}")
+        if failures:
+            status = 1
+        else:
+            print("golden vectors OK")
+
+    if args.bench:
+        results = bench(encoder, args.min_time)
+        width = max(len(stage) for stage in results)
+        for stage, value in results.items():
+            print(f"{stage:<{width}}  {value:8.2f} us")
+        if args.compare:
+            if not BASELINE_FILE.exists():
+                print(f"no baseline at {BASELINE_FILE}")
+                status = 1
+            else:
+                baseline = json.loads(BASELINE_FILE.read_text())["results"]
+                regressions = compare(results, baseline, args.tolerance)
+                for regression in regressions:
+                    print(f"SLOWER {regression}")
+                if regressions:
+                    status = 1
+                else:
+                    print(f"no regressions beyond {args.tolerance:.0%}")
+        if args.save_baseline:
+            BASELINE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            BASELINE_FILE.write_text(
+                json.dumps(
+                    {
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "results": {k: round(v, 3) for k, v in results.items()},
+                    },
+                    indent=2,
+                )
+                + "\n"
+            )
+            print(f"baseline written to {BASELINE_FILE}")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
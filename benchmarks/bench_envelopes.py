@@ -0,0 +1,109 @@
+"""Envelope adapter benchmark: ChirpStack v4 / TTN v3 vs the flat Milesight path.
+
+Times ``json.loads`` + adapter per envelope (``envelopes.py`` is loaded by
+path, so this part needs no Home Assistant), and with ``--ingest`` the full
+manager uplink path per envelope using the fakes from ``bench_ingest``.
+
+    python -m benchmarks.bench_envelopes
+    python -m benchmarks.bench_envelopes --ingest --messages 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import sys
+import timeit
+from typing import Dict
+
+from .common import (
+    REPO_ROOT,
+    FakeDeviceRegistry,
+    FakeDispatcher,
+    FakeHass,
+    WT101UplinkGenerator,
+    patch_manager_module,
+)
+
+ENVELOPES_FILE = REPO_ROOT / "custom_components" / "milesight" / "envelopes.py"
+
+
+def load_envelopes_module():
+    spec = importlib.util.spec_from_file_location("milesight_envelopes", ENVELOPES_FILE)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses resolve annotations via sys.modules
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+def _per_call_us(func, number: int) -> float:
+    return min(timeit.repeat(func, repeat=5, number=number)) / number * 1e6
+
+
+def bench_adapters(number: int) -> Dict[str, Dict[str, float]]:
+    envelopes = load_envelopes_module()
+    generator = WT101UplinkGenerator(1)
+    dev_eui = generator.dev_euis[0]
+    results: Dict[str, Dict[str, float]] = {}
+    for name, adapter in envelopes.ENVELOPE_ADAPTERS.items():
+        msg = generator.uplink(dev_eui, envelope=name)
+        topic_dev_eui = dev_eui if name == envelopes.ENVELOPE_MILESIGHT else None
+        parsed = json.loads(msg.payload)
+        uplink = adapter(parsed, topic_dev_eui, None)
+        assert uplink.dev_eui and uplink.dev_eui.lower() == dev_eui, name
+        assert uplink.data.get("temperature") is not None, name
+        results[name] = {
+            "bytes": len(msg.payload),
+            "parse_us": _per_call_us(lambda: json.loads(msg.payload), number),
+            "adapt_us": _per_call_us(lambda: adapter(parsed, topic_dev_eui, None), number),
+        }
+    return results
+
+
+async def bench_ingest(messages: int, devices: int) -> Dict[str, float]:
+    from custom_components.milesight import manager as manager_module
+
+    results: Dict[str, float] = {}
+    for envelope in ("milesight", "chirpstack_v4", "ttn_v3"):
+        patch_manager_module(manager_module, FakeDispatcher(), FakeDeviceRegistry())
+        manager = manager_module.MilesightManager(FakeHass(), "bench", envelope=envelope)
+        generator = WT101UplinkGenerator(devices)
+        msgs = [generator.uplink(envelope=envelope) for _ in range(messages)]
+        start = timeit.default_timer()
+        for msg in msgs:
+            await manager.async_handle_join_uplink(msg)
+        elapsed = timeit.default_timer() - start
+        assert len(manager.devices) == devices, envelope
+        await manager.async_close()
+        results[envelope] = elapsed / messages * 1e6
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--ingest", action="store_true")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--devices", type=int, default=200)
+    args = parser.parse_args()
+
+    adapters = bench_adapters(args.number)
+    flat = adapters["milesight"]
+    print(f"{'envelope':<15}{'bytes':>7}{'parse us':>10}{'adapt us':>10}{'vs flat':>9}")
+    for name, row in adapters.items():
+        total = row["parse_us"] + row["adapt_us"]
+        ratio = total / (flat["parse_us"] + flat["adapt_us"])
+        print(f"{name:<15}{row['bytes']:>7}{row['parse_us']:>10.2f}{row['adapt_us']:>10.2f}{ratio:>8.2f}x")
+
+    if args.ingest:
+        ingest = asyncio.run(bench_ingest(args.messages, args.devices))
+        print()
+        print(f"{'envelope':<15}{'ingest us/msg':>14}{'vs flat':>9}")
+        for name, value in ingest.items():
+            print(f"{name:<15}{value:>14.2f}{value / ingest['milesight']:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
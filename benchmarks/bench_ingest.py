@@ -0,0 +1,163 @@
+"""Uplink ingestion throughput benchmark.
+
+Drives ``MilesightManager.async_handle_join_uplink`` with generated WT101
+uplinks against a fake hass, dispatcher and device registry, so it runs
+offline (no broker, no running Home Assistant). Requires the
+``homeassistant`` package to be importable.
+
+    python -m benchmarks.bench_ingest --devices 2000 --messages 50000
+    python -m benchmarks.bench_ingest --devices 500 --rate 200 --duration 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from .common import (
+    FakeDeviceRegistry,
+    FakeDispatcher,
+    FakeHass,
+    WT101UplinkGenerator,
+    patch_manager_module,
+    summarize,
+)
+
+
+async def _monitor_loop_lag(interval: float, samples: List[float], stop: asyncio.Event) -> None:
+    """Record how late the loop wakes us up relative to the requested sleep."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - start - interval))
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from custom_components.milesight import manager as manager_module
+
+    dispatcher = FakeDispatcher()
+    registry = FakeDeviceRegistry()
+    patch_manager_module(manager_module, dispatcher, registry)
+
+    manager = manager_module.MilesightManager(
+        FakeHass(), "bench", queue_size=args.queue_size
+    )
+    generator = WT101UplinkGenerator(args.devices, seed=args.seed)
+
+    lag_samples: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_monitor_loop_lag(args.lag_interval, lag_samples, stop))
+
+    tracemalloc.start()
+    latencies: List[float] = []
+    perf = time.perf_counter
+
+    # Joins first so every device exists before the steady-state uplinks.
+    for dev_eui in generator.dev_euis:
+        await manager.async_handle_join_uplink(generator.join(dev_eui))
+
+    deadline = perf() + args.duration if args.duration else None
+    period = 1.0 / args.rate if args.rate else 0.0
+    started = perf()
+    next_send = started
+    sent = 0
+    while True:
+        if args.messages and sent >= args.messages:
+            break
+        if deadline and perf() >= deadline:
+            break
+        if period:
+            delay = next_send - perf()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            next_send += period
+        elif sent % args.yield_every == 0:
+            # Let the lag monitor run even when unthrottled.
+            await asyncio.sleep(0)
+        msg = generator.uplink()
+        t0 = perf()
+        await manager.async_handle_join_uplink(msg)
+        latencies.append(perf() - t0)
+        sent += 1
+    # With a queue, the callback only enqueues; wait for the drain task.
+    while manager.queue is not None and len(manager.queue):
+        await asyncio.sleep(0)
+    elapsed = perf() - started
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stop.set()
+    await monitor
+    await manager.async_close()
+
+    return {
+        "devices": args.devices,
+        "messages": sent,
+        "elapsed_s": elapsed,
+        "messages_per_s": sent / elapsed if elapsed else 0.0,
+        "latency_us": {k: v * 1e6 if k != "count" else v for k, v in summarize(latencies).items()},
+        "loop_lag_ms": {k: v * 1e3 if k != "count" else v for k, v in summarize(lag_samples).items()},
+        "peak_memory_kib": peak / 1024,
+        "registry_calls": registry.calls,
+        "dispatcher_sends": dispatcher.sends,
+        "tracked_devices": len(manager.devices),
+        "stages": manager.metrics.as_dict()["stages"],
+        "queue": manager.queue.stats() if manager.queue is not None else None,
+    }
+
+
+def _print_report(result: Dict[str, Any]) -> None:
+    print(f"devices          {result['devices']}")
+    print(f"messages         {result['messages']} in {result['elapsed_s']:.2f}s")
+    print(f"throughput       {result['messages_per_s']:.0f} msg/s")
+    lat = result["latency_us"]
+    print(
+        "latency (us)     p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f}  max {max:.1f}".format(**lat)
+        if lat.get("count")
+        else "latency (us)     n/a"
+    )
+    lag = result["loop_lag_ms"]
+    print(
+        "loop lag (ms)    p50 {p50:.2f}  p95 {p95:.2f}  max {max:.2f}".format(**lag)
+        if lag.get("count")
+        else "loop lag (ms)    n/a"
+    )
+    print(f"peak memory      {result['peak_memory_kib']:.0f} KiB")
+    print(f"registry calls   {result['registry_calls']}")
+    print(f"dispatcher sends {result['dispatcher_sends']}")
+    if result["queue"]:
+        print("queue            " + "  ".join(f"{k} {v}" for k, v in result["queue"].items()))
+    for stage, summary in result["stages"].items():
+        if summary.get("count"):
+            print(f"stage {stage:<10} p50 {summary['p50_ms']:.3f}ms  p95 {summary['p95_ms']:.3f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=20000, help="0 = until --duration")
+    parser.add_argument("--duration", type=float, default=0.0, help="seconds, 0 = until --messages")
+    parser.add_argument("--rate", type=float, default=0.0, help="msg/s, 0 = as fast as possible")
+    parser.add_argument("--lag-interval", type=float, default=0.01)
+    parser.add_argument("--yield-every", type=int, default=100)
+    parser.add_argument("--queue-size", type=int, default=0, help="0 = inline processing")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+    if not args.messages and not args.duration:
+        parser.error("one of --messages or --duration is required")
+
+    result = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_report(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Shared helpers for the offline benchmarks (fakes, uplink generator, stats)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+@dataclass
+class FakeMessage:
+    """Minimal stand-in for mqtt.ReceiveMessage."""
+
+    topic: str
+    payload: str
+
+
+class FakeHass:
+    """Just enough of HomeAssistant for the manager's uplink path."""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, Any] = {}
+
+    def async_create_background_task(self, target: Any, name: str) -> asyncio.Task:
+        return asyncio.get_running_loop().create_task(target, name=name)
+
+
+class FakeDispatcher:
+    """Counts dispatcher sends instead of fanning out to entities."""
+
+    def __init__(self) -> None:
+        self.sends = 0
+        self.new_devices = 0
+
+    def send(self, hass: Any, signal: str, *args: Any) -> None:
+        self.sends += 1
+        if "_new_device_" in signal:
+            self.new_devices += 1
+
+
+class FakeDeviceRegistry:
+    """Records async_get_or_create calls keyed by identifiers."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.devices: Dict[frozenset, Dict[str, Any]] = {}
+
+    def async_get_or_create(self, **kwargs: Any) -> Dict[str, Any]:
+        self.calls += 1
+        key = frozenset(kwargs.get("identifiers") or ())
+        entry = self.devices.setdefault(key, {})
+        entry.update(kwargs)
+        return entry
+
+
+def patch_manager_module(module: Any, dispatcher: FakeDispatcher, registry: FakeDeviceRegistry) -> None:
+    """Point the manager module at the fake dispatcher and device registry."""
+
+    class _Registry:
+        @staticmethod
+        def async_get(_hass: Any) -> FakeDeviceRegistry:
+            return registry
+
+    module.async_dispatcher_send = dispatcher.send
+    module.dr = _Registry
+
+
+def dev_eui_for(index: int) -> str:
+    return f"24e124{index:010x}"
+
+
+class WT101UplinkGenerator:
+    """Produce realistic WT101 join/uplink messages for N devices."""
+
+    def __init__(self, devices: int, seed: int = 1) -> None:
+        self._rng = random.Random(seed)
+        self._dev_euis = [dev_eui_for(i) for i in range(devices)]
+        self._fcnt: Dict[str, int] = {}
+
+    @property
+    def dev_euis(self) -> List[str]:
+        return self._dev_euis
+
+    def join(self, dev_eui: str) -> FakeMessage:
+        payload = {
+            "deviceName": f"WT101 {dev_eui[-4:]}",
+            "model": "WT101",
+            "sn": f"6{dev_eui[-11:]}",
+            "ipso_version": "v0.1",
+            "hardware_version": "v1.0",
+            "firmware_version": "v1.3",
+            "tsl_version": "v1.2",
+            "lorawan_class": 0,
+            "device_status": 1,
+        }
+        return FakeMessage(f"milesight/wt101/{dev_eui}/join", json.dumps(payload))
+
+    def uplink(self, dev_eui: Optional[str] = None, envelope: str = "milesight") -> FakeMessage:
+        rng = self._rng
+        dev_eui = dev_eui or rng.choice(self._dev_euis)
+        fcnt = self._fcnt.get(dev_eui, 0) + 1
+        self._fcnt[dev_eui] = fcnt
+        telemetry = self.telemetry()
+        if envelope == "chirpstack_v4":
+            return FakeMessage(
+                f"application/bench/device/{dev_eui}/event/up",
+                json.dumps(chirpstack_v4_envelope(dev_eui, fcnt, telemetry)),
+            )
+        if envelope == "ttn_v3":
+            return FakeMessage(
+                f"v3/bench@ttn/devices/wt101-{dev_eui}/up",
+                json.dumps(ttn_v3_envelope(dev_eui, fcnt, telemetry)),
+            )
+        payload = {"deviceName": f"WT101 {dev_eui[-4:]}", "fCnt": fcnt, **telemetry}
+        return FakeMessage(f"milesight/wt101/{dev_eui}/uplink", json.dumps(payload))
+
+    def telemetry(self) -> Dict[str, Any]:
+        rng = self._rng
+        return {
+            "battery": rng.randint(40, 100),
+            "temperature": round(rng.uniform(15.0, 25.0), 1),
+            "target_temperature": rng.choice((18, 20, 21, 22)),
+            "valve_opening": rng.randint(0, 100),
+            "tamper_status": 1 if rng.random() < 0.005 else 0,
+            "window_detection": 1 if rng.random() < 0.01 else 0,
+            "motor_stroke": 1200,
+            "motor_position": rng.randint(0, 1200),
+            "freeze_protection": 0,
+        }
+
+
+def chirpstack_v4_envelope(dev_eui: str, fcnt: int, telemetry: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap telemetry the way ChirpStack v4 publishes an ``event/up``."""
+    return {
+        "deduplicationId": f"{dev_eui}-{fcnt}",
+        "time": "2024-01-01T00:00:00Z",
+        "deviceInfo": {
+            "tenantName": "bench",
+            "applicationName": "bench",
+            "deviceProfileName": "WT101",
+            "deviceName": f"WT101 {dev_eui[-4:]}",
+            "devEui": dev_eui,
+        },
+        "devAddr": "01020304",
+        "adr": True,
+        "dr": 5,
+        "fCnt": fcnt,
+        "fPort": 85,
+        "confirmed": False,
+        "data": "AXVkA2cBAQ==",
+        "object": telemetry,
+        "rxInfo": [
+            {"gatewayId": "24e124fffef00001", "rssi": -80, "snr": 7.5, "channel": 1},
+            {"gatewayId": "24e124fffef00002", "rssi": -101, "snr": -2.0, "channel": 1},
+        ],
+        "txInfo": {
+            "frequency": 868100000,
+            "modulation": {"lora": {"bandwidth": 125000, "spreadingFactor": 7, "codeRate": "CR_4_5"}},
+        },
+    }
+
+
+def ttn_v3_envelope(dev_eui: str, fcnt: int, telemetry: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap telemetry the way The Things Stack v3 publishes an uplink."""
+    return {
+        "end_device_ids": {
+            "device_id": f"wt101-{dev_eui}",
+            "application_ids": {"application_id": "bench"},
+            "dev_eui": dev_eui.upper(),
+            "dev_addr": "01020304",
+        },
+        "received_at": "2024-01-01T00:00:00Z",
+        "uplink_message": {
+            "f_port": 85,
+            "f_cnt": fcnt,
+            "frm_payload": "AXVkA2cBAQ==",
+            "decoded_payload": telemetry,
+            "rx_metadata": [
+                {"gateway_ids": {"gateway_id": "gw-1", "eui": "24E124FFFEF00001"}, "rssi": -80, "snr": 7.5},
+                {"gateway_ids": {"gateway_id": "gw-2", "eui": "24E124FFFEF00002"}, "rssi": -101, "snr": -2.0},
+            ],
+            "settings": {
+                "data_rate": {"lora": {"bandwidth": 125000, "spreading_factor": 7}},
+                "frequency": "868100000",
+            },
+            "version_ids": {"brand_id": "milesight-iot", "model_id": "wt101"},
+        },
+    }
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Return min/mean/p50/p95/p99/max for a list of samples."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "min": ordered[0],
+        "mean": sum(ordered) / len(ordered),
+        "p50": percentile(ordered, 50),
+        "p95": percentile(ordered, 95),
+        "p99": percentile(ordered, 99),
+        "max": ordered[-1],
+    }
@@ -2,64 +2,149 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import json
+import time
+from datetime import datetime, timedelta
 
-from homeassistant.components import mqtt
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_NAME, EVENT_CORE_CONFIG_UPDATE
+from homeassistant.core import Event, HomeAssistant, ServiceCall, SupportsResponse
 from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
 import voluptuous as vol
 from homeassistant.helpers.typing import ConfigType
 
 from .const import (
+    CONF_CODEC_DIRS,
+    CONF_CODEC_ISOLATION,
+    CONF_CODEC_TIMEOUT,
+    CONF_CODEC_WATCH_INTERVAL,
+    CONF_DEDUPE_WINDOW,
     CONF_DOWNLINK_TOPIC,
+    CONF_ENVELOPE,
+    CONF_HISTORY_DEPTH,
+    CONF_HISTORY_MAX_MB,
     CONF_JOIN_TOPIC,
+    CONF_QUEUE_SIZE,
+    CONF_STRICT_TELEMETRY,
+    CONF_TIME_SYNC,
     CONF_UPLINK_TOPIC,
+    DATA_PROFILER,
+    DEFAULT_CODEC_DIRS,
+    DEFAULT_CODEC_ISOLATION,
+    DEFAULT_CODEC_TIMEOUT,
+    DEFAULT_CODEC_WATCH_INTERVAL,
+    DEFAULT_DEDUPE_WINDOW,
     DEFAULT_DOWNLINK_TOPIC,
+    DEFAULT_ENVELOPE,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_HISTORY_MAX_MB,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_STRICT_TELEMETRY,
+    DEFAULT_TIME_SYNC,
     DOMAIN,
     PLATFORMS,
 )
-from .encoder import encode_payload, EncodeError
-from .http_view import MilesightDevicesView, MilesightDeviceActionView
-from .manager import MilesightManager
+from .encoder import EncodeError, load_codec_map, reload_encoders
+from .hub import async_get_hub
+from .http_view import (
+    MilesightDeviceActionView,
+    MilesightDeviceView,
+    MilesightDevicesView,
+    MilesightHistoryView,
+)
+from .manager import MilesightManager, loaded_managers, manager_for_device
+from .models import get_model_registry, load_model_registry
+from .profiler import HotPathProfiler, summarize_profile
 
 _LOGGER = logging.getLogger(__name__)
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+SERVICES = (
+    "send_command",
+    "profile",
+    "get_history",
+    "reload_codecs",
+    "set_desired_config",
+    "set_heating_schedule",
+    "delete_device",
+)
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
-    """Set up via YAML (not supported)."""
+    """Set up via YAML (not supported); register the HTTP API once."""
+    hass.http.register_view(MilesightDevicesView(hass))
+    hass.http.register_view(MilesightDeviceView(hass))
+    hass.http.register_view(MilesightDeviceActionView(hass))
+    hass.http.register_view(MilesightHistoryView(hass))
+    return True
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Move tuning options stored in entry.data (version 1) to entry.options."""
+    if entry.version == 1:
+        connection = {CONF_NAME, CONF_JOIN_TOPIC, CONF_UPLINK_TOPIC, CONF_DOWNLINK_TOPIC}
+        data: dict = {}
+        options: dict = {}
+        for key, value in entry.data.items():
+            (data if key in connection else options)[key] = value
+        options.update(entry.options)
+        hass.config_entries.async_update_entry(
+            entry, data=data, options=options, version=2
+        )
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up the integration from a config entry."""
-    manager = MilesightManager(hass, entry.entry_id)
+    # Discover codecs (bundled, entry points, extra dirs) and parse/validate
+    # the model descriptors once, off the event loop
+    await hass.async_add_executor_job(load_codec_map, _codec_dirs(hass))
+    await hass.async_add_executor_job(load_model_registry)
 
-    # Register MQTT listeners
     join_topic = entry.data[CONF_JOIN_TOPIC]
     uplink_topic = entry.data[CONF_UPLINK_TOPIC]
     downlink_topic = entry.data.get(CONF_DOWNLINK_TOPIC) or DEFAULT_DOWNLINK_TOPIC
 
-    try:
-        manager.register_mqtt(
-            await mqtt.async_subscribe(
-                hass, join_topic, manager.async_handle_join_uplink
-            )
+    manager = MilesightManager(
+        hass,
+        entry.entry_id,
+        envelope=entry.options.get(CONF_ENVELOPE, DEFAULT_ENVELOPE),
+        history_depth=entry.options.get(CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH),
+        history_max_bytes=entry.options.get(
+            CONF_HISTORY_MAX_MB, DEFAULT_HISTORY_MAX_MB
         )
+        * 1024
+        * 1024,
+        queue_size=entry.options.get(CONF_QUEUE_SIZE, DEFAULT_QUEUE_SIZE),
+        dedupe_window=entry.options.get(CONF_DEDUPE_WINDOW, DEFAULT_DEDUPE_WINDOW),
+        codec_isolation=entry.options.get(
+            CONF_CODEC_ISOLATION, DEFAULT_CODEC_ISOLATION
+        ),
+        codec_timeout=entry.options.get(CONF_CODEC_TIMEOUT, DEFAULT_CODEC_TIMEOUT),
+        strict_telemetry=entry.options.get(
+            CONF_STRICT_TELEMETRY, DEFAULT_STRICT_TELEMETRY
+        ),
+        downlink_topic=downlink_topic,
+        time_sync=entry.options.get(CONF_TIME_SYNC, DEFAULT_TIME_SYNC),
+        # One profiler for all entries: cProfile hooks the whole interpreter.
+        profiler=hass.data.setdefault(DATA_PROFILER, HotPathProfiler()),
+    )
+
+    # Restore known devices first so entities come up without waiting on MQTT
+    await manager.async_restore()
+
+    # Register MQTT listeners (shared across entries by the ingest hub)
+    try:
         manager.register_mqtt(
-            await mqtt.async_subscribe(
-                hass, uplink_topic, manager.async_handle_join_uplink
+            await async_get_hub(hass).async_register(
+                manager,
+                # The downlink topic is publish-only; its echoes are not uplinks.
+                [topic for topic in (join_topic, uplink_topic) if topic],
             )
         )
-        if downlink_topic:
-            manager.register_mqtt(
-                await mqtt.async_subscribe(
-                    hass, downlink_topic, manager.async_handle_join_uplink
-                )
-            )
     except HomeAssistantError as err:
         raise ConfigEntryNotReady(
             "MQTT is not ready. Configure the MQTT integration and broker credentials first."
@@ -67,39 +152,122 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = manager
-    hass.http.register_view(MilesightDevicesView(manager))
-    hass.http.register_view(MilesightDeviceActionView(manager))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    _register_services(hass, entry, downlink_topic, manager)
+    if not hass.services.has_service(DOMAIN, "send_command"):
+        _register_services(hass)
+
+    if manager.time_sync is not None:
+        manager.async_configure_time_sync(hass.config.time_zone)
+
+        async def _async_core_config_updated(_event: Event) -> None:
+            manager.async_configure_time_sync(hass.config.time_zone)
+
+        entry.async_on_unload(
+            hass.bus.async_listen(EVENT_CORE_CONFIG_UPDATE, _async_core_config_updated)
+        )
+
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+
+    watch_interval = entry.options.get(
+        CONF_CODEC_WATCH_INTERVAL, DEFAULT_CODEC_WATCH_INTERVAL
+    )
+    if watch_interval:
+
+        async def _async_check_codecs(_now) -> None:
+            result = await _async_reload_codecs(hass)
+            if (
+                result["reloaded"]
+                or result["removed"]
+                or result.get("codec_pool_recycled")
+            ):
+                _LOGGER.info("Milesight codecs reloaded: %s", result)
+
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, _async_check_codecs, timedelta(seconds=watch_interval)
+            )
+        )
     return True
 
 
-def _register_services(
-    hass: HomeAssistant,
-    entry: ConfigEntry,
-    topic_template: str,
-    manager: MilesightManager,
-) -> None:
-    """Register services for sending downlinks."""
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Options are read at setup; reload the entry to apply changes."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a config entry."""
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        manager: MilesightManager = hass.data[DOMAIN].pop(entry.entry_id)
+        await manager.async_close()
+        if not hass.data[DOMAIN]:
+            for service in SERVICES:
+                hass.services.async_remove(DOMAIN, service)
+            hass.data.pop(DATA_PROFILER, None)
+    return unload_ok
+
+
+def _command_manager(hass: HomeAssistant, dev_eui: str) -> MilesightManager:
+    """Manager owning ``dev_eui``; the only entry may address unseen devices."""
+    manager = manager_for_device(hass, dev_eui)
+    if manager is None:
+        managers = loaded_managers(hass)
+        if len(managers) != 1:
+            raise vol.Invalid(f"Unknown device {dev_eui}")
+        manager = managers[0]
+    return manager
+
+
+def _codec_dirs(hass: HomeAssistant) -> list[str]:
+    """Extra codec directories configured by the enabled entries, deduplicated."""
+    dirs: dict[str, None] = {}
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.disabled_by is not None:
+            continue
+        extra_dirs = entry.options.get(CONF_CODEC_DIRS, DEFAULT_CODEC_DIRS)
+        for directory in extra_dirs.split(","):
+            if directory.strip():
+                dirs[hass.config.path(directory.strip())] = None
+    return list(dirs)
+
+
+async def _async_reload_codecs(hass: HomeAssistant, force: bool = False) -> dict:
+    """Reload edited codecs once and refresh every entry built on them."""
+    result = await hass.async_add_executor_job(
+        reload_encoders, force, _codec_dirs(hass)
+    )
+    recycled = False
+    for manager in loaded_managers(hass):
+        recycled |= await manager.async_codecs_reloaded(result, force)
+    if recycled:
+        result["codec_pool_recycled"] = True
+    return result
+
+
+def _register_services(hass: HomeAssistant) -> None:
+    """Register the domain services; each call resolves the owning entry."""
+    profiler: HotPathProfiler = hass.data[DATA_PROFILER]
 
     async def _handle_send_command(call):
+        if profiler.active:
+            await profiler.async_profile(_async_send_command, call)
+            return
+        await _async_send_command(call)
+
+    async def _async_send_command(call):
         dev_eui: str = call.data["dev_eui"]
-        model: str = call.data.get("model")
-        payload: dict = call.data.get("payload") or {}
-        topic = _build_downlink_topic(topic_template, model, dev_eui)
+        manager = _command_manager(hass, dev_eui)
         try:
-            encoded = encode_payload(model, payload)
+            await manager.async_send_command(
+                dev_eui,
+                call.data.get("model"),
+                call.data.get("payload") or {},
+                call.data["force"],
+            )
         except EncodeError as err:
             raise vol.Invalid(f"Encode failed: {err}") from err
-        # If encoder returns a normalized downlink dict, publish as JSON; else hex.
-        if isinstance(encoded, dict):
-            message = json.dumps(encoded)
-        elif isinstance(encoded, (bytes, bytearray, list, tuple)):
-            message = bytes(encoded).hex()
-        else:
-            raise vol.Invalid(f"Unsupported encoded payload type: {type(encoded)}")
-        await mqtt.async_publish(hass, topic, message)
 
     hass.services.async_register(
         DOMAIN,
@@ -110,12 +278,198 @@ def _register_services(
                 vol.Required("dev_eui"): str,
                 vol.Optional("model"): str,
                 vol.Required("payload"): dict,
+                vol.Optional("force", default=False): bool,
+            }
+        ),
+    )
+
+    async def _handle_profile(call: ServiceCall):
+        duration: float = call.data["duration"]
+        messages: int | None = call.data.get("messages")
+        top: int = call.data["top"]
+        profiler.start(messages)
+        try:
+            await profiler.async_wait(duration)
+        finally:
+            profile = profiler.stop()
+        path = hass.config.path(
+            f"milesight_profile_{datetime.now():%Y%m%d_%H%M%S}.prof"
+        )
+        await hass.async_add_executor_job(profile.dump_stats, path)
+        _LOGGER.info(
+            "Milesight profile of %s calls written to %s",
+            profiler.calls,
+            path,
+        )
+        return {
+            "path": path,
+            "calls": profiler.calls,
+            "top": await hass.async_add_executor_job(summarize_profile, profile, top),
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        "profile",
+        _handle_profile,
+        schema=vol.Schema(
+            {
+                vol.Optional("duration", default=30): vol.All(
+                    vol.Coerce(float), vol.Range(min=1, max=3600)
+                ),
+                vol.Optional("messages"): vol.All(int, vol.Range(min=1)),
+                vol.Optional("top", default=20): vol.All(
+                    int, vol.Range(min=1, max=200)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _handle_get_history(call: ServiceCall):
+        dev_eui: str = call.data["dev_eui"].lower().strip()
+        manager = manager_for_device(hass, dev_eui)
+        if manager is None:
+            raise vol.Invalid(f"Unknown device {dev_eui}")
+        if manager.history is None:
+            raise vol.Invalid("Telemetry history is disabled (history_depth is 0)")
+        keys: list[str] | None = call.data.get("keys")
+        hours: float | None = call.data.get("hours")
+        since = time.time() - hours * 3600 if hours else None
+        return {
+            "dev_eui": dev_eui,
+            "history": {
+                key: [list(sample) for sample in samples]
+                for key, samples in manager.history.query(dev_eui, keys, since).items()
+            },
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_history",
+        _handle_get_history,
+        schema=vol.Schema(
+            {
+                vol.Required("dev_eui"): str,
+                vol.Optional("keys"): [str],
+                vol.Optional("hours"): vol.All(vol.Coerce(float), vol.Range(min=0)),
             }
         ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _handle_reload_codecs(call: ServiceCall):
+        result = await _async_reload_codecs(hass, call.data["force"])
+        _LOGGER.info("Milesight codecs reloaded: %s", result)
+        return result
+
+    hass.services.async_register(
+        DOMAIN,
+        "reload_codecs",
+        _handle_reload_codecs,
+        schema=vol.Schema({vol.Optional("force", default=False): bool}),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _handle_set_desired_config(call: ServiceCall):
+        dev_euis: list[str] = call.data.get("dev_eui") or []
+        group: str | None = call.data.get("group")
+        managers = loaded_managers(hass)
+        if dev_euis and group is None:
+            # Device policies go to the owning entry, to every entry while unseen.
+            targets: dict[MilesightManager, list[str]] = {}
+            for dev_eui in dev_euis:
+                owner = manager_for_device(hass, dev_eui)
+                for manager in [owner] if owner is not None else managers:
+                    targets.setdefault(manager, []).append(dev_eui)
+        else:
+            # Fleet and group policies apply to every entry.
+            targets = {manager: dev_euis for manager in managers}
+        try:
+            for manager, members in targets.items():
+                manager.set_desired_config(
+                    call.data["config"], members, group, call.data["replace"]
+                )
+        except ValueError as err:
+            raise vol.Invalid(str(err)) from err
+
+    hass.services.async_register(
+        DOMAIN,
+        "set_desired_config",
+        _handle_set_desired_config,
+        schema=vol.Schema(
+            {
+                vol.Required("config"): dict,
+                vol.Optional("dev_eui"): vol.All(cv.ensure_list, [str]),
+                vol.Optional("group"): str,
+                vol.Optional("replace", default=False): bool,
+            }
+        ),
+    )
+
+    async def _handle_set_heating_schedule(call: ServiceCall):
+        slots: list[dict] = call.data["schedule"]
+        indexes = [slot["index"] for slot in slots]
+        if len(indexes) != len(set(indexes)):
+            raise vol.Invalid("Schedule slot indexes must be unique")
+        owners: dict[MilesightManager, list[str]] = {}
+        progress: dict[str, object] = {}
+        for dev_eui in call.data["dev_eui"]:
+            manager = manager_for_device(hass, dev_eui)
+            if manager is None:
+                progress[dev_eui.lower().strip()] = {"error": "unknown device"}
+            else:
+                owners.setdefault(manager, []).append(dev_eui)
+        # Validate every slot with each target codec up front; frames go out later.
+        models = get_model_registry()
+        codecs = {
+            (manager, models.codec(manager.devices[dev_eui.lower().strip()].model))
+            for manager, members in owners.items()
+            for dev_eui in members
+        }
+        for manager, codec in codecs:
+            results = await asyncio.gather(
+                *(
+                    manager.async_encode(codec, {"heating_schedule": [slot]})
+                    for slot in slots
+                ),
+                return_exceptions=True,
+            )
+            for slot, result in zip(slots, results):
+                if isinstance(result, EncodeError):
+                    raise vol.Invalid(f"Slot {slot['index']}: {result}") from result
+                if isinstance(result, BaseException):
+                    raise result
+        for manager, members in owners.items():
+            progress.update(manager.program_heating_schedule(members, slots))
+        return progress
+
+    hass.services.async_register(
+        DOMAIN,
+        "set_heating_schedule",
+        _handle_set_heating_schedule,
+        schema=vol.Schema(
+            {
+                vol.Required("dev_eui"): vol.All(cv.ensure_list, [str]),
+                vol.Required("schedule"): vol.All(
+                    cv.ensure_list,
+                    [
+                        vol.Schema(
+                            {vol.Required("index"): vol.Coerce(int)},
+                            extra=vol.ALLOW_EXTRA,
+                        )
+                    ],
+                    vol.Length(min=1),
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     async def _handle_delete_device(call):
         dev_eui: str = call.data["dev_eui"]
+        manager = manager_for_device(hass, dev_eui)
+        if manager is None:
+            raise vol.Invalid(f"Unknown device {dev_eui}")
         await manager.async_delete_device(dev_eui)
 
     hass.services.async_register(
@@ -124,23 +478,3 @@ def _register_services(
         _handle_delete_device,
         schema=vol.Schema({vol.Required("dev_eui"): str}),
     )
-
-
-def _build_downlink_topic(template: str, model: str, dev_eui: str) -> str:
-    """Build a downlink topic from a template and identifiers."""
-    if not template:
-        return f"milesight/{model}/{dev_eui}/downlink"
-    if "{model}" in template or "{dev_eui}" in template:
-        return template.format(model=model, dev_eui=dev_eui)
-    if "+" in template:
-        parts = template.split("+", 2)
-        filled = []
-        replacements = [model, dev_eui]
-        repl_idx = 0
-        for part in parts:
-            filled.append(part)
-            if repl_idx < len(replacements):
-                filled.append(replacements[repl_idx])
-                repl_idx += 1
-        return "".join(filled)
-    return template
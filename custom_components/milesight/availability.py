@@ -0,0 +1,103 @@
+"""Device availability tracking driven by one shared timer."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Grace before a device is considered offline: this many missed reports.
+MISSED_REPORTS = 2.5
+MIN_TIMEOUT = 120.0
+
+
+class AvailabilityTracker:
+    """Expire devices that stop reporting.
+
+    Deadlines live in a min-heap with lazy deletion; a single loop timer is
+    armed for the earliest one, so an expiry pass only touches the entries
+    that are actually due instead of every tracked device.
+    """
+
+    def __init__(self, on_change: Callable[[str, bool], None]) -> None:
+        self._on_change = on_change
+        self._heap: List[Tuple[float, str]] = []
+        self._deadlines: Dict[str, float] = {}
+        self._offline: set[str] = set()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_when: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def seen(self, dev_eui: str, interval: float, age: float = 0.0) -> None:
+        """Record an uplink; ``interval`` is the expected report period (s).
+
+        ``age`` is how long ago the uplink arrived (restored devices); one
+        whose grace has already run out goes offline right away.
+        """
+        loop = self._loop
+        if loop is None:
+            loop = self._loop = asyncio.get_running_loop()
+        now = loop.time()
+        deadline = now - max(age, 0.0) + max(interval * MISSED_REPORTS, MIN_TIMEOUT)
+        if deadline <= now:
+            self._deadlines.pop(dev_eui, None)
+            if dev_eui not in self._offline:
+                self._offline.add(dev_eui)
+                self._on_change(dev_eui, False)
+            return
+        self._deadlines[dev_eui] = deadline
+        heapq.heappush(self._heap, (deadline, dev_eui))
+        if len(self._heap) > 4 * len(self._deadlines) + 64:
+            self._compact()
+        if dev_eui in self._offline:
+            self._offline.discard(dev_eui)
+            self._on_change(dev_eui, True)
+        if self._timer_when is None or deadline < self._timer_when:
+            self._schedule(deadline)
+
+    def forget(self, dev_eui: str) -> None:
+        self._deadlines.pop(dev_eui, None)
+        self._offline.discard(dev_eui)
+
+    def is_offline(self, dev_eui: str) -> bool:
+        return dev_eui in self._offline
+
+    @property
+    def offline_count(self) -> int:
+        return len(self._offline)
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._timer_when = None
+
+    def _compact(self) -> None:
+        """Drop superseded heap entries."""
+        self._heap = [(d, dev) for dev, d in self._deadlines.items()]
+        heapq.heapify(self._heap)
+
+    def _schedule(self, when: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        assert self._loop is not None
+        self._timer = self._loop.call_at(when, self._expire)
+        self._timer_when = when
+
+    def _expire(self) -> None:
+        self._timer = None
+        self._timer_when = None
+        assert self._loop is not None
+        now = self._loop.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, dev_eui = heapq.heappop(heap)
+            if self._deadlines.get(dev_eui) != deadline:
+                continue  # superseded by a later uplink or forgotten
+            del self._deadlines[dev_eui]
+            self._offline.add(dev_eui)
+            self._on_change(dev_eui, False)
+        while heap and self._deadlines.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        if heap:
+            self._schedule(heap[0][0])
@@ -12,30 +12,46 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, SIGNAL_DEVICE_UPDATED, SIGNAL_NEW_DEVICE
+from .const import (
+    CONF_ENTITY_PROFILE,
+    DEFAULT_ENTITY_PROFILE,
+    DOMAIN,
+    SIGNAL_DEVICE_UPDATED,
+    SIGNAL_NEW_DEVICE,
+)
+from .entity import MilesightDeviceEntity
 from .manager import MilesightManager, MilesightDevice
-from .models import MODEL_BINARIES
+from .models import get_model_registry
+from .profiles import include_description, replaced_by_climate
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     manager: MilesightManager = hass.data[DOMAIN][entry.entry_id]
+    profile = entry.options.get(CONF_ENTITY_PROFILE, DEFAULT_ENTITY_PROFILE)
+    models = get_model_registry()
 
     @callback
     def _async_add_device(dev_eui: str) -> None:
         device = manager.get_device(dev_eui)
         if not device:
             return
-        descriptions = MODEL_BINARIES.get(device.model)
-        if not descriptions:
+        descriptor = models.get(device.model)
+        if descriptor is None:
             return
+        descriptions = descriptor.binary_sensors
         entities: list[MilesightBinarySensor] = []
         for description in descriptions:
+            if not include_description(profile, description):
+                continue
+            if replaced_by_climate(entry.options, device.model, description.key):
+                continue
             entities.append(
                 MilesightBinarySensor(manager, device, description, entry.entry_id)
             )
-        async_add_entities(entities)
+        if entities:
+            async_add_entities(entities)
 
     for dev_eui in list(manager.devices.keys()):
         _async_add_device(dev_eui)
@@ -47,7 +63,7 @@ async def async_setup_entry(
     )
 
 
-class MilesightBinarySensor(BinarySensorEntity):
+class MilesightBinarySensor(MilesightDeviceEntity, BinarySensorEntity):
     """Binary sensor for Milesight telemetry."""
 
     _attr_should_poll = False
@@ -83,18 +99,10 @@ class MilesightBinarySensor(BinarySensorEntity):
         device = self._manager.get_device(self._dev_eui)
         if not device:
             return
-        value = device.telemetry.get(self.entity_description.key)
-        self._attr_is_on = self._as_on(self.entity_description.key, value)
-        self._attr_extra_state_attributes = {"last_seen": device.last_seen.isoformat()}
+        # Telemetry is normalized to bool by the model schema at ingest.
+        self._attr_is_on = bool(device.telemetry.get(self.entity_description.key))
+        self._attr_extra_state_attributes = {
+            "last_seen": device.last_seen.isoformat(),
+            "stale": device.stale,
+        }
         self.async_write_ha_state()
-
-    def _as_on(self, key: str, value) -> bool:
-        """Map raw telemetry to boolean."""
-        if value is None:
-            return False
-        if isinstance(value, str):
-            value_norm = value.lower()
-        else:
-            value_norm = value
-
-        return bool(value_norm)
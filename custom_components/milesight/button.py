@@ -7,31 +7,44 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, SIGNAL_NEW_DEVICE
+from .const import (
+    CONF_ENTITY_PROFILE,
+    DEFAULT_ENTITY_PROFILE,
+    DOMAIN,
+    SIGNAL_NEW_DEVICE,
+)
 from .manager import MilesightManager
+from .models import get_model_registry
+from .profiles import include_control
 from .buttons import MilesightRebootButton, MilesightReportStatusButton
 
-_SUPPORTED_REBOOT_MODELS = {"WT101"}
-_SUPPORTED_REPORT_STATUS_MODELS = {"WT101"}
+# Control key (see models/registry.py) -> entity class
+_CONTROLS = {
+    "reboot": MilesightRebootButton,
+    "report_status": MilesightReportStatusButton,
+}
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     manager: MilesightManager = hass.data[DOMAIN][entry.entry_id]
+    profile = entry.options.get(CONF_ENTITY_PROFILE, DEFAULT_ENTITY_PROFILE)
+    models = get_model_registry()
 
     @callback
     def _async_add_device(dev_eui: str) -> None:
         device = manager.get_device(dev_eui)
         if not device:
             return
-        entities = []
-        if device.model.upper() in _SUPPORTED_REBOOT_MODELS:
-            entities.append(MilesightRebootButton(manager, device, entry.entry_id))
-        if device.model.upper() in _SUPPORTED_REPORT_STATUS_MODELS:
-            entities.append(
-                MilesightReportStatusButton(manager, device, entry.entry_id)
-            )
+        descriptor = models.get(device.model)
+        if descriptor is None:
+            return
+        entities = [
+            entity_cls(manager, device, entry.entry_id)
+            for key, entity_cls in _CONTROLS.items()
+            if key in descriptor.controls and include_control(profile, key)
+        ]
         if entities:
             async_add_entities(entities)
 
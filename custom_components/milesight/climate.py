@@ -0,0 +1,40 @@
+"""Climate entities for Milesight thermostats."""
+
+from __future__ import annotations
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .climates import MilesightThermostatClimate
+from .const import DOMAIN, SIGNAL_NEW_DEVICE
+from .manager import MilesightManager
+from .models import get_model_registry
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    manager: MilesightManager = hass.data[DOMAIN][entry.entry_id]
+    models = get_model_registry()
+
+    @callback
+    def _async_add_device(dev_eui: str) -> None:
+        device = manager.get_device(dev_eui)
+        if not device:
+            return
+        descriptor = models.get(device.model)
+        if descriptor is not None and descriptor.climate:
+            async_add_entities(
+                [MilesightThermostatClimate(manager, device, entry.entry_id)]
+            )
+
+    for dev_eui in list(manager.devices.keys()):
+        _async_add_device(dev_eui)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICE.format(entry_id=entry.entry_id), _async_add_device
+        )
+    )
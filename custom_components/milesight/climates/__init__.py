@@ -0,0 +1,7 @@
+"""Climate entity helpers for Milesight."""
+
+from __future__ import annotations
+
+from .thermostat import MilesightThermostatClimate
+
+__all__ = ["MilesightThermostatClimate"]
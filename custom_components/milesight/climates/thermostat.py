@@ -0,0 +1,145 @@
+"""Thermostat climate entity consolidating WT101 temperature state."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.climate import (
+    ClimateEntity,
+    ClimateEntityFeature,
+    HVACAction,
+    HVACMode,
+)
+from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo
+
+from ..const import DOMAIN, SIGNAL_DEVICE_UPDATED
+from ..entity import MilesightDeviceEntity
+from ..manager import MilesightManager, MilesightDevice
+
+PRESET_AUTO = "auto"
+PRESET_MANUAL = "manual"
+# temperature_control_mode as normalized by the model telemetry schema
+_PRESETS = {0: PRESET_AUTO, 1: PRESET_MANUAL}
+
+
+class MilesightThermostatClimate(MilesightDeviceEntity, ClimateEntity):
+    """Current/target temperature, HVAC action and presets in one entity."""
+
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+    _attr_name = None
+    _attr_temperature_unit = UnitOfTemperature.CELSIUS
+    # The encoder writes the setpoint as a whole degree.
+    _attr_target_temperature_step = 1
+    _attr_hvac_modes = [HVACMode.HEAT, HVACMode.OFF]
+    _attr_preset_modes = [PRESET_AUTO, PRESET_MANUAL]
+    _attr_supported_features = (
+        ClimateEntityFeature.TARGET_TEMPERATURE
+        | ClimateEntityFeature.PRESET_MODE
+        | ClimateEntityFeature.TURN_ON
+        | ClimateEntityFeature.TURN_OFF
+    )
+    _enable_turn_on_off_backwards_compatibility = False
+
+    def __init__(
+        self,
+        manager: MilesightManager,
+        device: MilesightDevice,
+        entry_id: str,
+    ) -> None:
+        self._manager = manager
+        self._dev_eui = device.dev_eui.lower()
+        self._entry_id = entry_id
+        self._attr_unique_id = f"{self._entry_id}_{self._dev_eui}_climate"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, self._dev_eui)})
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_DEVICE_UPDATED.format(
+                    entry_id=self._entry_id, dev_eui=self._dev_eui
+                ),
+                self._async_handle_update,
+            )
+        )
+        self._async_handle_update(self._dev_eui)
+
+    @callback
+    def _async_handle_update(self, _dev_eui: str) -> None:
+        device = self._manager.get_device(self._dev_eui)
+        if not device:
+            return
+        telemetry = device.telemetry
+        self._attr_current_temperature = telemetry.get("temperature")
+        self._attr_target_temperature = telemetry.get("target_temperature")
+        self._attr_min_temp = telemetry.get("min_target_temperature", 10)
+        self._attr_max_temp = telemetry.get("max_target_temperature", 28)
+
+        if telemetry.get("temperature_control_enable", True):
+            self._attr_hvac_mode = HVACMode.HEAT
+        else:
+            self._attr_hvac_mode = HVACMode.OFF
+
+        valve = telemetry.get("valve_opening")
+        if self._attr_hvac_mode == HVACMode.OFF:
+            self._attr_hvac_action = HVACAction.OFF
+        elif isinstance(valve, (int, float)):
+            self._attr_hvac_action = HVACAction.HEATING if valve > 0 else HVACAction.IDLE
+        else:
+            self._attr_hvac_action = None
+
+        self._attr_preset_mode = _PRESETS.get(telemetry.get("temperature_control_mode"))
+
+        self._attr_extra_state_attributes = {
+            "last_seen": device.last_seen.isoformat(),
+            "model": device.model,
+            "stale": device.stale,
+            "valve_opening": valve,
+            "freeze_protection": telemetry.get("freeze_protection"),
+        }
+        self.async_write_ha_state()
+
+    async def _async_send(self, payload: dict) -> None:
+        dev = self._manager.get_device(self._dev_eui)
+        if not dev:
+            return
+        await self.hass.services.async_call(
+            DOMAIN,
+            "send_command",
+            {"dev_eui": self._dev_eui, "model": dev.model.lower(), "payload": payload},
+            blocking=True,
+        )
+
+    async def async_set_temperature(self, **kwargs: Any) -> None:
+        """Send downlink to set target temperature."""
+        if (value := kwargs.get(ATTR_TEMPERATURE)) is None:
+            return
+        dev = self._manager.get_device(self._dev_eui)
+        tolerance = dev.telemetry.get("temperature_tolerance", 1) if dev else 1
+        await self._async_send(
+            {"target_temperature": float(value), "temperature_tolerance": tolerance}
+        )
+        self._attr_target_temperature = float(value)
+        self.async_write_ha_state()
+
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+        enable = 0 if hvac_mode == HVACMode.OFF else 1
+        await self._async_send({"temperature_control": {"enable": enable}})
+        self._attr_hvac_mode = hvac_mode
+        self.async_write_ha_state()
+
+    async def async_turn_on(self) -> None:
+        await self.async_set_hvac_mode(HVACMode.HEAT)
+
+    async def async_turn_off(self) -> None:
+        await self.async_set_hvac_mode(HVACMode.OFF)
+
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
+        mode = 0 if preset_mode == PRESET_AUTO else 1
+        await self._async_send({"temperature_control": {"mode": mode}})
+        self._attr_preset_mode = preset_mode
+        self.async_write_ha_state()
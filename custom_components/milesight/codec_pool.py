@@ -0,0 +1,214 @@
+"""Run untrusted codecs in a small worker process pool."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .encoder import EncodeError, encode_batch, is_builtin_encoder, normalize_downlink
+
+_LOGGER = logging.getLogger(__name__)
+
+CODEC_ISOLATION_OFF = "off"
+CODEC_ISOLATION_THIRD_PARTY = "third_party"
+CODEC_ISOLATION_ALL = "all"
+CODEC_ISOLATION_MODES = [
+    CODEC_ISOLATION_OFF,
+    CODEC_ISOLATION_THIRD_PARTY,
+    CODEC_ISOLATION_ALL,
+]
+
+POOL_WORKERS = 2
+# Calls arriving within this window for the same encoder share one round trip.
+BATCH_WINDOW = 0.005
+# Extra parent-side slack before a silent worker is considered hung.
+TIMEOUT_GRACE = 2.0
+
+_Request = Tuple[Dict[str, object], "asyncio.Future[Dict[str, object]]"]
+
+
+class CodecPool:
+    """Batch encode calls into worker processes with per-call timeouts.
+
+    Workers enforce the timeout per payload; if a whole batch overruns
+    (e.g. a codec blocks signals), the pool is terminated and recreated.
+    Workers keep their own encoder module cache, so the pool is recycled
+    when codecs are reloaded or a source it has served changes.
+    """
+
+    def __init__(self, mode: str, timeout: float, workers: int = POOL_WORKERS) -> None:
+        self.mode = mode
+        self.timeout = timeout
+        self._workers = workers
+        self._pool: Any = None
+        self._starting: Optional[asyncio.Future[None]] = None
+        self._pending: Dict[Path, List[_Request]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Source mtime of each encoder sent to the current workers.
+        self._sources: Dict[Path, Optional[float]] = {}
+        self.calls = 0
+        self.batches = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.recycles = 0
+
+    def isolates(self, path: Path) -> bool:
+        """Return True if ``path`` must run in a worker under this mode."""
+        if self.mode == CODEC_ISOLATION_ALL:
+            return True
+        return self.mode == CODEC_ISOLATION_THIRD_PARTY and not is_builtin_encoder(path)
+
+    async def async_encode(
+        self, path: Path, payload: Dict[str, object]
+    ) -> Dict[str, object]:
+        """Encode ``payload`` with the encoder at ``path`` in a worker."""
+        loop = asyncio.get_running_loop()
+        if path not in self._sources:
+            self._sources[path] = await loop.run_in_executor(None, _mtime, path)
+        if self._pool is None:
+            if self._starting is None:
+                # Spawning processes blocks; do it off the loop.
+                self._starting = loop.run_in_executor(None, self._start_pool)
+            try:
+                await self._starting
+            finally:
+                self._starting = None
+        future: asyncio.Future[Dict[str, object]] = loop.create_future()
+        self._pending.setdefault(path, []).append((payload, future))
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(BATCH_WINDOW, self._flush)
+        self.calls += 1
+        return await future
+
+    def sources_changed(self) -> bool:
+        """Return True if an encoder the workers loaded changed (blocking)."""
+        return any(_mtime(path) != mtime for path, mtime in list(self._sources.items()))
+
+    def recycle(self) -> None:
+        """Retire the workers; the next call starts fresh ones.
+
+        Batches already sent finish on the retired workers.
+        """
+        self._sources.clear()
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        self.recycles += 1
+        pool.close()
+        # join() waits for the retired workers; keep it off the loop.
+        asyncio.get_running_loop().run_in_executor(None, pool.join)
+
+    def _start_pool(self) -> None:
+        self._pool = multiprocessing.get_context("spawn").Pool(self._workers)
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        loop = asyncio.get_running_loop()
+        pool = self._pool
+        for path, requests in pending.items():
+            self.batches += 1
+            payloads = [payload for payload, _future in requests]
+            deadline = loop.call_later(
+                self.timeout * len(requests) + TIMEOUT_GRACE,
+                self._batch_timed_out,
+                requests,
+                pool,
+            )
+            try:
+                if pool is None:
+                    raise ValueError("pool not running")
+                pool.apply_async(
+                    encode_batch,
+                    (str(path), payloads, self.timeout),
+                    callback=lambda results, p=path, r=requests, d=deadline: (
+                        loop.call_soon_threadsafe(self._resolve, p, r, d, results)
+                    ),
+                    error_callback=lambda err, r=requests, d=deadline: (
+                        loop.call_soon_threadsafe(self._fail, r, d, err)
+                    ),
+                )
+            except ValueError as err:  # pool closed underneath us
+                self._fail(requests, deadline, err)
+
+    def _resolve(
+        self,
+        path: Path,
+        requests: List[_Request],
+        deadline: asyncio.TimerHandle,
+        results: List[Tuple[bool, Any]],
+    ) -> None:
+        deadline.cancel()
+        for (payload, future), (ok, value) in zip(requests, results):
+            if future.done():
+                continue
+            if not ok:
+                if "timed out" in value:
+                    self.timeouts += 1
+                future.set_exception(EncodeError(value))
+                continue
+            try:
+                future.set_result(normalize_downlink(value, path, payload))
+            except EncodeError as err:
+                future.set_exception(err)
+
+    def _fail(
+        self, requests: List[_Request], deadline: asyncio.TimerHandle, err: BaseException
+    ) -> None:
+        deadline.cancel()
+        for _payload, future in requests:
+            if not future.done():
+                future.set_exception(EncodeError(f"codec worker failed: {err}"))
+
+    def _batch_timed_out(self, requests: List[_Request], pool: Any) -> None:
+        self.timeouts += 1
+        for _payload, future in requests:
+            if not future.done():
+                future.set_exception(EncodeError("codec worker timed out"))
+        if pool is None:
+            return
+        if pool is not self._pool:
+            # Replaced after an earlier hang or retired by a codec reload;
+            # terminate() is idempotent and unblocks the pending join().
+            asyncio.get_running_loop().run_in_executor(None, pool.terminate)
+            return
+        _LOGGER.warning("Codec worker hung; restarting the codec pool")
+        self.restarts += 1
+        self._pool = None
+        # terminate() joins the workers; keep it off the loop.
+        asyncio.get_running_loop().run_in_executor(None, pool.terminate)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "mode": self.mode,
+            "running": self._pool is not None,
+            "calls": self.calls,
+            "batches": self.batches,
+            "timeouts": self.timeouts,
+            "restarts": self.restarts,
+            "recycles": self.recycles,
+        }
+
+    async def async_close(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for requests in self._pending.values():
+            for _payload, future in requests:
+                if not future.done():
+                    future.cancel()
+        self._pending.clear()
+        self._sources.clear()
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.get_running_loop().run_in_executor(None, pool.terminate)
+
+
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
@@ -5,17 +5,47 @@ from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
+    CONF_CLIMATE_REPLACES_ENTITIES,
+    CONF_CODEC_DIRS,
+    CONF_CODEC_ISOLATION,
+    CONF_CODEC_TIMEOUT,
+    CONF_CODEC_WATCH_INTERVAL,
+    CONF_DEDUPE_WINDOW,
     CONF_DOWNLINK_TOPIC,
+    CONF_ENTITY_PROFILE,
+    CONF_ENVELOPE,
+    CONF_HISTORY_DEPTH,
+    CONF_HISTORY_MAX_MB,
     CONF_JOIN_TOPIC,
+    CONF_QUEUE_SIZE,
+    CONF_STRICT_TELEMETRY,
+    CONF_TIME_SYNC,
     CONF_UPLINK_TOPIC,
+    DEFAULT_CLIMATE_REPLACES_ENTITIES,
+    DEFAULT_CODEC_DIRS,
+    DEFAULT_CODEC_ISOLATION,
+    DEFAULT_CODEC_TIMEOUT,
+    DEFAULT_CODEC_WATCH_INTERVAL,
+    DEFAULT_DEDUPE_WINDOW,
     DEFAULT_DOWNLINK_TOPIC,
+    DEFAULT_ENTITY_PROFILE,
+    DEFAULT_ENVELOPE,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_HISTORY_MAX_MB,
     DEFAULT_JOIN_TOPIC,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_STRICT_TELEMETRY,
+    DEFAULT_TIME_SYNC,
     DEFAULT_UPLINK_TOPIC,
     DOMAIN,
+    ENTITY_PROFILES,
 )
+from .codec_pool import CODEC_ISOLATION_MODES
+from .envelopes import ENVELOPE_ADAPTERS
 
 
 def _schema(user_input: dict | None = None) -> vol.Schema:
@@ -39,10 +69,74 @@ def _schema(user_input: dict | None = None) -> vol.Schema:
     )
 
 
+def _options_schema(options: dict | None = None) -> vol.Schema:
+    defaults = options or {}
+    return vol.Schema(
+        {
+            vol.Optional(
+                CONF_ENVELOPE,
+                default=defaults.get(CONF_ENVELOPE, DEFAULT_ENVELOPE),
+            ): vol.In(list(ENVELOPE_ADAPTERS)),
+            vol.Optional(
+                CONF_HISTORY_DEPTH,
+                default=defaults.get(CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10080)),
+            vol.Optional(
+                CONF_HISTORY_MAX_MB,
+                default=defaults.get(CONF_HISTORY_MAX_MB, DEFAULT_HISTORY_MAX_MB),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1024)),
+            vol.Optional(
+                CONF_QUEUE_SIZE,
+                default=defaults.get(CONF_QUEUE_SIZE, DEFAULT_QUEUE_SIZE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000000)),
+            vol.Optional(
+                CONF_DEDUPE_WINDOW,
+                default=defaults.get(CONF_DEDUPE_WINDOW, DEFAULT_DEDUPE_WINDOW),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+            vol.Optional(
+                CONF_ENTITY_PROFILE,
+                default=defaults.get(CONF_ENTITY_PROFILE, DEFAULT_ENTITY_PROFILE),
+            ): vol.In(ENTITY_PROFILES),
+            vol.Optional(
+                CONF_CLIMATE_REPLACES_ENTITIES,
+                default=defaults.get(
+                    CONF_CLIMATE_REPLACES_ENTITIES, DEFAULT_CLIMATE_REPLACES_ENTITIES
+                ),
+            ): bool,
+            vol.Optional(
+                CONF_CODEC_WATCH_INTERVAL,
+                default=defaults.get(
+                    CONF_CODEC_WATCH_INTERVAL, DEFAULT_CODEC_WATCH_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+            vol.Optional(
+                CONF_CODEC_ISOLATION,
+                default=defaults.get(CONF_CODEC_ISOLATION, DEFAULT_CODEC_ISOLATION),
+            ): vol.In(CODEC_ISOLATION_MODES),
+            vol.Optional(
+                CONF_CODEC_TIMEOUT,
+                default=defaults.get(CONF_CODEC_TIMEOUT, DEFAULT_CODEC_TIMEOUT),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=60)),
+            vol.Optional(
+                CONF_CODEC_DIRS,
+                default=defaults.get(CONF_CODEC_DIRS, DEFAULT_CODEC_DIRS),
+            ): str,
+            vol.Optional(
+                CONF_STRICT_TELEMETRY,
+                default=defaults.get(CONF_STRICT_TELEMETRY, DEFAULT_STRICT_TELEMETRY),
+            ): bool,
+            vol.Optional(
+                CONF_TIME_SYNC,
+                default=defaults.get(CONF_TIME_SYNC, DEFAULT_TIME_SYNC),
+            ): bool,
+        }
+    )
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for the integration."""
 
-    VERSION = 1
+    VERSION = 2
 
     async def async_step_user(self, user_input=None) -> FlowResult:
         if user_input is not None:
@@ -50,28 +144,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(step_id="user", data_schema=_schema(), errors={})
 
-
-async def async_get_options_flow(
-    entry: config_entries.ConfigEntry,
-) -> config_entries.OptionsFlow:
-    return OptionsFlowHandler(entry)
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        return OptionsFlowHandler()
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
-    """Handle options for the integration."""
-
-    def __init__(self, entry: config_entries.ConfigEntry) -> None:
-        self.config_entry = entry
+    """Handle options for the integration; stored in ``entry.options``."""
 
     async def async_step_init(self, user_input=None) -> FlowResult:
         if user_input is not None:
-            data = {**self.config_entry.data, **user_input}
-            self.hass.config_entries.async_update_entry(self.config_entry, data=data)
-            return self.async_create_entry(title="", data={})
+            return self.async_create_entry(title="", data=user_input)
 
         return self.async_show_form(
             step_id="init",
-            data_schema=_schema(
-                {**self.config_entry.data, **self.config_entry.options}
-            ),
+            data_schema=_options_schema(dict(self.config_entry.options)),
         )
@@ -1,18 +1,75 @@
 """Constants for the Milesight integration."""
 
 DOMAIN = "milesight"
+DATA_HUB = f"{DOMAIN}_ingest_hub"
+DATA_PROFILER = f"{DOMAIN}_profiler"
 
 CONF_JOIN_TOPIC = "join_topic"
 CONF_UPLINK_TOPIC = "uplink_topic"
 CONF_DOWNLINK_TOPIC = "downlink_topic"
+CONF_ENVELOPE = "envelope"
+CONF_HISTORY_DEPTH = "history_depth"
+CONF_HISTORY_MAX_MB = "history_max_mb"
+CONF_QUEUE_SIZE = "queue_size"
+CONF_DEDUPE_WINDOW = "dedupe_window"
+CONF_ENTITY_PROFILE = "entity_profile"
+CONF_CLIMATE_REPLACES_ENTITIES = "climate_replaces_entities"
+CONF_CODEC_WATCH_INTERVAL = "codec_watch_interval"
+CONF_CODEC_ISOLATION = "codec_isolation"
+CONF_CODEC_TIMEOUT = "codec_timeout"
+CONF_CODEC_DIRS = "codec_dirs"
+CONF_STRICT_TELEMETRY = "strict_telemetry"
+CONF_TIME_SYNC = "time_sync"
 
 # Topic pattern: milesight/{model}/{dev_eui}/{action}
 DEFAULT_JOIN_TOPIC = "milesight/+/+/join"
 DEFAULT_UPLINK_TOPIC = "milesight/+/+/uplink"
 DEFAULT_DOWNLINK_TOPIC = "milesight/+/+/downlink"
 
-PLATFORMS = ["sensor", "binary_sensor", "switch", "number", "button"]
+# Uplink JSON layout produced by the network server (see envelopes.py)
+DEFAULT_ENVELOPE = "milesight"
+
+# In-memory telemetry history: samples per key (0 disables) and memory cap
+DEFAULT_HISTORY_DEPTH = 288
+DEFAULT_HISTORY_MAX_MB = 16
+
+# Bounded ingest queue length (0 processes uplinks inline in the MQTT callback)
+DEFAULT_QUEUE_SIZE = 1000
+
+# Seconds within which a repeated frame (same fCnt, or same payload when the
+# envelope has no fCnt) is dropped; keep it below the shortest report interval
+DEFAULT_DEDUPE_WINDOW = 30
+
+# Which entities each device gets (see profiles.py)
+ENTITY_PROFILE_MINIMAL = "minimal"
+ENTITY_PROFILE_STANDARD = "standard"
+ENTITY_PROFILE_FULL = "full"
+ENTITY_PROFILES = [ENTITY_PROFILE_MINIMAL, ENTITY_PROFILE_STANDARD, ENTITY_PROFILE_FULL]
+DEFAULT_ENTITY_PROFILE = ENTITY_PROFILE_FULL
+
+# Drop the sensors/number that the thermostat climate entity already covers
+DEFAULT_CLIMATE_REPLACES_ENTITIES = False
+
+# Seconds between checks for edited codec files (0 disables the watcher)
+DEFAULT_CODEC_WATCH_INTERVAL = 0
+
+# Where codecs run (see codec_pool.py) and the per-call worker timeout
+DEFAULT_CODEC_ISOLATION = "off"
+DEFAULT_CODEC_TIMEOUT = 5
+
+# Extra codec directories (comma separated, relative to the config dir)
+DEFAULT_CODEC_DIRS = ""
+
+# Drop telemetry keys that the model's schema does not declare
+DEFAULT_STRICT_TELEMETRY = False
+
+# Push HA's time zone/DST rules to devices and resync drifting clocks
+DEFAULT_TIME_SYNC = False
+
+PLATFORMS = ["sensor", "binary_sensor", "switch", "number", "button", "climate"]
 
 # Dispatcher signals (formatted with entry_id / dev_eui at runtime)
 SIGNAL_NEW_DEVICE = f"{DOMAIN}_new_device" + "_{entry_id}"
 SIGNAL_DEVICE_UPDATED = f"{DOMAIN}_device_updated" + "_{entry_id}_{dev_eui}"
+# First link-quality sample for a device that already exists
+SIGNAL_NEW_LINK = f"{DOMAIN}_new_link" + "_{entry_id}"
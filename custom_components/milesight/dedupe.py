@@ -0,0 +1,40 @@
+"""Per-device duplicate uplink suppression (multi-gateway reception)."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+# Recent frame keys remembered per device; a frame only repeats a few times.
+_KEYS_PER_DEVICE = 4
+
+
+class UplinkDeduplicator:
+    """Remember recent frame keys per device within a time window.
+
+    The key is the frame counter when the envelope carries one, else a hash
+    of the raw payload. A hash also matches a device's repeated identical
+    readings, so keep the window well below the shortest report interval.
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self._recent: Dict[str, List[Tuple[int, float]]] = {}
+        self.duplicates = 0
+
+    def is_duplicate(self, dev_eui: str, key: int, now: float) -> bool:
+        recent = self._recent.get(dev_eui)
+        if recent is None:
+            self._recent[dev_eui] = [(key, now)]
+            return False
+        cutoff = now - self.window
+        for seen_key, seen_at in recent:
+            if seen_key == key and seen_at >= cutoff:
+                self.duplicates += 1
+                return True
+        recent.append((key, now))
+        if len(recent) > _KEYS_PER_DEVICE:
+            del recent[0]
+        return False
+
+    def forget(self, dev_eui: str) -> None:
+        self._recent.pop(dev_eui, None)
@@ -0,0 +1,116 @@
+"""Diagnostics support for Milesight."""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .encoder import codec_map_info, encoder_cache_info
+from .manager import MilesightDevice, MilesightManager
+
+TO_REDACT = {
+    "dev_eui",
+    "devEUI",
+    "deviceName",
+    "name",
+    "serial_number",
+    "sn",
+}
+TOP_NOISY_DEVICES = 10
+
+
+def _message_rate_per_hour(device: MilesightDevice, now: datetime) -> float:
+    elapsed = (now - device.first_seen).total_seconds()
+    if elapsed <= 0:
+        return float(device.message_count)
+    return device.message_count * 3600 / elapsed
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    manager: MilesightManager = hass.data[DOMAIN][entry.entry_id]
+    now = datetime.now(timezone.utc)
+    devices = list(manager.devices.values())
+
+    models = Counter(device.model for device in devices)
+    key_cardinality = Counter(
+        key for device in devices for key in device.telemetry
+    )
+    desired = manager.reconciler.as_dict()
+    noisiest = sorted(
+        devices, key=lambda dev: _message_rate_per_hour(dev, now), reverse=True
+    )[:TOP_NOISY_DEVICES]
+
+    return async_redact_data(
+        {
+            "entry": {
+                "title": entry.title,
+                "data": dict(entry.data),
+                "options": dict(entry.options),
+            },
+            "device_count": len(devices),
+            "offline_devices": manager.availability.offline_count,
+            "models": dict(models),
+            "telemetry_keys": {
+                "distinct": len(key_cardinality),
+                "devices_per_key": dict(key_cardinality.most_common()),
+            },
+            "encoder_cache": encoder_cache_info(),
+            "codecs": codec_map_info(),
+            "codec_pool": manager.codec_pool.stats() if manager.codec_pool else None,
+            "downlinks": {
+                "sent": manager.downlinks_sent,
+                "encode_errors": manager.downlink_errors,
+                "suppressed": manager.downlinks_suppressed,
+            },
+            "ingest": manager.metrics.as_dict(),
+            "duplicates_dropped": manager.dedupe.duplicates if manager.dedupe else None,
+            "queue": manager.queue.stats() if manager.queue is not None else None,
+            "link_quality": manager.link_quality.as_dict(),
+            "desired_config": {
+                # Policy keys are DevEUIs, so only counts are reported per layer.
+                "fleet": desired["fleet"],
+                "groups": len(desired["groups"]),
+                "devices": len(desired["devices"]),
+                **manager.reconciler.stats(),
+            },
+            "heating_schedules": manager.heating_schedules.stats(),
+            "time_sync": manager.time_sync.stats() if manager.time_sync else None,
+            "history": manager.history.stats() if manager.history else None,
+            "noisiest_devices": [
+                {
+                    "dev_eui": device.dev_eui,
+                    "model": device.model,
+                    "messages": device.message_count,
+                    "messages_per_hour": round(_message_rate_per_hour(device, now), 2),
+                    "last_seen": device.last_seen.isoformat(),
+                }
+                for device in noisiest
+            ],
+            "devices": [
+                {
+                    "dev_eui": device.dev_eui,
+                    "name": device.name,
+                    "model": device.model,
+                    "serial_number": device.serial_number,
+                    "sw_version": device.sw_version,
+                    "hw_version": device.hw_version,
+                    "first_seen": device.first_seen.isoformat(),
+                    "last_seen": device.last_seen.isoformat(),
+                    "messages": device.message_count,
+                    "available": device.available,
+                    "telemetry_keys": sorted(device.telemetry),
+                }
+                for device in devices
+            ],
+        },
+        TO_REDACT,
+    )
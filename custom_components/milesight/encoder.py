@@ -3,10 +3,15 @@
 from __future__ import annotations
 
 import base64
+import importlib.metadata
 import importlib.util
 import logging
+import os
+import re
+import signal
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, Optional, Any
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,6 +19,32 @@ ENCODER_ROOTS = [
     Path(__file__).parent / "codecs"
 ]
 _ENCODER_CACHE: Dict[Path, Any] = {}
+# Source mtime of each cached module, used to detect edited codecs.
+_ENCODER_MTIMES: Dict[Path, float] = {}
+# Source mtime of edits that failed to load; retried only once the file changes.
+_FAILED_MTIMES: Dict[Path, float] = {}
+_CACHE_STATS = {"hits": 0, "misses": 0, "reloads": 0}
+
+# Installed packages expose codec directories under this entry point group.
+ENTRY_POINT_GROUP = "milesight.codecs"
+_ENCODER_NAMES = ("encode.py", "{model}-encode.py", "{model}-encoder.py", "encoder.py")
+_DECODER_NAMES = ("decode.py", "{model}-decode.py", "{model}-decoder.py", "decoder.py")
+_VERSION_RE = re.compile(r"""^__version__\s*=\s*['"]([^'"]+)['"]""", re.MULTILINE)
+
+
+@dataclass(frozen=True, slots=True)
+class CodecSpec:
+    """Where a model's codec lives and which source provided it."""
+
+    model: str
+    encoder: Optional[Path]
+    decoder: Optional[Path]
+    version: Optional[str]
+    source: str
+
+
+# Precomputed model -> codec map; rebuilt by load_codec_map() and swapped whole.
+_CODEC_MAP: Dict[str, CodecSpec] = {}
 
 
 class EncodeError(Exception):
@@ -22,6 +53,12 @@ class EncodeError(Exception):
 
 def encode_payload(model: str, payload: Dict[str, object]) -> bytes:
     """Encode a downlink payload for a given model using a Python encoder file."""
+    encoder_path = resolve_encoder(model, payload)
+    return normalize_downlink(encode_raw(encoder_path, payload), encoder_path, payload)
+
+
+def resolve_encoder(model: str, payload: Dict[str, object]) -> Path:
+    """Validate the request and return the encoder file for ``model``."""
     model_key = (model or "").strip().lower()
     if not model_key:
         raise EncodeError("device model is required to encode payload")
@@ -31,50 +68,258 @@ def encode_payload(model: str, payload: Dict[str, object]) -> bytes:
     encoder_path = _find_encoder_path(model_key)
     if not encoder_path:
         raise EncodeError(f"encoder for model {model_key} not found")
+    return encoder_path
 
-    encoder_mod = _load_encoder(encoder_path)
+
+def is_builtin_encoder(path: Path) -> bool:
+    """Return True for encoders shipped with the integration (trusted)."""
+    return ENCODER_ROOTS[0] in path.parents
+
+
+def encode_raw(path: Path, payload: Dict[str, object]) -> Any:
+    """Run the encoder and return its output with data coerced to bytes."""
+    encoder_mod = _load_encoder(path)
 
     # Call a shim that tolerates missing optional fields where possible.
     try:
-        result = _call_encoder(encoder_mod, payload, encoder_path)
+        result = _call_encoder(encoder_mod, payload, path)
     except EncodeError:
         raise
     except Exception as err:  # pragma: no cover - runtime safety
         raise EncodeError(f"failed to encode payload: {err}") from err
 
-    return _normalize_downlink(result, encoder_path, payload)
+    if isinstance(result, dict):
+        data_obj = result.get("data") or result.get("bytes")
+        if data_obj is None:
+            raise EncodeError(f"encoder {path.name} returned dict without data/bytes")
+        return {**result, "data": _to_bytes(data_obj, path)}
+    return _to_bytes(result, path)
 
 
 def _find_encoder_path(model: str) -> Optional[Path]:
-    """Locate a Python encoder file in codecs|decoders/{model}/..."""
-    filenames = [
-        "encode.py",
-        f"{model}-encode.py",
-        f"{model}-encoder.py",
-        "encoder.py",
-    ]
-    for root in ENCODER_ROOTS:
-        for name in filenames:
-            path = root / model / name
-            if path.exists():
-                return path
+    """Look up the encoder file for ``model`` in the codec map."""
+    spec = get_codec(model)
+    return spec.encoder if spec else None
+
+
+def _first_existing(directory: Path, patterns: Iterable[str]) -> Optional[Path]:
+    model = directory.name
+    for pattern in patterns:
+        path = directory / pattern.format(model=model)
+        if path.is_file():
+            return path
     return None
 
 
+def _scan_root(root: Path, source: str, version: Optional[str]) -> Dict[str, CodecSpec]:
+    """Collect ``<root>/<model>/`` codec directories."""
+    found: Dict[str, CodecSpec] = {}
+    if not root.is_dir():
+        _LOGGER.warning("Codec directory %s does not exist", root)
+        return found
+    for directory in sorted(root.iterdir()):
+        if not directory.is_dir() or directory.name.startswith(("_", ".")):
+            continue
+        encoder = _first_existing(directory, _ENCODER_NAMES)
+        decoder = _first_existing(directory, _DECODER_NAMES)
+        if encoder is None and decoder is None:
+            continue
+        codec_version = version
+        if codec_version is None and encoder is not None:
+            match = _VERSION_RE.search(encoder.read_text(encoding="utf-8"))
+            codec_version = match.group(1) if match else None
+        model = directory.name.lower()
+        found[model] = CodecSpec(model, encoder, decoder, codec_version, source)
+    return found
+
+
+def _entry_point_roots() -> list[tuple[Path, str, Optional[str]]]:
+    """Resolve ``milesight.codecs`` entry points to codec root directories.
+
+    An entry point may reference a package/module (its directory is used)
+    or a str/PathLike pointing at the directory.
+    """
+    roots: list[tuple[Path, str, Optional[str]]] = []
+    for entry_point in importlib.metadata.entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            target = entry_point.load()
+        except Exception as err:  # noqa: BLE001 - a broken plugin must not block setup
+            _LOGGER.error("Cannot load codec entry point %s: %s", entry_point.name, err)
+            continue
+        if isinstance(target, (str, os.PathLike)):
+            root = Path(target)
+        elif getattr(target, "__file__", None):
+            root = Path(target.__file__).parent
+        else:
+            _LOGGER.error("Codec entry point %s is not a path or module", entry_point.name)
+            continue
+        dist = getattr(entry_point, "dist", None)
+        roots.append(
+            (root, f"entry_point:{entry_point.name}", dist.version if dist else None)
+        )
+    return roots
+
+
+def load_codec_map(extra_dirs: Iterable[str | Path] = ()) -> Dict[str, CodecSpec]:
+    """Discover codecs from all sources and swap in the merged map (blocking).
+
+    Later sources override earlier ones: bundled codecs, then entry
+    points, then ``extra_dirs`` in order. Directories left out of a call
+    are dropped from the map.
+    """
+    global _CODEC_MAP
+    extra_roots = list(dict.fromkeys(Path(directory) for directory in extra_dirs))
+    sources = [(root, "builtin", None) for root in ENCODER_ROOTS]
+    sources += _entry_point_roots()
+    sources += [(root, f"dir:{root}", None) for root in extra_roots]
+    merged: Dict[str, CodecSpec] = {}
+    for root, source, version in sources:
+        for model, spec in _scan_root(root, source, version).items():
+            if model in merged:
+                _LOGGER.info(
+                    "Codec for %s from %s overrides %s", model, source, merged[model].source
+                )
+            merged[model] = spec
+    _CODEC_MAP = merged
+    return merged
+
+
+def get_codec(model: str) -> Optional[CodecSpec]:
+    """Return the discovered codec for ``model`` (loads the map if needed)."""
+    if not _CODEC_MAP:
+        load_codec_map()
+    return _CODEC_MAP.get((model or "").strip().lower())
+
+
+def codec_map_info() -> Dict[str, Dict[str, object]]:
+    """Return the codec map for diagnostics."""
+    return {
+        model: {
+            "source": spec.source,
+            "version": spec.version,
+            "encoder": spec.encoder is not None,
+            "decoder": spec.decoder is not None,
+        }
+        for model, spec in sorted(_CODEC_MAP.items())
+    }
+
+
 def _load_encoder(path: Path):
     """Load (and cache) a Python module from the encoder path."""
     mod = _ENCODER_CACHE.get(path)
     if mod:
+        _CACHE_STATS["hits"] += 1
         return mod
+    _CACHE_STATS["misses"] += 1
+    mtime = path.stat().st_mtime
+    mod = _exec_encoder(path)
+    _ENCODER_MTIMES[path] = mtime
+    _ENCODER_CACHE[path] = mod
+    return mod
+
+
+def _exec_encoder(path: Path):
+    """Execute the encoder file into a fresh module object."""
     spec = importlib.util.spec_from_file_location(path.stem, path)
     if spec is None or spec.loader is None:
         raise EncodeError(f"cannot load encoder from {path}")
     mod = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(mod)  # type: ignore[assignment]
-    _ENCODER_CACHE[path] = mod
     return mod
 
 
+def encode_batch(
+    path: str, payloads: list[Dict[str, object]], timeout: float
+) -> list[tuple[bool, Any]]:
+    """Worker-process entry point: encode several payloads with one encoder.
+
+    Each call gets its own ``timeout`` (SIGALRM, where available); results
+    are ``(True, bytes | dict)`` or ``(False, error message)``.
+    """
+    encoder_path = Path(path)
+    use_alarm = hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+    results: list[tuple[bool, Any]] = []
+    for payload in payloads:
+        try:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, timeout)
+            try:
+                results.append((True, encode_raw(encoder_path, payload)))
+            finally:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+        except _EncoderTimeout:
+            results.append((False, f"encoder {encoder_path.name} timed out"))
+        except Exception as err:  # noqa: BLE001 - reported to the caller
+            results.append((False, str(err)))
+    return results
+
+
+class _EncoderTimeout(BaseException):
+    """Raised by SIGALRM; a BaseException so encoder code cannot swallow it."""
+
+
+def _raise_timeout(_signum, _frame) -> None:
+    raise _EncoderTimeout
+
+
+def reload_encoders(
+    force: bool = False, extra_dirs: Iterable[str | Path] = ()
+) -> Dict[str, object]:
+    """Reload cached encoder modules whose source changed (blocking).
+
+    Each module is executed fresh and swapped into the cache only if it
+    loads cleanly, so a broken edit keeps the previous encoder in service.
+    Commands already encoding hold their own module reference and finish
+    on the old code. A broken edit is not retried until the file changes
+    again (or ``force`` is given). Encoders for deleted files are evicted.
+    ``extra_dirs`` is passed on to ``load_codec_map``.
+    """
+    # Pick up codecs added or removed since the last discovery.
+    load_codec_map(extra_dirs)
+    reloaded: list[str] = []
+    removed: list[str] = []
+    failed: Dict[str, str] = {}
+    for path in list(_ENCODER_CACHE):
+        name = str(path.relative_to(path.parents[1]))
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            _ENCODER_CACHE.pop(path, None)
+            _ENCODER_MTIMES.pop(path, None)
+            _FAILED_MTIMES.pop(path, None)
+            removed.append(name)
+            continue
+        if not force and mtime in (_ENCODER_MTIMES.get(path), _FAILED_MTIMES.get(path)):
+            continue
+        try:
+            mod = _exec_encoder(path)
+        except Exception as err:  # noqa: BLE001 - keep serving the old module
+            _LOGGER.error("Reloading encoder %s failed: %s", name, err)
+            _FAILED_MTIMES[path] = mtime
+            failed[name] = str(err)
+            continue
+        _ENCODER_CACHE[path] = mod
+        _ENCODER_MTIMES[path] = mtime
+        _FAILED_MTIMES.pop(path, None)
+        reloaded.append(name)
+    _CACHE_STATS["reloads"] += len(reloaded)
+    return {"reloaded": reloaded, "removed": removed, "failed": failed}
+
+
+def encoder_cache_info() -> Dict[str, object]:
+    """Return encoder module cache statistics."""
+    return {
+        **_CACHE_STATS,
+        "size": len(_ENCODER_CACHE),
+        "encoders": sorted(
+            str(path.relative_to(path.parents[1])) for path in _ENCODER_CACHE
+        ),
+    }
+
+
 def _call_encoder(mod: Any, payload: Dict[str, object], path: Path) -> Any:
     """Call the encoder, allowing for optional tolerance of missing extras."""
     if hasattr(mod, "encode"):
@@ -105,7 +350,7 @@ def _as_bytes(result: object, path: Path) -> bytes:
     raise EncodeError(f"encoder {path.name} returned unsupported type {type(result)}")
 
 
-def _normalize_downlink(
+def normalize_downlink(
     result: Any, path: Path, payload: Dict[str, object]
 ) -> Dict[str, object]:
     """Normalize encoder output to {confirmed, fport, data(base64)}."""
@@ -0,0 +1,22 @@
+"""Shared entity behaviour for Milesight device entities."""
+
+from __future__ import annotations
+
+from homeassistant.helpers.entity import Entity
+
+from .manager import MilesightManager
+
+
+class MilesightDeviceEntity(Entity):
+    """Mixin for entities that mirror a device's telemetry.
+
+    Subclasses set ``self._manager`` and ``self._dev_eui``.
+    """
+
+    _manager: MilesightManager
+    _dev_eui: str
+
+    @property
+    def available(self) -> bool:
+        device = self._manager.get_device(self._dev_eui)
+        return device is not None and device.available
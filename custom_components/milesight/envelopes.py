@@ -0,0 +1,91 @@
+"""Network-server envelope adapters.
+
+Each adapter turns a decoded MQTT JSON document into an ``Uplink`` that
+references (never copies) the decoded object and the radio metadata.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional, Sequence
+
+ENVELOPE_MILESIGHT = "milesight"
+ENVELOPE_CHIRPSTACK_V4 = "chirpstack_v4"
+ENVELOPE_TTN_V3 = "ttn_v3"
+
+_EMPTY: Mapping[str, object] = {}
+
+
+@dataclass(slots=True)
+class Uplink:
+    """Fields the manager needs from one uplink, by reference."""
+
+    dev_eui: Optional[str]
+    model: Optional[str]
+    name: Optional[str]
+    data: Mapping[str, object]
+    fcnt: Optional[int] = None
+    rx: Sequence[Mapping[str, object]] = ()
+    spreading_factor: Optional[int] = None
+
+
+def adapt_milesight(
+    parsed: Mapping[str, object], dev_eui: Optional[str], model: Optional[str]
+) -> Uplink:
+    """Flat Milesight gateway JSON: telemetry and metadata share one dict."""
+    return Uplink(
+        dev_eui=dev_eui or parsed.get("devEUI"),  # type: ignore[arg-type]
+        model=model,
+        name=parsed.get("deviceName"),  # type: ignore[arg-type]
+        data=parsed,
+        fcnt=parsed.get("fCnt"),  # type: ignore[arg-type]
+    )
+
+
+def adapt_chirpstack_v4(
+    parsed: Mapping[str, object], dev_eui: Optional[str], model: Optional[str]
+) -> Uplink:
+    """ChirpStack v4 ``event/up``: decoded data in ``object``, info in ``deviceInfo``."""
+    info = parsed.get("deviceInfo") or _EMPTY
+    tx_info = parsed.get("txInfo") or _EMPTY
+    lora = (tx_info.get("modulation") or _EMPTY).get("lora") or _EMPTY  # type: ignore[union-attr]
+    return Uplink(
+        dev_eui=dev_eui or info.get("devEui"),  # type: ignore[union-attr]
+        model=model or info.get("deviceProfileName"),  # type: ignore[union-attr]
+        name=info.get("deviceName"),  # type: ignore[union-attr]
+        data=parsed.get("object") or _EMPTY,  # type: ignore[arg-type]
+        fcnt=parsed.get("fCnt"),  # type: ignore[arg-type]
+        rx=parsed.get("rxInfo") or (),  # type: ignore[arg-type]
+        spreading_factor=lora.get("spreadingFactor"),  # type: ignore[union-attr]
+    )
+
+
+def adapt_ttn_v3(
+    parsed: Mapping[str, object], dev_eui: Optional[str], model: Optional[str]
+) -> Uplink:
+    """TTN v3 uplink: decoded data in ``uplink_message.decoded_payload``."""
+    ids = parsed.get("end_device_ids") or _EMPTY
+    message = parsed.get("uplink_message") or _EMPTY
+    version_ids = message.get("version_ids") or _EMPTY  # type: ignore[union-attr]
+    settings = message.get("settings") or _EMPTY  # type: ignore[union-attr]
+    lora = (settings.get("data_rate") or _EMPTY).get("lora") or _EMPTY  # type: ignore[union-attr]
+    return Uplink(
+        dev_eui=dev_eui or ids.get("dev_eui"),  # type: ignore[union-attr]
+        model=model or version_ids.get("model_id"),  # type: ignore[union-attr]
+        name=ids.get("device_id"),  # type: ignore[union-attr]
+        data=message.get("decoded_payload") or _EMPTY,  # type: ignore[union-attr]
+        fcnt=message.get("f_cnt"),  # type: ignore[union-attr]
+        rx=message.get("rx_metadata") or (),  # type: ignore[union-attr]
+        spreading_factor=lora.get("spreading_factor"),  # type: ignore[union-attr]
+    )
+
+
+EnvelopeAdapter = Callable[
+    [Mapping[str, object], Optional[str], Optional[str]], Uplink
+]
+
+ENVELOPE_ADAPTERS: Dict[str, EnvelopeAdapter] = {
+    ENVELOPE_MILESIGHT: adapt_milesight,
+    ENVELOPE_CHIRPSTACK_V4: adapt_chirpstack_v4,
+    ENVELOPE_TTN_V3: adapt_ttn_v3,
+}
@@ -0,0 +1,115 @@
+"""Segmented heating-schedule programming paced by Class A uplinks."""
+
+from __future__ import annotations
+
+from time import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Encoded size of one setHeatingSchedule command (bytes).
+SLOT_SIZE = 11
+
+
+class SchedulePlan:
+    """Slots still to program on one device and the frame in flight.
+
+    ``released`` slots were handed to the network server for a receive
+    window; the device does not acknowledge them, so this is not a
+    confirmation that they were applied.
+    """
+
+    __slots__ = ("slots", "queued", "in_flight", "released", "frames", "started", "finished")
+
+    def __init__(self, slots: Mapping[int, Dict[str, Any]]) -> None:
+        self.slots = dict(slots)
+        self.queued: List[int] = sorted(self.slots)
+        self.in_flight: Tuple[int, ...] = ()
+        self.released: set[int] = set()
+        self.frames = 0
+        self.started = time()
+        self.finished: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total": len(self.slots),
+            "released": sorted(self.released),
+            "in_flight": list(self.in_flight),
+            "queued": list(self.queued),
+            "frames": self.frames,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class HeatingScheduleProgrammer:
+    """Pack schedule slots into as few downlinks as the data rate allows.
+
+    A Class A device only receives in the windows after its own uplinks, so
+    one frame is kept in flight per device: each uplink marks the previous
+    frame released (the network server sends queued downlinks in the
+    windows following an uplink) and queues the next, packed with as many
+    slots as fit the maximum payload at the device's current data rate.
+    Frames are not acknowledged, so released is not applied.
+    """
+
+    def __init__(self) -> None:
+        self._plans: Dict[str, SchedulePlan] = {}
+        self._running = 0
+        self.frames_sent = 0
+        self.completed = 0
+
+    @property
+    def active(self) -> bool:
+        return self._running > 0
+
+    def start(self, dev_eui: str, slots: Iterable[Dict[str, Any]]) -> SchedulePlan:
+        """Replace any running plan for ``dev_eui`` with ``slots`` (by index)."""
+        previous = self._plans.get(dev_eui)
+        if previous is not None and previous.finished is None:
+            self._running -= 1
+        plan = self._plans[dev_eui] = SchedulePlan(
+            {int(slot["index"]): slot for slot in slots}
+        )
+        self._running += 1
+        return plan
+
+    def next_frame(self, dev_eui: str, max_payload: int) -> Optional[List[Dict[str, Any]]]:
+        """Mark the frame in flight released and return the next one, if any."""
+        plan = self._plans.get(dev_eui)
+        if plan is None or plan.finished is not None:
+            return None
+        plan.released.update(plan.in_flight)
+        plan.in_flight = ()
+        if not plan.queued:
+            plan.finished = time()
+            self._running -= 1
+            self.completed += 1
+            return None
+        count = max(1, max_payload // SLOT_SIZE)
+        plan.in_flight = tuple(plan.queued[:count])
+        del plan.queued[:count]
+        plan.frames += 1
+        self.frames_sent += 1
+        return [plan.slots[index] for index in plan.in_flight]
+
+    def failed(self, dev_eui: str) -> None:
+        """Requeue the frame in flight after a failed send."""
+        plan = self._plans.get(dev_eui)
+        if plan is not None and plan.in_flight:
+            plan.queued[:0] = plan.in_flight
+            plan.in_flight = ()
+
+    def progress(self, dev_eui: str) -> Optional[Dict[str, Any]]:
+        plan = self._plans.get(dev_eui)
+        return plan.as_dict() if plan is not None else None
+
+    def forget(self, dev_eui: str) -> None:
+        plan = self._plans.pop(dev_eui, None)
+        if plan is not None and plan.finished is None:
+            self._running -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._running,
+            "completed": self.completed,
+            "frames_sent": self.frames_sent,
+        }
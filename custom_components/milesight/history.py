@@ -0,0 +1,124 @@
+"""Compact in-memory telemetry history (per device, per numeric key)."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Collection, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# array('f') value + array('d') timestamp per sample
+_BYTES_PER_SAMPLE = 4 + 8
+
+# Numeric keys that are counters or settings, not measurements; skipped for
+# models without a descriptor to say which keys are measurements.
+NON_MEASUREMENT_KEYS = frozenset(
+    {"timestamp", "fCnt", "fPort", "f_cnt", "f_port", "report_interval", "time_zone"}
+)
+
+
+class TelemetryRing:
+    """Fixed-depth ring of (timestamp, float32 value) samples."""
+
+    __slots__ = ("_values", "_times", "_depth", "_index", "_count")
+
+    def __init__(self, depth: int) -> None:
+        self._values = array("f", bytes(4 * depth))
+        self._times = array("d", bytes(8 * depth))
+        self._depth = depth
+        self._index = 0
+        self._count = 0
+
+    def append(self, timestamp: float, value: float) -> None:
+        self._values[self._index] = value
+        self._times[self._index] = timestamp
+        self._index = (self._index + 1) % self._depth
+        if self._count < self._depth:
+            self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def samples(self, since: Optional[float] = None) -> List[Tuple[float, float]]:
+        """Return samples oldest-first, optionally only those after ``since``."""
+        start = (self._index - self._count) % self._depth
+        out: List[Tuple[float, float]] = []
+        for offset in range(self._count):
+            idx = (start + offset) % self._depth
+            timestamp = self._times[idx]
+            if since is not None and timestamp < since:
+                continue
+            out.append((timestamp, round(self._values[idx], 3)))
+        return out
+
+
+class TelemetryHistory:
+    """Ring buffers for numeric telemetry keys, bounded by a memory cap."""
+
+    def __init__(self, depth: int, max_bytes: int) -> None:
+        self.depth = depth
+        self.max_bytes = max_bytes
+        self._rings: Dict[str, Dict[str, TelemetryRing]] = {}
+        self._ring_bytes = depth * _BYTES_PER_SAMPLE
+        self.bytes_used = 0
+        self.rejected_samples = 0
+
+    def record(
+        self,
+        dev_eui: str,
+        data: Mapping[str, object],
+        timestamp: float,
+        keys: Optional[Collection[str]] = None,
+    ) -> None:
+        """Append the int/float measurements in ``data`` (bools are skipped).
+
+        ``keys`` lists the measurement keys of the device's model; without it
+        every numeric key except ``NON_MEASUREMENT_KEYS`` is recorded.
+        """
+        rings = self._rings.get(dev_eui)
+        if rings is None:
+            rings = self._rings[dev_eui] = {}
+        for key, value in data.items():
+            if keys is None:
+                if key in NON_MEASUREMENT_KEYS:
+                    continue
+            elif key not in keys:
+                continue
+            value_type = type(value)
+            if value_type is not float and value_type is not int:
+                continue
+            ring = rings.get(key)
+            if ring is None:
+                if self.bytes_used + self._ring_bytes > self.max_bytes:
+                    self.rejected_samples += 1
+                    continue
+                ring = rings[key] = TelemetryRing(self.depth)
+                self.bytes_used += self._ring_bytes
+            ring.append(timestamp, value)  # type: ignore[arg-type]
+
+    def remove(self, dev_eui: str) -> None:
+        rings = self._rings.pop(dev_eui, None)
+        if rings:
+            self.bytes_used -= len(rings) * self._ring_bytes
+
+    def keys(self, dev_eui: str) -> Iterable[str]:
+        return self._rings.get(dev_eui, {}).keys()
+
+    def query(
+        self,
+        dev_eui: str,
+        keys: Optional[Iterable[str]] = None,
+        since: Optional[float] = None,
+    ) -> Dict[str, List[Tuple[float, float]]]:
+        """Return ``{key: [(timestamp, value), ...]}`` for one device."""
+        rings = self._rings.get(dev_eui, {})
+        selected = rings.keys() if keys is None else [k for k in keys if k in rings]
+        return {key: rings[key].samples(since) for key in selected}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "devices": len(self._rings),
+            "series": sum(len(rings) for rings in self._rings.values()),
+            "depth": self.depth,
+            "bytes_used": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "rejected_samples": self.rejected_samples,
+        }
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import time
 from typing import Any
 
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 
-from .manager import MilesightManager
+from .manager import loaded_managers, manager_for_device
 
 
 class MilesightDevicesView(HomeAssistantView):
@@ -17,12 +18,39 @@ class MilesightDevicesView(HomeAssistantView):
     url = "/api/milesight/devices"
     requires_auth = True
 
-    def __init__(self, manager: MilesightManager) -> None:
-        self._manager = manager
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
 
     @callback
     async def get(self, request) -> Any:  # type: ignore[override]
-        return self.json({"devices": self._manager.serialize_devices()})
+        return self.json(
+            {
+                "devices": [
+                    device
+                    for manager in loaded_managers(self._hass)
+                    for device in manager.serialize_devices()
+                ]
+            }
+        )
+
+
+class MilesightDeviceView(HomeAssistantView):
+    """Expose one device's full state, including diagnostic telemetry."""
+
+    name = "api:milesight:device"
+    url = "/api/milesight/devices/{dev_eui}"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+
+    async def get(self, request, dev_eui: str) -> Any:  # type: ignore[override]
+        dev_eui = dev_eui.lower().strip()
+        manager = manager_for_device(self._hass, dev_eui)
+        device = manager.serialize_device(dev_eui) if manager else None
+        if device is None:
+            return self.json({"error": "unknown device"}, status_code=404)
+        return self.json(device)
 
 
 class MilesightDeviceActionView(HomeAssistantView):
@@ -32,8 +60,8 @@ class MilesightDeviceActionView(HomeAssistantView):
     url = "/api/milesight/device_action"
     requires_auth = True
 
-    def __init__(self, manager: MilesightManager) -> None:
-        self._manager = manager
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
 
     async def post(self, request) -> Any:  # type: ignore[override]
         data = await request.json()
@@ -41,7 +69,43 @@ class MilesightDeviceActionView(HomeAssistantView):
         action = data.get("action")
 
         if action == "delete":
-            await self._manager.async_delete_device(dev_eui)
+            dev_eui = (dev_eui or "").lower().strip()
+            manager = manager_for_device(self._hass, dev_eui)
+            if manager is None:
+                return self.json({"error": "unknown device"}, status_code=404)
+            await manager.async_delete_device(dev_eui)
             return self.json({"status": "deleted"})
 
         return self.json({"error": "invalid action"}, status_code=400)
+
+
+class MilesightHistoryView(HomeAssistantView):
+    """Expose recent in-memory telemetry history for one device."""
+
+    name = "api:milesight:history"
+    url = "/api/milesight/history/{dev_eui}"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+
+    async def get(self, request, dev_eui: str) -> Any:  # type: ignore[override]
+        dev_eui = dev_eui.lower().strip()
+        manager = manager_for_device(self._hass, dev_eui)
+        if manager is None:
+            return self.json({"error": "unknown device"}, status_code=404)
+        history = manager.history
+        if history is None:
+            return self.json({"error": "history disabled"}, status_code=404)
+        keys = request.query.getall("key", None)
+        try:
+            hours = float(request.query["hours"]) if "hours" in request.query else None
+        except ValueError:
+            return self.json({"error": "invalid hours"}, status_code=400)
+        since = time.time() - hours * 3600 if hours else None
+        return self.json(
+            {
+                "dev_eui": dev_eui,
+                "history": history.query(dev_eui, keys, since),
+            }
+        )
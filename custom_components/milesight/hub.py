@@ -0,0 +1,107 @@
+"""Domain-level MQTT ingest hub shared by all config entries."""
+
+from __future__ import annotations
+
+import logging
+from functools import partial
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List
+
+from homeassistant.components import mqtt
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_HUB
+from .manager import MilesightManager, parse_topic, parse_uplink
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IngestHub:
+    """Subscribe each topic filter once and parse each payload once.
+
+    Every config entry registers its topic filters. Filters shared by several
+    entries get a single MQTT subscription. An incoming message is decoded once
+    and routed to the entry that owns the dev_eui (from the topic, else the
+    envelope); unknown devices are claimed by the first entry registered on
+    the filter that delivered them. Devices an entry restored from storage
+    belong to that entry from the start.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._filters: Dict[str, List[MilesightManager]] = {}
+        self._unsubs: Dict[str, Callable[[], None]] = {}
+        self._owners: Dict[str, MilesightManager] = {}
+
+    async def async_register(
+        self, manager: MilesightManager, topic_filters: Iterable[str]
+    ) -> Callable[[], None]:
+        """Attach a manager to topic filters; returns an unregister callback."""
+        added: List[str] = []
+        for dev_eui in manager.devices:
+            self._owners.setdefault(dev_eui, manager)
+        try:
+            for topic_filter in dict.fromkeys(topic_filters):
+                if topic_filter not in self._unsubs:
+                    self._unsubs[topic_filter] = await mqtt.async_subscribe(
+                        self.hass,
+                        topic_filter,
+                        partial(self._async_handle_message, topic_filter),
+                    )
+                managers = self._filters.setdefault(topic_filter, [])
+                if manager not in managers:
+                    managers.append(manager)
+                    added.append(topic_filter)
+        except Exception:
+            self._async_unregister(manager, added)
+            raise
+        return partial(self._async_unregister, manager, added)
+
+    def _async_unregister(
+        self, manager: MilesightManager, topic_filters: List[str]
+    ) -> None:
+        for topic_filter in topic_filters:
+            managers = self._filters.get(topic_filter, [])
+            if manager in managers:
+                managers.remove(manager)
+            if not managers:
+                self._filters.pop(topic_filter, None)
+                unsub = self._unsubs.pop(topic_filter, None)
+                if unsub:
+                    unsub()
+        for dev_eui in [d for d, m in self._owners.items() if m is manager]:
+            del self._owners[dev_eui]
+        if not self._filters:
+            self.hass.data.pop(DATA_HUB, None)
+
+    async def _async_handle_message(
+        self, topic_filter: str, msg: mqtt.ReceiveMessage
+    ) -> None:
+        start = perf_counter()
+        parsed = parse_uplink(msg.payload)
+        parse_time = perf_counter() - start
+
+        managers = self._filters.get(topic_filter)
+        if not managers:
+            return
+        dev_eui, _model = parse_topic(msg.topic)
+        if dev_eui is None and parsed is not None:
+            dev_eui = managers[0].envelope_dev_eui(parsed)
+        key = dev_eui.lower().strip() if dev_eui else None
+        manager = self._owners.get(key) if key else None
+        if manager is None:
+            manager = managers[0]
+            if key and parsed is not None:
+                self._owners[key] = manager
+
+        await manager.async_handle_join_uplink(
+            msg, parsed=parsed, parse_time=parse_time
+        )
+
+
+def async_get_hub(hass: HomeAssistant) -> IngestHub:
+    """Return the shared hub, creating it on first use."""
+    hub: IngestHub | None = hass.data.get(DATA_HUB)
+    if hub is None:
+        hub = hass.data[DATA_HUB] = IngestHub(hass)
+    return hub
@@ -0,0 +1,135 @@
+"""Bounded uplink queue with a priority lane and latest-wins compaction."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import replace
+from typing import Deque, Dict, Optional, Tuple
+
+from .envelopes import Uplink
+
+# Uplinks that change any of these keys go to the priority lane.
+PRIORITY_KEYS = ("tamper_status", "window_detection", "freeze_protection")
+
+QueueItem = Tuple[Uplink, float]
+
+
+def _device_key(uplink: Uplink) -> str:
+    return (uplink.dev_eui or "").lower()
+
+
+class IngestQueue:
+    """Two-lane FIFO between MQTT callbacks and the manager's drain task.
+
+    The normal lane is bounded. When it is full, queued uplinks are compacted
+    per device (older values merged under newer ones); when too few
+    duplicates are pending for that to help, the oldest uplink is dropped. The priority lane is never
+    compacted or dropped; a priority uplink absorbs the device's older
+    pending normal uplinks so draining it first cannot reorder values.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._normal: Deque[QueueItem] = deque()
+        self._priority: Deque[QueueItem] = deque()
+        self._event = asyncio.Event()
+        # Normal-lane items per device, so priority puts skip the lane scan
+        # when the device has nothing pending.
+        self._pending: Dict[str, int] = {}
+        self.dropped = 0
+        self.compacted = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return len(self._normal) + len(self._priority)
+
+    def put(self, uplink: Uplink, enqueued: float, priority: bool = False) -> None:
+        if priority:
+            self._priority.append(self._absorb_pending(uplink, enqueued))
+        else:
+            normal = self._normal
+            if len(normal) >= self.maxsize:
+                # Compaction is O(n); only run it when it frees a useful share.
+                if len(normal) - len(self._pending) >= max(1, self.maxsize // 10):
+                    self._compact()
+                    normal = self._normal
+                if len(normal) >= self.maxsize:
+                    self._forget(normal.popleft()[0])
+                    self.dropped += 1
+            normal.append((uplink, enqueued))
+            key = _device_key(uplink)
+            self._pending[key] = self._pending.get(key, 0) + 1
+        depth = len(self)
+        if depth > self.high_water:
+            self.high_water = depth
+        self._event.set()
+
+    def pop(self) -> Optional[QueueItem]:
+        if self._priority:
+            return self._priority.popleft()
+        if self._normal:
+            item = self._normal.popleft()
+            self._forget(item[0])
+            return item
+        self._event.clear()
+        return None
+
+    async def wait(self) -> None:
+        await self._event.wait()
+
+    def clear(self) -> None:
+        self._normal.clear()
+        self._priority.clear()
+        self._pending.clear()
+        self._event.clear()
+
+    def _forget(self, uplink: Uplink) -> None:
+        key = _device_key(uplink)
+        count = self._pending.get(key, 0) - 1
+        if count > 0:
+            self._pending[key] = count
+        else:
+            self._pending.pop(key, None)
+
+    def _absorb_pending(self, uplink: Uplink, enqueued: float) -> QueueItem:
+        key = _device_key(uplink)
+        if not self._pending.pop(key, 0):
+            return uplink, enqueued
+        older = [item for item in self._normal if _device_key(item[0]) == key]
+        self._normal = deque(
+            item for item in self._normal if _device_key(item[0]) != key
+        )
+        data: Dict[str, object] = {}
+        for item in older:
+            data.update(item[0].data)
+        data.update(uplink.data)
+        self.compacted += len(older)
+        return replace(uplink, data=data), older[0][1]
+
+    def _compact(self) -> None:
+        merged: Dict[str, QueueItem] = {}
+        for uplink, enqueued in self._normal:
+            key = _device_key(uplink)
+            previous = merged.get(key)
+            if previous is None:
+                merged[key] = (uplink, enqueued)
+            else:
+                older = previous[0]
+                merged[key] = (
+                    replace(uplink, data={**older.data, **uplink.data}),
+                    previous[1],
+                )
+        self.compacted += len(self._normal) - len(merged)
+        self._normal = deque(merged.values())
+        self._pending = dict.fromkeys(merged, 1)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": len(self),
+            "priority_depth": len(self._priority),
+            "maxsize": self.maxsize,
+            "high_water": self.high_water,
+            "compacted": self.compacted,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,194 @@
+"""Streaming link-quality aggregates per device and per gateway."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from .envelopes import Uplink
+
+EWMA_ALPHA = 0.2
+MAX_GATEWAYS_PER_DEVICE = 8
+# Gateway id used when the envelope carries RSSI/SNR without a gateway id.
+UNKNOWN_GATEWAY = "unknown"
+
+# LoRa demodulation floor (dB SNR) per spreading factor.
+SNR_FLOOR = {7: -7.5, 8: -10.0, 9: -12.5, 10: -15.0, 11: -17.5, 12: -20.0}
+
+# Largest downlink application payload (bytes) per spreading factor at
+# 125 kHz (EU868 limits); the SF12 ceiling applies while the SF is unknown.
+MAX_PAYLOAD = {7: 222, 8: 222, 9: 115, 10: 51, 11: 51, 12: 51}
+DEFAULT_MAX_PAYLOAD = 51
+
+
+def _as_float(value: object) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+class LinkStats:
+    """EWMA, min/max and count for RSSI and SNR."""
+
+    __slots__ = ("count", "rssi", "snr", "rssi_min", "rssi_max", "snr_min", "snr_max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.rssi: Optional[float] = None
+        self.snr: Optional[float] = None
+        self.rssi_min: Optional[float] = None
+        self.rssi_max: Optional[float] = None
+        self.snr_min: Optional[float] = None
+        self.snr_max: Optional[float] = None
+
+    def add(self, rssi: Optional[float], snr: Optional[float]) -> None:
+        self.count += 1
+        if rssi is not None:
+            self.rssi = rssi if self.rssi is None else self.rssi + EWMA_ALPHA * (rssi - self.rssi)
+            self.rssi_min = rssi if self.rssi_min is None else min(self.rssi_min, rssi)
+            self.rssi_max = rssi if self.rssi_max is None else max(self.rssi_max, rssi)
+        if snr is not None:
+            self.snr = snr if self.snr is None else self.snr + EWMA_ALPHA * (snr - self.snr)
+            self.snr_min = snr if self.snr_min is None else min(self.snr_min, snr)
+            self.snr_max = snr if self.snr_max is None else max(self.snr_max, snr)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "rssi": round(self.rssi, 2) if self.rssi is not None else None,
+            "rssi_min": self.rssi_min,
+            "rssi_max": self.rssi_max,
+            "snr": round(self.snr, 2) if self.snr is not None else None,
+            "snr_min": self.snr_min,
+            "snr_max": self.snr_max,
+        }
+
+
+class DeviceLink:
+    """Link aggregates for one device, overall and per receiving gateway."""
+
+    __slots__ = ("stats", "gateways", "spreading_factor")
+
+    def __init__(self) -> None:
+        self.stats = LinkStats()
+        self.gateways: Dict[str, LinkStats] = {}
+        self.spreading_factor: Optional[int] = None
+
+    def gateway(self, gateway_id: str) -> LinkStats:
+        stats = self.gateways.get(gateway_id)
+        if stats is None:
+            if len(self.gateways) >= MAX_GATEWAYS_PER_DEVICE:
+                weakest = min(self.gateways, key=lambda gw: self.gateways[gw].count)
+                del self.gateways[weakest]
+            stats = self.gateways[gateway_id] = LinkStats()
+        return stats
+
+
+def _rx_samples(uplink: Uplink) -> Iterable[Tuple[str, Optional[float], Optional[float]]]:
+    """Yield (gateway_id, rssi, snr) from envelope rx metadata or flat keys."""
+    if uplink.rx:
+        for item in uplink.rx:
+            gateway_ids: Mapping[str, object] = item.get("gateway_ids") or {}  # type: ignore[assignment]
+            gateway = item.get("gatewayId") or gateway_ids.get("gateway_id") or UNKNOWN_GATEWAY
+            snr = item.get("snr")
+            if snr is None:
+                snr = item.get("loRaSNR")
+            yield str(gateway), _as_float(item.get("rssi")), _as_float(snr)
+        return
+    data = uplink.data
+    rssi, snr = _as_float(data.get("rssi")), _as_float(data.get("snr"))
+    if rssi is not None or snr is not None:
+        yield str(data.get("gatewayId") or UNKNOWN_GATEWAY), rssi, snr
+
+
+class LinkQualityTracker:
+    """Aggregate RSSI/SNR per device and per gateway in fixed-size records."""
+
+    def __init__(self) -> None:
+        self.devices: Dict[str, DeviceLink] = {}
+        self.gateways: Dict[str, LinkStats] = {}
+
+    def record(self, dev_eui: str, uplink: Uplink) -> bool:
+        """Add the uplink's rx samples; True if they are the device's first."""
+        new = False
+        link: Optional[DeviceLink] = None
+        for gateway, rssi, snr in _rx_samples(uplink):
+            if link is None:
+                link = self.devices.get(dev_eui)
+                if link is None:
+                    link = self.devices[dev_eui] = DeviceLink()
+                    new = True
+            link.stats.add(rssi, snr)
+            link.gateway(gateway).add(rssi, snr)
+            gw_stats = self.gateways.get(gateway)
+            if gw_stats is None:
+                gw_stats = self.gateways[gateway] = LinkStats()
+            gw_stats.add(rssi, snr)
+        if link is not None and uplink.spreading_factor:
+            link.spreading_factor = int(uplink.spreading_factor)
+        return new
+
+    def forget(self, dev_eui: str) -> None:
+        self.devices.pop(dev_eui, None)
+
+    def best_gateway(self, dev_eui: str) -> Optional[str]:
+        link = self.devices.get(dev_eui)
+        if link is None or not link.gateways:
+            return None
+        return max(
+            link.gateways,
+            key=lambda gw: (
+                link.gateways[gw].snr if link.gateways[gw].snr is not None else float("-inf"),
+                link.gateways[gw].rssi if link.gateways[gw].rssi is not None else float("-inf"),
+            ),
+        )
+
+    def link_margin(self, dev_eui: str) -> Optional[float]:
+        """Best gateway's EWMA SNR above the demodulation floor for the SF."""
+        link = self.devices.get(dev_eui)
+        gateway = self.best_gateway(dev_eui)
+        if link is None or gateway is None:
+            return None
+        snr = link.gateways[gateway].snr
+        floor = SNR_FLOOR.get(link.spreading_factor or 0)
+        if snr is None or floor is None:
+            return None
+        return round(snr - floor, 1)
+
+    def max_payload(self, dev_eui: str) -> int:
+        """Bytes one downlink may carry at the device's last seen data rate."""
+        link = self.devices.get(dev_eui)
+        if link is None or link.spreading_factor is None:
+            return DEFAULT_MAX_PAYLOAD
+        return MAX_PAYLOAD.get(link.spreading_factor, DEFAULT_MAX_PAYLOAD)
+
+    def link_attributes(self, dev_eui: str) -> Dict[str, object]:
+        """A few scalars for entity attributes; see ``device_summary``."""
+        link = self.devices.get(dev_eui)
+        if link is None:
+            return {}
+        stats = link.stats.as_dict()
+        return {
+            "rssi": stats["rssi"],
+            "snr": stats["snr"],
+            "spreading_factor": link.spreading_factor,
+            "gateways": len(link.gateways),
+        }
+
+    def device_summary(self, dev_eui: str) -> Dict[str, object]:
+        link = self.devices.get(dev_eui)
+        if link is None:
+            return {}
+        return {
+            **link.stats.as_dict(),
+            "spreading_factor": link.spreading_factor,
+            "gateways": {gw: stats.as_dict() for gw, stats in link.gateways.items()},
+        }
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "devices": len(self.devices),
+            "gateways": {gw: stats.as_dict() for gw, stats in self.gateways.items()},
+        }
@@ -1,21 +1,59 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Callable, Dict, Optional
+from time import perf_counter, time
+from typing import Callable, Dict, Mapping, Optional
 
 from homeassistant.components import mqtt
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN, SIGNAL_DEVICE_UPDATED, SIGNAL_NEW_DEVICE
+from .const import DOMAIN, SIGNAL_DEVICE_UPDATED, SIGNAL_NEW_DEVICE, SIGNAL_NEW_LINK
+from .availability import AvailabilityTracker
+from .codec_pool import CODEC_ISOLATION_OFF, CodecPool
+from .dedupe import UplinkDeduplicator
+from .encoder import EncodeError, encode_payload, resolve_encoder
+from .envelopes import ENVELOPE_ADAPTERS, ENVELOPE_MILESIGHT, Uplink
+from .heating_schedule import HeatingScheduleProgrammer
+from .history import TelemetryHistory
+from .ingest_queue import PRIORITY_KEYS, IngestQueue
+from .link_quality import LinkQualityTracker
+from .metrics import (
+    STAGE_DISPATCH,
+    STAGE_PARSE,
+    STAGE_QUEUE,
+    STAGE_REGISTRY,
+    STAGE_TOTAL,
+    IngestMetrics,
+)
+from .models import get_model_registry
+from .profiler import HotPathProfiler
+from .reconciler import ConfigReconciler
+from .time_sync import FRAME_CONFIG, TimeSyncScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+# Expected report period when the device has not reported report_interval.
+DEFAULT_REPORT_INTERVAL = 600.0
+
+# Drained uplinks processed before yielding to the event loop.
+DRAIN_BATCH = 50
+
+# Keys of the messages published by downlink_message(); a payload with only
+# these keys is our own downlink echoed back on a shared filter.
+DOWNLINK_KEYS = frozenset(("confirmed", "fport", "data"))
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
 
 @dataclass
 class MilesightDevice:
@@ -25,64 +63,381 @@ class MilesightDevice:
     serial_number: Optional[str] = None
     sw_version: Optional[str] = None
     hw_version: Optional[str] = None
+    first_seen: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     last_seen: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    message_count: int = 0
+    available: bool = True
+    stale: bool = False
     telemetry: Dict[str, object] = field(default_factory=dict)
 
 
 class MilesightManager:
-    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        envelope: str = ENVELOPE_MILESIGHT,
+        history_depth: int = 0,
+        history_max_bytes: int = 0,
+        queue_size: int = 0,
+        dedupe_window: float = 0,
+        codec_isolation: str = CODEC_ISOLATION_OFF,
+        codec_timeout: float = 5.0,
+        strict_telemetry: bool = False,
+        downlink_topic: str = "",
+        time_sync: bool = False,
+        profiler: Optional[HotPathProfiler] = None,
+    ) -> None:
         self.hass = hass
         self.entry_id = entry_id
+        self._adapt = ENVELOPE_ADAPTERS.get(envelope, ENVELOPE_ADAPTERS[ENVELOPE_MILESIGHT])
+        self._models = get_model_registry()
+        self._strict_telemetry = strict_telemetry
+        self._downlink_topic = downlink_topic
         self.devices: Dict[str, MilesightDevice] = {}
         self._unsubscribers: list[Callable[[], None]] = []
+        self.metrics = IngestMetrics()
+        self.downlinks_sent = 0
+        self.downlink_errors = 0
+        self.downlinks_suppressed = 0
+        # dev_eui -> canonical key -> last value commanded, until reported back
+        self._commanded: Dict[str, Dict[str, object]] = {}
+        self.profiler = profiler or HotPathProfiler()
+        self.history: Optional[TelemetryHistory] = (
+            TelemetryHistory(history_depth, history_max_bytes)
+            if history_depth > 0
+            else None
+        )
+        self.availability = AvailabilityTracker(self._async_availability_changed)
+        self._store: Optional[Store] = None
+        self._save_pending = False
+        self.queue: Optional[IngestQueue] = (
+            IngestQueue(queue_size) if queue_size > 0 else None
+        )
+        self._drain_task: Optional[asyncio.Task] = None
+        self._time_sync_unsub: Optional[Callable[[], None]] = None
+        self.link_quality = LinkQualityTracker()
+        self.reconciler = ConfigReconciler(self._models)
+        self.heating_schedules = HeatingScheduleProgrammer()
+        self.time_sync: Optional[TimeSyncScheduler] = (
+            TimeSyncScheduler() if time_sync else None
+        )
+        self.dedupe: Optional[UplinkDeduplicator] = (
+            UplinkDeduplicator(dedupe_window) if dedupe_window > 0 else None
+        )
+        self.codec_pool: Optional[CodecPool] = (
+            CodecPool(codec_isolation, codec_timeout)
+            if codec_isolation != CODEC_ISOLATION_OFF
+            else None
+        )
+
+    async def async_codecs_reloaded(
+        self, result: Mapping[str, object], force: bool = False
+    ) -> bool:
+        """Drop state built with codecs that ``reload_encoders`` replaced.
+
+        Cached time sync frames are re-encoded and codec workers running
+        stale modules are recycled; returns True if the pool was recycled.
+        """
+        if self.time_sync is not None and (result["reloaded"] or result["removed"]):
+            self.time_sync.clear_frames()
+        pool = self.codec_pool
+        if pool is not None and (
+            force
+            or result["reloaded"]
+            or result["removed"]
+            or await self.hass.async_add_executor_job(pool.sources_changed)
+        ):
+            pool.recycle()
+            return True
+        return False
 
     async def async_close(self) -> None:
+        self.availability.close()
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            self._drain_task = None
+        if self.queue is not None:
+            self.queue.clear()
+        if self.codec_pool is not None:
+            await self.codec_pool.async_close()
+        if self._time_sync_unsub is not None:
+            self._time_sync_unsub()
+            self._time_sync_unsub = None
         while self._unsubscribers:
             unsub = self._unsubscribers.pop()
             unsub()
+        if self._store is not None and self._save_pending:
+            await self._store.async_save(self._snapshot())
+
+    async def async_restore(self) -> None:
+        """Load the last known devices and telemetry from storage.
+
+        Restored devices are marked stale until their next uplink so
+        entities can be created (and show their last values) at startup.
+        """
+        self._store = Store(self.hass, STORAGE_VERSION, f"{DOMAIN}.{self.entry_id}")
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self.reconciler.restore(stored.get("desired") or {})
+        if self.time_sync is not None:
+            self.time_sync.restore(stored.get("time_sync") or {})
+        for dev_eui, item in stored.get("devices", {}).items():
+            if dev_eui in self.devices:
+                continue
+            try:
+                last_seen = datetime.fromisoformat(item["last_seen"])
+            except (KeyError, TypeError, ValueError):
+                last_seen = datetime.now(timezone.utc)
+            if last_seen.tzinfo is None:
+                last_seen = last_seen.replace(tzinfo=timezone.utc)
+            model = item.get("model") or "UNKNOWN"
+            telemetry = item.get("telemetry") or {}
+            schema = self._models.schema(model)
+            if schema is not None:
+                # Stores written before normalization hold raw decoder output.
+                telemetry = schema.normalize(telemetry, self._strict_telemetry)
+            device = MilesightDevice(
+                dev_eui=dev_eui,
+                model=model,
+                name=item.get("name"),
+                serial_number=item.get("serial_number"),
+                sw_version=item.get("sw_version"),
+                hw_version=item.get("hw_version"),
+                first_seen=last_seen,
+                last_seen=last_seen,
+                stale=True,
+                telemetry=telemetry,
+            )
+            self.devices[dev_eui] = device
+            self.availability.seen(
+                dev_eui,
+                self._expected_interval(device),
+                age=(datetime.now(timezone.utc) - last_seen).total_seconds(),
+            )
+        _LOGGER.debug("Restored %s Milesight devices", len(self.devices))
+
+    def _snapshot(self) -> Dict[str, object]:
+        self._save_pending = False
+        return {
+            "devices": {
+                dev_eui: {
+                    "model": device.model,
+                    "name": device.name,
+                    "serial_number": device.serial_number,
+                    "sw_version": device.sw_version,
+                    "hw_version": device.hw_version,
+                    "last_seen": device.last_seen.isoformat(),
+                    "telemetry": device.telemetry,
+                }
+                for dev_eui, device in self.devices.items()
+            },
+            "desired": self.reconciler.as_dict(),
+            "time_sync": self.time_sync.as_dict() if self.time_sync else {},
+        }
+
+    def _async_schedule_save(self) -> None:
+        # Only arm the delayed save once so steady traffic cannot postpone it.
+        if self._store is None or self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
 
     def get_device(self, dev_eui: str) -> Optional[MilesightDevice]:
         return self.devices.get(dev_eui)
 
+    async def async_delete_device(self, dev_eui: str) -> None:
+        """Forget a device in every tracker and remove it from the registry."""
+        dev_eui = dev_eui.lower().strip()
+        self.devices.pop(dev_eui, None)
+        self._commanded.pop(dev_eui, None)
+        self.availability.forget(dev_eui)
+        self.link_quality.forget(dev_eui)
+        self.reconciler.forget(dev_eui)
+        self.heating_schedules.forget(dev_eui)
+        if self.dedupe is not None:
+            self.dedupe.forget(dev_eui)
+        if self.history is not None:
+            self.history.remove(dev_eui)
+        if self.time_sync is not None:
+            self.time_sync.forget(dev_eui)
+        registry = dr.async_get(self.hass)
+        registry_device = registry.async_get_device(identifiers={(DOMAIN, dev_eui)})
+        if registry_device is not None:
+            registry.async_remove_device(registry_device.id)
+        self._async_schedule_save()
+
+    def serialize_device(self, dev_eui: str) -> Optional[Dict[str, object]]:
+        """Full device state, including telemetry no entity was created for."""
+        device = self.devices.get(dev_eui)
+        if device is None:
+            return None
+        return {
+            "dev_eui": device.dev_eui,
+            "model": device.model,
+            "name": device.name,
+            "serial_number": device.serial_number,
+            "sw_version": device.sw_version,
+            "hw_version": device.hw_version,
+            "first_seen": device.first_seen.isoformat(),
+            "last_seen": device.last_seen.isoformat(),
+            "message_count": device.message_count,
+            "available": device.available,
+            "stale": device.stale,
+            "telemetry": device.telemetry,
+            "link_quality": self.link_quality.device_summary(dev_eui),
+            "desired_config": self.reconciler.desired(dev_eui),
+            "heating_schedule": self.heating_schedules.progress(dev_eui),
+        }
+
+    def serialize_devices(self) -> list[Dict[str, object]]:
+        return [self.serialize_device(dev_eui) for dev_eui in self.devices]
+
+    def envelope_dev_eui(self, parsed: Mapping[str, object]) -> Optional[str]:
+        """DevEUI carried in a decoded uplink under this entry's envelope."""
+        dev_eui = self._adapt(parsed, None, None).dev_eui
+        return dev_eui if isinstance(dev_eui, str) else None
+
     def register_mqtt(self, unsub: Callable[[], None]) -> None:
         self._unsubscribers.append(unsub)
 
-    async def async_handle_join_uplink(self, msg: mqtt.ReceiveMessage) -> None:
-        topic_dev_eui, topic_model = self._parse_topic(msg.topic)
+    async def async_handle_join_uplink(
+        self,
+        msg: mqtt.ReceiveMessage,
+        parsed: Optional[Dict[str, object]] = None,
+        parse_time: Optional[float] = None,
+    ) -> None:
+        """Handle an uplink; the ingest hub passes an already decoded payload."""
+        if self.profiler.active:
+            await self.profiler.async_profile(
+                self._async_handle_message, msg, parsed, parse_time
+            )
+            return
+        await self._async_handle_message(msg, parsed, parse_time)
 
-        parsed = {}
+    async def _async_handle_message(
+        self,
+        msg: mqtt.ReceiveMessage,
+        parsed: Optional[Dict[str, object]],
+        parse_time: Optional[float],
+    ) -> None:
+        start = perf_counter()
+        metrics = self.metrics
+        metrics.messages.hit()
+        topic_dev_eui, topic_model = self._parse_topic(msg.topic)
 
-        try:
-            parsed = json.loads(msg.payload)
-        except json.JSONDecodeError:
-            parsed = None
+        if parse_time is None:
+            parsed = parse_uplink(msg.payload)
+            parse_time = perf_counter() - start
+        else:
+            start -= parse_time
+        metrics.record(STAGE_PARSE, parse_time)
 
         if not parsed:
+            metrics.dropped += 1
             _LOGGER.warning("Ignoring unparsable uplink: %s", msg.payload)
             return
+        if parsed.keys() <= DOWNLINK_KEYS:
+            metrics.dropped += 1
+            return
+
+        uplink = self._adapt(parsed, topic_dev_eui, topic_model)
+        if uplink.dev_eui:
+            dev_eui = uplink.dev_eui.lower()
+            # Duplicates still count towards link quality (other gateways).
+            if self.link_quality.record(dev_eui, uplink) and dev_eui in self.devices:
+                async_dispatcher_send(
+                    self.hass, SIGNAL_NEW_LINK.format(entry_id=self.entry_id), dev_eui
+                )
+            # The Milesight envelope has no fCnt; gateway copies share the payload.
+            if self.dedupe is not None and self.dedupe.is_duplicate(
+                dev_eui,
+                uplink.fcnt if uplink.fcnt is not None else hash(msg.payload),
+                start,
+            ):
+                return
+        self._normalize(uplink)
+        if self.queue is not None:
+            self.queue.put(uplink, start, self._is_priority(uplink))
+            if self._drain_task is None:
+                self._drain_task = self.hass.async_create_background_task(
+                    self._async_drain(), f"{DOMAIN}_ingest_{self.entry_id}"
+                )
+            return
+        await self._async_process_uplink(uplink, start)
+
+    def _normalize(self, uplink: Uplink) -> None:
+        """Apply the model's telemetry schema so entities read canonical values."""
+        model = uplink.model or uplink.data.get("model")
+        if not model and uplink.dev_eui:
+            device = self.devices.get(uplink.dev_eui.lower())
+            model = device.model if device else None
+        schema = self._models.schema(model)  # type: ignore[arg-type]
+        if schema is not None:
+            uplink.data = schema.normalize(uplink.data, self._strict_telemetry)
 
+    def _is_priority(self, uplink: Uplink) -> bool:
+        """True when the uplink changes a security-relevant key."""
+        data = uplink.data
+        device = self.devices.get((uplink.dev_eui or "").lower())
+        for key in PRIORITY_KEYS:
+            if key in data and (device is None or device.telemetry.get(key) != data[key]):
+                return True
+        return False
+
+    async def _async_process_uplink(self, uplink: Uplink, start: float) -> None:
         await self._async_add_or_update_device(
-            topic_dev_eui,
-            model=topic_model,
-            data=parsed,
+            uplink.dev_eui,
+            model=uplink.model,
+            data=uplink.data,
+            name=uplink.name,
         )
+        self.metrics.record(STAGE_TOTAL, perf_counter() - start)
+
+    async def _async_drain(self) -> None:
+        """Process queued uplinks, yielding to the loop between batches."""
+        queue = self.queue
+        assert queue is not None
+        while True:
+            await queue.wait()
+            processed = 0
+            while (item := queue.pop()) is not None:
+                uplink, received = item
+                self.metrics.record(STAGE_QUEUE, perf_counter() - received)
+                try:
+                    if self.profiler.active:
+                        await self.profiler.async_profile(
+                            self._async_process_uplink, uplink, received, count=False
+                        )
+                    else:
+                        await self._async_process_uplink(uplink, received)
+                except Exception:  # pragma: no cover - keep the worker alive
+                    _LOGGER.exception("Error processing uplink for %s", uplink.dev_eui)
+                processed += 1
+                if processed % DRAIN_BATCH == 0:
+                    await asyncio.sleep(0)
 
     async def _async_add_or_update_device(
         self,
         dev_eui: str,
         model: Optional[str] = None,
-        data: Optional[Dict[str, object]] = None,
+        data: Optional[Mapping[str, object]] = None,
+        name: Optional[str] = None,
     ) -> None:
         if dev_eui is None:
+            self.metrics.dropped += 1
             _LOGGER.warning("Skipping device update with missing dev_eui")
             return
 
         dev_eui = dev_eui.lower().strip()
         if not dev_eui:
+            self.metrics.dropped += 1
             _LOGGER.warning("Skipping device update with missing dev_eui")
             return
 
-        name = data.get("deviceName")
+        if name is None:
+            name = data.get("deviceName")
 
         model = model.upper() if model else data.get("model", "UNKNOWN").upper()
 
@@ -100,6 +455,9 @@ class MilesightManager:
             )
 
         device.last_seen = datetime.now(timezone.utc)
+        device.message_count += 1
+        device.available = True
+        device.stale = False
         serial_number = data.get("sn")
         firmware_version = data.get("firmware_version")
         hardware_version = data.get("hardware_version")
@@ -119,16 +477,292 @@ class MilesightManager:
                 if key in ("deviceName", "model"):
                     continue
                 device.telemetry[key] = value
+            if self.history is not None:
+                self.history.record(
+                    dev_eui, data, time(), self._models.measurement_keys(device.model)
+                )
+            if dev_eui in self._commanded:
+                self._confirm_commands(device)
 
+        self.availability.seen(dev_eui, self._expected_interval(device))
+        self._async_schedule_save()
+
+        start = perf_counter()
         await self._async_sync_device_registry(device)
+        registry_done = perf_counter()
+        # Entity callbacks run inline, so this stage includes state writes.
         async_dispatcher_send(
             self.hass,
             SIGNAL_DEVICE_UPDATED.format(entry_id=self.entry_id, dev_eui=dev_eui),
             dev_eui,
         )
+        self.metrics.record(STAGE_REGISTRY, registry_done - start)
+        self.metrics.record(STAGE_DISPATCH, perf_counter() - registry_done)
+        if self.reconciler.active:
+            self._async_reconcile(device)
+        # Only a real uplink opens the receive window for the next frame.
+        if self.heating_schedules.active and data:
+            self._async_program_schedule(device)
+        if self.time_sync is not None and data:
+            self._async_time_sync(device, data)
+
+    def is_redundant_command(
+        self, dev_eui: str, model: Optional[str], payload: Mapping[str, object]
+    ) -> bool:
+        """True when the device already reports every value in ``payload``.
+
+        Commands with fields the model schema cannot map back to telemetry
+        (actions like reboot, unreported settings) are never redundant, and
+        neither is anything sent to a device restored from storage or a
+        value while a different one sent earlier is not yet reported back.
+        """
+        device = self.devices.get(dev_eui.lower().strip())
+        if device is None or device.stale or not payload:
+            return False
+        schema = self._models.schema(model or device.model)
+        wanted = schema.canonical(payload) if schema is not None else None
+        if not wanted:
+            return False
+        telemetry = device.telemetry
+        commanded = self._commanded.get(device.dev_eui, {})
+        return all(
+            telemetry.get(key) == value and commanded.get(key, value) == value
+            for key, value in wanted.items()
+        )
+
+    def record_command(
+        self, dev_eui: str, model: Optional[str], payload: Mapping[str, object]
+    ) -> None:
+        """Remember values sent to a device until its telemetry reports them."""
+        device = self.devices.get(dev_eui.lower().strip())
+        if device is None:
+            return
+        schema = self._models.schema(model or device.model)
+        sent = schema.canonical(payload) if schema is not None else None
+        if sent:
+            self._commanded.setdefault(device.dev_eui, {}).update(sent)
+
+    def _confirm_commands(self, device: MilesightDevice) -> None:
+        commanded = self._commanded[device.dev_eui]
+        telemetry = device.telemetry
+        for key in [key for key, value in commanded.items() if telemetry.get(key) == value]:
+            del commanded[key]
+        if not commanded:
+            del self._commanded[device.dev_eui]
+
+    def set_desired_config(
+        self,
+        config: Mapping[str, object],
+        dev_euis: list[str] | None = None,
+        group: Optional[str] = None,
+        replace: bool = False,
+    ) -> None:
+        """Update a desired-config policy; devices converge on their next uplink."""
+        self.reconciler.set_policy(config, dev_euis or (), group, replace)
+        self._async_schedule_save()
+
+    def _async_reconcile(self, device: MilesightDevice) -> None:
+        """Send the settings that differ from the device's desired config."""
+        payload = self.reconciler.check(
+            device.dev_eui, device.model, device.telemetry, time()
+        )
+        if payload is not None:
+            self.hass.async_create_task(self._async_send_desired(device, payload))
+
+    async def _async_send_desired(
+        self, device: MilesightDevice, payload: Dict[str, object]
+    ) -> None:
+        _LOGGER.debug("Reconciling %s towards desired config: %s", device.dev_eui, payload)
+        if not await self._async_send(device, payload):
+            self.reconciler.failed(device.dev_eui, time())
+
+    def program_heating_schedule(
+        self, dev_euis: list[str], slots: list[Dict[str, object]]
+    ) -> Dict[str, object]:
+        """Start programming ``slots`` on each device; returns per-device progress.
+
+        The first frame is queued right away, the rest one per uplink.
+        """
+        result: Dict[str, object] = {}
+        for dev_eui in dev_euis:
+            dev_eui = dev_eui.lower().strip()
+            device = self.devices.get(dev_eui)
+            descriptor = self._models.get(device.model) if device else None
+            if descriptor is None or not descriptor.heating_schedule_slots:
+                result[dev_eui] = {"error": "unknown device or model without heating schedules"}
+                continue
+            limit = descriptor.heating_schedule_slots
+            if any(not 1 <= slot["index"] <= limit for slot in slots):  # type: ignore[operator]
+                result[dev_eui] = {"error": f"index must be between 1 and {limit}"}
+                continue
+            self.heating_schedules.start(dev_eui, slots)
+            self._async_program_schedule(device)
+            result[dev_eui] = self.heating_schedules.progress(dev_eui)
+        return result
+
+    def _async_program_schedule(self, device: MilesightDevice) -> None:
+        """Send the next heating-schedule frame, if programming is under way."""
+        frame = self.heating_schedules.next_frame(
+            device.dev_eui, self.link_quality.max_payload(device.dev_eui)
+        )
+        if frame is not None:
+            self.hass.async_create_task(self._async_send_schedule_frame(device, frame))
+
+    async def _async_send_schedule_frame(
+        self, device: MilesightDevice, frame: list[Dict[str, object]]
+    ) -> None:
+        if not await self._async_send(device, {"heating_schedule": frame}):
+            self.heating_schedules.failed(device.dev_eui)
+
+    def async_configure_time_sync(self, time_zone: str) -> None:
+        """(Re)compute the fleet time config and arm the next DST transition."""
+        scheduler = self.time_sync
+        if scheduler is None:
+            return
+        now = time()
+        if scheduler.configure(time_zone, now):
+            _LOGGER.debug("Milesight fleet time config: %s", scheduler.payload)
+        if self._time_sync_unsub is not None:
+            self._time_sync_unsub()
+            self._time_sync_unsub = None
+        transition = scheduler.next_transition(now)
+        if transition is None:
+            return
+
+        @callback
+        def _async_transition(_now: datetime) -> None:
+            self._time_sync_unsub = None
+            scheduler.resend_all()
+            self.async_configure_time_sync(time_zone)
+
+        self._time_sync_unsub = async_track_point_in_utc_time(
+            self.hass,
+            _async_transition,
+            datetime.fromtimestamp(transition, timezone.utc),
+        )
+
+    def _async_time_sync(self, device: MilesightDevice, data: Mapping[str, object]) -> None:
+        """Send the cached time config or a clock sync when the device is due."""
+        scheduler = self.time_sync
+        assert scheduler is not None
+        descriptor = self._models.get(device.model)
+        if (
+            descriptor is None
+            or not descriptor.time_sync
+            or not scheduler.can_encode(descriptor.codec)
+        ):
+            return
+        kind = scheduler.check(device.dev_eui, data, time())
+        if kind is None:
+            return
+        try:
+            frame = scheduler.frame(descriptor.codec, kind, encode_payload)
+        except EncodeError as err:
+            self.downlink_errors += 1
+            # Permanent for this payload: retrying on every uplink only spams.
+            scheduler.encode_failed(descriptor.codec, device.dev_eui)
+            _LOGGER.warning(
+                "Cannot encode time config for %s, time sync paused until the "
+                "time zone or codecs change: %s",
+                device.model,
+                err,
+            )
+            return
+        self.hass.async_create_task(self._async_publish_time_sync(device, kind, frame))
+
+    async def _async_publish_time_sync(
+        self, device: MilesightDevice, kind: str, frame: object
+    ) -> None:
+        try:
+            await self.async_publish_downlink(device, frame)
+        except HomeAssistantError as err:
+            if kind == FRAME_CONFIG:
+                self.time_sync.failed(device.dev_eui)  # type: ignore[union-attr]
+            _LOGGER.warning("Time sync downlink to %s failed: %s", device.dev_eui, err)
+
+    async def async_encode(self, codec: str, payload: Dict[str, object]) -> object:
+        """Encode a downlink, in a codec worker when the codec is isolated."""
+        pool = self.codec_pool
+        if pool is not None:
+            encoder_path = resolve_encoder(codec, payload)
+            if pool.isolates(encoder_path):
+                return await pool.async_encode(encoder_path, payload)
+        return encode_payload(codec, payload)
+
+    async def async_send_command(
+        self,
+        dev_eui: str,
+        model: Optional[str],
+        payload: Dict[str, object],
+        force: bool = False,
+    ) -> bool:
+        """Encode and publish a command; False when suppressed as redundant.
+
+        Raises ``EncodeError`` or ``HomeAssistantError`` when it cannot be sent.
+        """
+        dev_eui = dev_eui.lower().strip()
+        device = self.devices.get(dev_eui)
+        model = (model or (device.model if device else "")).lower()
+        if not model:
+            raise HomeAssistantError(f"Model of {dev_eui} is unknown; pass model")
+        if not force and self.is_redundant_command(dev_eui, model, payload):
+            self.downlinks_suppressed += 1
+            _LOGGER.debug("Skipping downlink to %s, already reported: %s", dev_eui, payload)
+            return False
+        try:
+            encoded = await self.async_encode(self._models.codec(model), payload)
+        except EncodeError:
+            self.downlink_errors += 1
+            raise
+        await self._async_publish(dev_eui, model, encoded)
+        self.record_command(dev_eui, model, payload)
+        return True
+
+    async def async_publish_downlink(self, device: MilesightDevice, encoded: object) -> None:
+        """Publish an already encoded downlink to the device's downlink topic."""
+        await self._async_publish(device.dev_eui, device.model.lower(), encoded)
+
+    async def _async_publish(self, dev_eui: str, model: str, encoded: object) -> None:
+        message = downlink_message(encoded)
+        if message is None:
+            raise HomeAssistantError(f"Unsupported encoded payload type: {type(encoded)}")
+        topic = build_downlink_topic(self._downlink_topic, model, dev_eui)
+        await mqtt.async_publish(self.hass, topic, message)
+        self.downlinks_sent += 1
+
+    async def _async_send(self, device: MilesightDevice, payload: Dict[str, object]) -> bool:
+        """Encode and publish a downlink; False (logged) on failure."""
+        try:
+            await self.async_send_command(device.dev_eui, device.model, payload)
+        except (EncodeError, HomeAssistantError) as err:
+            _LOGGER.warning("Downlink to %s failed: %s", device.dev_eui, err)
+            return False
+        return True
+
+    def _expected_interval(self, device: MilesightDevice) -> float:
+        """Report period in seconds from telemetry report_interval (minutes)."""
+        try:
+            minutes = float(device.telemetry.get("report_interval"))  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return DEFAULT_REPORT_INTERVAL
+        return minutes * 60 if minutes > 0 else DEFAULT_REPORT_INTERVAL
+
+    def _async_availability_changed(self, dev_eui: str, available: bool) -> None:
+        device = self.devices.get(dev_eui)
+        if device is None or device.available == available:
+            return
+        device.available = available
+        if not available:
+            _LOGGER.debug("Milesight device %s stopped reporting", dev_eui)
+            async_dispatcher_send(
+                self.hass,
+                SIGNAL_DEVICE_UPDATED.format(entry_id=self.entry_id, dev_eui=dev_eui),
+                dev_eui,
+            )
 
     async def _async_sync_device_registry(self, dev: MilesightDevice) -> None:
         """Ensure device is represented in HA's registry."""
+        self.metrics.registry_calls.hit()
         registry = dr.async_get(self.hass)
         try:
             registry.async_get_or_create(
@@ -147,12 +781,68 @@ class MilesightManager:
             )
 
     def _parse_topic(self, topic: str | None) -> tuple[Optional[str], Optional[str]]:
-        """Extract dev_eui and model from topic milesight/{model}/{dev_eui}/<type>."""
-        if not topic:
-            return None, None
-        parts = topic.split("/")
-        if len(parts) < 4 or parts[0] != "milesight":
-            return None, None
-        model = parts[1].upper() if parts[1] else None
-        dev_eui = parts[2]
-        return dev_eui, model
+        return parse_topic(topic)
+
+
+def loaded_managers(hass: HomeAssistant) -> list[MilesightManager]:
+    """Managers of the loaded config entries."""
+    return list(hass.data.get(DOMAIN, {}).values())
+
+
+def manager_for_device(hass: HomeAssistant, dev_eui: str) -> Optional[MilesightManager]:
+    """The loaded manager that owns ``dev_eui``, if any."""
+    dev_eui = dev_eui.lower().strip()
+    for manager in loaded_managers(hass):
+        if dev_eui in manager.devices:
+            return manager
+    return None
+
+
+def parse_uplink(payload: str | bytes) -> Optional[Dict[str, object]]:
+    """Decode an uplink JSON payload, returning None when it is unusable."""
+    try:
+        parsed = json.loads(payload)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return parsed if isinstance(parsed, dict) and parsed else None
+
+
+def parse_topic(topic: str | None) -> tuple[Optional[str], Optional[str]]:
+    """Extract dev_eui and model from topic milesight/{model}/{dev_eui}/<type>."""
+    if not topic:
+        return None, None
+    parts = topic.split("/")
+    if len(parts) < 4 or parts[0] != "milesight":
+        return None, None
+    model = parts[1].upper() if parts[1] else None
+    dev_eui = parts[2]
+    return dev_eui, model
+
+
+def build_downlink_topic(template: str, model: str, dev_eui: str) -> str:
+    """Build a downlink topic from a template and identifiers."""
+    if not template:
+        return f"milesight/{model}/{dev_eui}/downlink"
+    if "{model}" in template or "{dev_eui}" in template:
+        return template.format(model=model, dev_eui=dev_eui)
+    if "+" in template:
+        parts = template.split("+", 2)
+        filled = []
+        replacements = [model, dev_eui]
+        repl_idx = 0
+        for part in parts:
+            filled.append(part)
+            if repl_idx < len(replacements):
+                filled.append(replacements[repl_idx])
+                repl_idx += 1
+        return "".join(filled)
+    return template
+
+
+def downlink_message(encoded: object) -> Optional[str]:
+    """MQTT message for encoder output: JSON for a downlink dict, else hex."""
+    if isinstance(encoded, dict):
+        return json.dumps(encoded)
+    if isinstance(encoded, (bytes, bytearray, list, tuple)):
+        return bytes(encoded).hex()
+    return None
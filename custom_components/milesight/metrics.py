@@ -0,0 +1,124 @@
+"""Lightweight ingest metrics (stage timers, rolling histograms, rates)."""
+
+from __future__ import annotations
+
+from array import array
+from time import monotonic
+from typing import Dict
+
+STAGE_PARSE = "parse"
+STAGE_QUEUE = "queue"
+STAGE_REGISTRY = "registry"
+STAGE_DISPATCH = "dispatch"
+STAGE_TOTAL = "total"
+STAGES = (STAGE_PARSE, STAGE_QUEUE, STAGE_REGISTRY, STAGE_DISPATCH, STAGE_TOTAL)
+
+DEFAULT_HISTOGRAM_SIZE = 1024
+DEFAULT_RATE_WINDOW = 60
+
+
+class RollingHistogram:
+    """Fixed-size ring of the most recent samples (seconds)."""
+
+    __slots__ = ("_samples", "_size", "_index", "_count")
+
+    def __init__(self, size: int = DEFAULT_HISTOGRAM_SIZE) -> None:
+        self._samples = array("d", bytes(8 * size))
+        self._size = size
+        self._index = 0
+        self._count = 0
+
+    def add(self, value: float) -> None:
+        self._samples[self._index] = value
+        self._index = (self._index + 1) % self._size
+        if self._count < self._size:
+            self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def percentile(self, pct: float) -> float | None:
+        """Nearest-rank percentile over the retained samples."""
+        if not self._count:
+            return None
+        ordered = sorted(self._samples[: self._count])
+        rank = max(0, min(self._count - 1, round(pct / 100 * self._count) - 1))
+        return ordered[rank]
+
+    def summary(self) -> Dict[str, float | int | None]:
+        """Return count, mean and p50/p95/p99/max in milliseconds."""
+        if not self._count:
+            return {"count": 0}
+        ordered = sorted(self._samples[: self._count])
+        count = self._count
+
+        def _pct(pct: float) -> float:
+            return ordered[max(0, min(count - 1, round(pct / 100 * count) - 1))] * 1000
+
+        return {
+            "count": count,
+            "mean_ms": sum(ordered) / count * 1000,
+            "p50_ms": _pct(50),
+            "p95_ms": _pct(95),
+            "p99_ms": _pct(99),
+            "max_ms": ordered[-1] * 1000,
+        }
+
+
+class RateCounter:
+    """Events per second over a sliding window of one-second buckets."""
+
+    __slots__ = ("_window", "_seconds", "_counts", "total")
+
+    def __init__(self, window: int = DEFAULT_RATE_WINDOW) -> None:
+        self._window = window
+        self._seconds = array("q", bytes(8 * window))
+        self._counts = array("q", bytes(8 * window))
+        self.total = 0
+
+    def hit(self, count: int = 1) -> None:
+        second = int(monotonic())
+        idx = second % self._window
+        if self._seconds[idx] != second:
+            self._seconds[idx] = second
+            self._counts[idx] = 0
+        self._counts[idx] += count
+        self.total += count
+
+    def rate(self) -> float:
+        now = int(monotonic())
+        oldest = now - self._window
+        hits = 0
+        for second, count in zip(self._seconds, self._counts):
+            if oldest < second <= now:
+                hits += count
+        return hits / self._window
+
+
+class IngestMetrics:
+    """Per-stage timings and counters for the uplink path."""
+
+    def __init__(
+        self,
+        histogram_size: int = DEFAULT_HISTOGRAM_SIZE,
+        rate_window: int = DEFAULT_RATE_WINDOW,
+    ) -> None:
+        self.stages: Dict[str, RollingHistogram] = {
+            stage: RollingHistogram(histogram_size) for stage in STAGES
+        }
+        self.messages = RateCounter(rate_window)
+        self.registry_calls = RateCounter(rate_window)
+        self.dropped = 0
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.stages[stage].add(seconds)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "messages_total": self.messages.total,
+            "messages_per_second": self.messages.rate(),
+            "registry_calls_total": self.registry_calls.total,
+            "registry_calls_per_second": self.registry_calls.rate(),
+            "dropped": self.dropped,
+            "stages": {stage: hist.summary() for stage, hist in self.stages.items()},
+        }
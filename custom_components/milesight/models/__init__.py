@@ -1,13 +1,45 @@
-"""Per-model definitions (sensors, etc.)."""
+"""Per-model definitions (sensors, controls, codec binding)."""
 
-from .wt101 import WT101_SENSORS, WT101_BINARIES
+from __future__ import annotations
 
-# Map model id -> sensor descriptions
-MODEL_SENSORS = {
-    "WT101": WT101_SENSORS,
-}
+from typing import Optional
 
-# Map model id -> binary sensor descriptions
-MODEL_BINARIES = {
-    "WT101": WT101_BINARIES,
-}
+from .registry import (
+    DownlinkSetting,
+    ModelDescriptor,
+    ModelRegistry,
+    ModelValidationError,
+)
+from .telemetry import CompiledSchema, TelemetryField
+from .wt101 import WT101
+
+# Every supported model; add a descriptor here to support a new device.
+MODEL_DESCRIPTORS: tuple[ModelDescriptor, ...] = (WT101,)
+
+_REGISTRY: Optional[ModelRegistry] = None
+
+
+def load_model_registry() -> ModelRegistry:
+    """Build and validate the registry once (blocking, run in an executor)."""
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = ModelRegistry(MODEL_DESCRIPTORS)
+    return _REGISTRY
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the registry loaded during entry setup."""
+    return _REGISTRY if _REGISTRY is not None else load_model_registry()
+
+
+__all__ = [
+    "CompiledSchema",
+    "DownlinkSetting",
+    "MODEL_DESCRIPTORS",
+    "ModelDescriptor",
+    "ModelRegistry",
+    "ModelValidationError",
+    "TelemetryField",
+    "get_model_registry",
+    "load_model_registry",
+]
@@ -0,0 +1,162 @@
+"""Declarative model descriptors and the indexed registry built from them."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+
+from homeassistant.components.binary_sensor import BinarySensorEntityDescription
+from homeassistant.components.sensor import SensorEntityDescription
+
+from ..encoder import get_codec
+from .telemetry import CompiledSchema, TelemetryField
+
+# Control keys the switch/number/button/climate platforms know how to build.
+CONTROLS = frozenset(
+    {"child_lock", "freeze_protection", "target_temperature", "reboot", "report_status"}
+)
+
+
+class ModelValidationError(ValueError):
+    """Raised when a model descriptor is inconsistent."""
+
+
+@dataclass(frozen=True, kw_only=True)
+class DownlinkSetting:
+    """Canonical telemetry keys written together by one encoder command.
+
+    ``build`` turns the values to write (reported values filling in keys
+    that are not changing) into an encoder payload fragment. Numeric values
+    within ``tolerance`` of the reported value count as equal.
+    """
+
+    keys: tuple[str, ...]
+    build: Callable[[Mapping[str, Any]], Dict[str, Any]]
+    tolerance: float = 0.0
+
+
+@dataclass(frozen=True, kw_only=True)
+class ModelDescriptor:
+    """Everything the integration needs to know about one device model."""
+
+    model: str
+    codec: str
+    sensors: tuple[SensorEntityDescription, ...] = ()
+    binary_sensors: tuple[BinarySensorEntityDescription, ...] = ()
+    controls: frozenset[str] = field(default_factory=frozenset)
+    climate: bool = False
+    aliases: tuple[str, ...] = ()
+    telemetry: tuple[TelemetryField, ...] = ()
+    settings: tuple[DownlinkSetting, ...] = ()
+    # Slots of the codec's heating_schedule command (0: not supported)
+    heating_schedule_slots: int = 0
+    # Codec accepts time_zone, dst_config and sync_time
+    time_sync: bool = False
+
+
+def _validate(descriptor: ModelDescriptor) -> None:
+    name = descriptor.model
+    for platform, descriptions in (
+        ("sensor", descriptor.sensors),
+        ("binary_sensor", descriptor.binary_sensors),
+    ):
+        keys = [description.key for description in descriptions]
+        if len(keys) != len(set(keys)):
+            raise ModelValidationError(f"{name}: duplicate {platform} keys")
+    unknown = descriptor.controls - CONTROLS
+    if unknown:
+        raise ModelValidationError(f"{name}: unknown controls {sorted(unknown)}")
+    if descriptor.climate and "target_temperature" not in descriptor.controls:
+        raise ModelValidationError(f"{name}: climate requires target_temperature")
+    telemetry_keys = {item.key for item in descriptor.telemetry}
+    setting_keys = [key for setting in descriptor.settings for key in setting.keys]
+    if len(setting_keys) != len(set(setting_keys)):
+        raise ModelValidationError(f"{name}: key written by several settings")
+    unknown = set(setting_keys) - telemetry_keys
+    if unknown:
+        raise ModelValidationError(f"{name}: settings for unknown keys {sorted(unknown)}")
+    codec = get_codec(descriptor.codec)
+    if codec is None or codec.encoder is None:
+        raise ModelValidationError(f"{name}: no encoder for codec {descriptor.codec}")
+
+
+def _measurement_keys(descriptor: ModelDescriptor) -> frozenset[str]:
+    """Sensor keys that are readings rather than diagnostics or settings."""
+    setting_keys = {key for setting in descriptor.settings for key in setting.keys}
+    return frozenset(
+        description.key
+        for description in descriptor.sensors
+        if description.entity_category is None
+        and getattr(description, "value_map", None) is None
+        and description.key not in setting_keys
+    )
+
+
+class ModelRegistry:
+    """Validated descriptors indexed by upper-case model id and alias.
+
+    Building may discover codecs on disk, so construct it in an executor;
+    lookups afterwards are plain dict hits.
+    """
+
+    def __init__(self, descriptors: Iterable[ModelDescriptor]) -> None:
+        self._models: Dict[str, ModelDescriptor] = {}
+        self._schemas: Dict[str, CompiledSchema] = {}
+        self._measurements: Dict[str, frozenset[str]] = {}
+        self._writable: set[str] = set()
+        self._setting_keys: set[tuple[str, ...]] = set()
+        for descriptor in descriptors:
+            _validate(descriptor)
+            self._setting_keys.update(setting.keys for setting in descriptor.settings)
+            self._writable.update(key for keys in self._setting_keys for key in keys)
+            schema = CompiledSchema(descriptor.telemetry) if descriptor.telemetry else None
+            measurements = _measurement_keys(descriptor)
+            for model in (descriptor.model, *descriptor.aliases):
+                key = model.upper()
+                if key in self._models:
+                    raise ModelValidationError(f"model {key} defined twice")
+                self._models[key] = descriptor
+                self._measurements[key] = measurements
+                if schema is not None:
+                    self._schemas[key] = schema
+
+    def __contains__(self, model: str) -> bool:
+        return (model or "").upper() in self._models
+
+    @property
+    def models(self) -> list[str]:
+        return sorted(self._models)
+
+    def get(self, model: str | None) -> Optional[ModelDescriptor]:
+        return self._models.get((model or "").upper())
+
+    def schema(self, model: str | None) -> Optional[CompiledSchema]:
+        """Compiled telemetry schema for ``model`` (None: pass data through)."""
+        return self._schemas.get((model or "").upper())
+
+    def measurement_keys(self, model: str | None) -> Optional[frozenset[str]]:
+        """Numeric reading keys worth keeping history for (None: unknown model)."""
+        return self._measurements.get((model or "").upper())
+
+    @property
+    def schemas(self) -> Dict[str, CompiledSchema]:
+        return self._schemas
+
+    @property
+    def writable(self) -> frozenset[str]:
+        """Canonical keys at least one model can write through a setting."""
+        return frozenset(self._writable)
+
+    @property
+    def setting_keys(self) -> frozenset[tuple[str, ...]]:
+        """Key groups that are always written together, across all models."""
+        return frozenset(self._setting_keys)
+
+    def supports(self, model: str | None, control: str) -> bool:
+        descriptor = self.get(model)
+        return descriptor is not None and control in descriptor.controls
+
+    def codec(self, model: str | None) -> str:
+        """Codec directory for ``model``, falling back to the model id."""
+        descriptor = self.get(model)
+        return descriptor.codec if descriptor else (model or "").strip().lower()
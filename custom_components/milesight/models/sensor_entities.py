@@ -1,3 +1,6 @@
+from dataclasses import dataclass
+from typing import Mapping
+
 from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorDeviceClass,
@@ -5,6 +8,27 @@ from homeassistant.components.sensor import (
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.const import PERCENTAGE, UnitOfTemperature
 
+
+@dataclass(frozen=True, kw_only=True)
+class MilesightSensorEntityDescription(SensorEntityDescription):
+    """Sensor description with telemetry lookup, transform and write filtering.
+
+    ``path`` is a dotted path into nested telemetry (defaults to ``key``) and
+    ``value_map`` translates canonical (schema-normalized) values into labels.
+    A new value is written when it moves by at least ``deadband`` (absolute)
+    or ``deadband_relative`` (fraction of the last written value), no sooner
+    than ``min_interval`` seconds after the previous write, and at least
+    every ``max_silence`` seconds while uplinks keep arriving.
+    """
+
+    path: str | None = None
+    value_map: Mapping[object, str] | None = None
+    deadband: float | None = None
+    deadband_relative: float | None = None
+    min_interval: float | None = None
+    max_silence: float | None = None
+
+
 ipso_version = SensorEntityDescription(
     key="ipso_version",
     name="IPSO Version",
@@ -23,10 +47,11 @@ firmware_version = SensorEntityDescription(
     entity_category=EntityCategory.DIAGNOSTIC,
 )
 
-lorawan_class = SensorEntityDescription(
+lorawan_class = MilesightSensorEntityDescription(
     key="lorawan_class",
     name="LoRaWAN Class",
     entity_category=EntityCategory.DIAGNOSTIC,
+    value_map={0: "Class A", 1: "Class B", 2: "Class C", 3: "Class CtoB"},
 )
 
 sn = SensorEntityDescription(
@@ -48,11 +73,13 @@ battery = SensorEntityDescription(
     device_class=SensorDeviceClass.BATTERY,
 )
 
-temperature = SensorEntityDescription(
+temperature = MilesightSensorEntityDescription(
     key="temperature",
     name="Ambient Temperature",
     native_unit_of_measurement=UnitOfTemperature.CELSIUS,
     device_class=SensorDeviceClass.TEMPERATURE,
+    deadband=0.2,
+    max_silence=3600,
 )
 
 target_temperature = SensorEntityDescription(
@@ -62,15 +89,24 @@ target_temperature = SensorEntityDescription(
     device_class=SensorDeviceClass.TEMPERATURE,
 )
 
-valve_opening = SensorEntityDescription(
+valve_opening = MilesightSensorEntityDescription(
     key="valve_opening",
     name="Valve Opening",
     native_unit_of_measurement=PERCENTAGE,
+    deadband=2,
+    max_silence=3600,
 )
 
-motor_calibration_result = SensorEntityDescription(
+motor_calibration_result = MilesightSensorEntityDescription(
     key="motor_calibration_result",
     name="Motor Calibration Result",
+    value_map={
+        0: "success",
+        1: "fail: out of range",
+        2: "fail: uninstalled",
+        3: "calibration cleared",
+        4: "temperature control disabled",
+    },
 )
 motor_stroke = SensorEntityDescription(
     key="motor_stroke",
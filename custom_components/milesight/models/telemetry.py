@@ -0,0 +1,204 @@
+"""Per-model telemetry schemas compiled once and applied at ingest."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional
+
+# Keys the manager itself reads; kept even when unknown keys are dropped.
+PASSTHROUGH_KEYS = frozenset({"deviceName", "model"})
+
+_TRUE = frozenset({"1", "true", "on", "yes", "enable", "enabled"})
+_FALSE = frozenset({"0", "false", "off", "no", "disable", "disabled"})
+
+
+@dataclass(frozen=True, kw_only=True)
+class TelemetryField:
+    """One canonical telemetry key.
+
+    ``sources`` are tried in order, each as a literal (flattened) key and
+    then as a dotted path into nested dicts; the default source is ``key``.
+    ``values`` maps lower-cased string labels onto canonical values before
+    the value is coerced to ``type``.
+    """
+
+    key: str
+    type: type
+    sources: tuple[str, ...] = ()
+    values: Optional[Mapping[str, Any]] = None
+
+
+def _to_bool(raw: Any) -> Optional[bool]:
+    if isinstance(raw, bool):
+        return raw
+    if isinstance(raw, (int, float)):
+        return raw != 0
+    text = str(raw).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    return None
+
+
+def _to_int(raw: Any) -> Optional[int]:
+    if isinstance(raw, int) and not isinstance(raw, bool):
+        return raw
+    try:
+        return int(float(raw))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(raw: Any) -> Optional[float]:
+    if isinstance(raw, float):
+        return raw
+    if isinstance(raw, bool):
+        return None
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_str(raw: Any) -> Optional[str]:
+    return raw if isinstance(raw, str) else str(raw)
+
+
+_COERCERS: Dict[type, Callable[[Any], Any]] = {
+    bool: _to_bool,
+    int: _to_int,
+    float: _to_float,
+    str: _to_str,
+}
+
+
+def _compile_field(field: TelemetryField) -> Callable[[Any], Any]:
+    coerce = _COERCERS[field.type]
+    values = {str(label).lower(): value for label, value in (field.values or {}).items()}
+    if not values:
+        return coerce
+
+    def _mapped(raw: Any) -> Any:
+        if isinstance(raw, str):
+            mapped = values.get(raw.strip().lower(), raw)
+            return coerce(mapped)
+        return coerce(raw)
+
+    return _mapped
+
+
+class CompiledSchema:
+    """Normalize raw decoder output into canonical, typed telemetry.
+
+    Compilation indexes every source by its top-level raw key, so
+    normalizing costs one dict lookup per key actually present in the
+    uplink rather than a probe per declared field.
+    """
+
+    __slots__ = ("_by_key", "_flat", "_nested", "errors")
+
+    def __init__(self, fields: tuple[TelemetryField, ...]) -> None:
+        # raw key -> (canonical key, coerce, priority)
+        flat: Dict[str, tuple[str, Callable[[Any], Any], int]] = {}
+        # top-level raw key -> [(sub path, canonical key, coerce, priority)]
+        nested: Dict[str, list[tuple[tuple[str, ...], str, Callable[[Any], Any], int]]] = {}
+        by_key: Dict[str, Callable[[Any], Any]] = {}
+        for field in fields:
+            if field.type not in _COERCERS:
+                raise ValueError(f"{field.key}: unsupported type {field.type!r}")
+            coerce = by_key[field.key] = _compile_field(field)
+            for priority, source in enumerate(field.sources or (field.key,)):
+                # Flattened gateways send "a.b" literally; others nest it.
+                flat[source] = (field.key, coerce, priority)
+                if "." in source:
+                    top, *rest = source.split(".")
+                    nested.setdefault(top, []).append(
+                        (tuple(rest), field.key, coerce, priority)
+                    )
+        self._by_key = by_key
+        self._flat = flat
+        self._nested = nested
+        self.errors = 0
+
+    def coerce(self, key: str, value: Any) -> Any:
+        """Coerce ``value`` for canonical ``key``; None if unknown or invalid."""
+        coerce = self._by_key.get(key)
+        return None if coerce is None or value is None else coerce(value)
+
+    def canonical(self, payload: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """Canonical view of a downlink payload.
+
+        None when any field has no telemetry counterpart, i.e. the command
+        cannot be compared against reported state.
+        """
+        out: Dict[str, Any] = {}
+        for raw_key, raw in payload.items():
+            if isinstance(raw, dict):
+                paths = {
+                    path: (key, coerce)
+                    for path, key, coerce, _priority in self._nested.get(raw_key, ())
+                }
+                items = [(paths.get((sub_key,)), sub) for sub_key, sub in raw.items()]
+            else:
+                spec = self._flat.get(raw_key)
+                items = [(spec[:2] if spec is not None else None, raw)]
+            for entry, value in items:
+                if entry is None or value is None or isinstance(value, (dict, list)):
+                    return None
+                key, coerce = entry
+                value = coerce(value)
+                if value is None:
+                    return None
+                out[key] = value
+        return out
+
+    def normalize(self, data: Mapping[str, Any], strict: bool = False) -> Dict[str, Any]:
+        """Return canonical telemetry; unknown keys are kept unless ``strict``.
+
+        When several sources of one field are present, the earliest listed
+        source wins.
+        """
+        out: Dict[str, Any] = {}
+        chosen: Optional[Dict[str, int]] = None
+        flat = self._flat
+        nested = self._nested
+        for raw_key, raw in data.items():
+            spec = flat.get(raw_key)
+            if spec is not None:
+                candidates = ((spec[0], spec[1], spec[2], raw),)
+            elif raw_key in nested:
+                candidates = tuple(
+                    (key, coerce, priority, _dig(raw, path))
+                    for path, key, coerce, priority in nested[raw_key]
+                )
+            else:
+                if not strict or raw_key in PASSTHROUGH_KEYS:
+                    out[raw_key] = raw
+                continue
+            for key, coerce, priority, value in candidates:
+                if value is None:
+                    continue
+                value = coerce(value)
+                if value is None:
+                    self.errors += 1
+                    continue
+                if key in out:
+                    if chosen is None:
+                        chosen = {}
+                    if chosen.get(key, 0) <= priority:
+                        continue
+                out[key] = value
+                if priority:
+                    if chosen is None:
+                        chosen = {}
+                    chosen[key] = priority
+        return out
+
+
+def _dig(value: Any, path: tuple[str, ...]) -> Any:
+    for part in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
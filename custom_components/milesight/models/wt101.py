@@ -1,4 +1,4 @@
-"""Sensor descriptions for WT101."""
+"""Model descriptor for the WT101 radiator thermostat."""
 
 from homeassistant.components.sensor import (
     SensorEntityDescription,
@@ -6,6 +6,8 @@ from homeassistant.components.sensor import (
 from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
+from .registry import DownlinkSetting, ModelDescriptor
+from .telemetry import TelemetryField
 from .sensor_entities import (
     ipso_version,
     hardware_version,
@@ -52,3 +54,143 @@ WT101_BINARIES: tuple[BinarySensorEntityDescription, ...] = (
     time_sync_enable,
     freeze_protection,
 )
+
+WT101_TELEMETRY: tuple[TelemetryField, ...] = (
+    TelemetryField(key="ipso_version", type=str),
+    TelemetryField(key="hardware_version", type=str),
+    TelemetryField(key="firmware_version", type=str),
+    TelemetryField(key="tsl_version", type=str),
+    TelemetryField(key="sn", type=str),
+    TelemetryField(
+        key="lorawan_class",
+        type=int,
+        values={"class a": 0, "class b": 1, "class c": 2, "class ctob": 3},
+    ),
+    TelemetryField(key="battery", type=int),
+    TelemetryField(key="temperature", type=float),
+    TelemetryField(key="target_temperature", type=float),
+    TelemetryField(key="temperature_tolerance", type=float),
+    TelemetryField(key="min_target_temperature", type=float),
+    TelemetryField(key="max_target_temperature", type=float),
+    TelemetryField(key="valve_opening", type=int),
+    TelemetryField(
+        key="motor_calibration_result",
+        type=int,
+        values={
+            "success": 0,
+            "fail: out of range": 1,
+            "fail: uninstalled": 2,
+            "calibration cleared": 3,
+            "temperature control disabled": 4,
+        },
+    ),
+    TelemetryField(key="motor_stroke", type=int),
+    TelemetryField(key="motor_position", type=int),
+    TelemetryField(key="report_interval", type=int),
+    TelemetryField(key="device_status", type=bool),
+    TelemetryField(
+        key="tamper_status",
+        type=bool,
+        values={"installed": False, "uninstalled": True},
+    ),
+    TelemetryField(
+        key="window_detection",
+        type=bool,
+        values={"normal": False, "open": True},
+    ),
+    TelemetryField(key="time_sync_enable", type=bool),
+    TelemetryField(key="timestamp", type=int),
+    TelemetryField(key="freeze_protection", type=bool),
+    TelemetryField(
+        key="freeze_protection_enable",
+        type=bool,
+        sources=("freeze_protection_config.enable",),
+    ),
+    TelemetryField(
+        key="freeze_protection_temperature",
+        type=float,
+        sources=("freeze_protection_config.temperature",),
+    ),
+    TelemetryField(
+        key="child_lock_enable",
+        type=bool,
+        sources=("child_lock_config.enable",),
+    ),
+    TelemetryField(
+        key="temperature_control_enable",
+        type=bool,
+        sources=("temperature_control.enable", "temperature_control_enable"),
+    ),
+    TelemetryField(
+        key="temperature_control_mode",
+        type=int,
+        sources=("temperature_control.mode", "temperature_control_mode"),
+        values={"auto": 0, "manual": 1},
+    ),
+)
+
+def _as_int(value):
+    return None if value is None else int(value)
+
+
+WT101_SETTINGS: tuple[DownlinkSetting, ...] = (
+    DownlinkSetting(
+        keys=("child_lock_enable",),
+        build=lambda v: {"child_lock_config": {"enable": int(v["child_lock_enable"])}},
+    ),
+    DownlinkSetting(
+        keys=("freeze_protection_enable", "freeze_protection_temperature"),
+        build=lambda v: {
+            "freeze_protection_config": {
+                "enable": int(bool(v["freeze_protection_enable"])),
+                "temperature": v["freeze_protection_temperature"],
+            }
+        },
+        tolerance=0.05,
+    ),
+    DownlinkSetting(
+        keys=("report_interval",),
+        build=lambda v: {"report_interval": v["report_interval"]},
+    ),
+    DownlinkSetting(
+        keys=("target_temperature", "temperature_tolerance"),
+        build=lambda v: {
+            "target_temperature": v["target_temperature"],
+            "temperature_tolerance": v["temperature_tolerance"] or 1,
+        },
+        tolerance=0.05,
+    ),
+    DownlinkSetting(
+        keys=("temperature_control_enable", "temperature_control_mode"),
+        build=lambda v: {
+            "temperature_control": {
+                key: value
+                for key, value in (
+                    ("enable", _as_int(v["temperature_control_enable"])),
+                    ("mode", v["temperature_control_mode"]),
+                )
+                if value is not None
+            }
+        },
+    ),
+    DownlinkSetting(
+        keys=("time_sync_enable",),
+        # The encoder's enable value for time sync is 2, not 1.
+        build=lambda v: {"time_sync_enable": 2 if v["time_sync_enable"] else 0},
+    ),
+)
+
+WT101 = ModelDescriptor(
+    model="WT101",
+    codec="wt101",
+    sensors=WT101_SENSORS,
+    binary_sensors=WT101_BINARIES,
+    controls=frozenset(
+        {"child_lock", "freeze_protection", "target_temperature", "reboot", "report_status"}
+    ),
+    climate=True,
+    telemetry=WT101_TELEMETRY,
+    settings=WT101_SETTINGS,
+    heating_schedule_slots=16,
+    time_sync=True,
+)
@@ -7,26 +7,45 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, SIGNAL_NEW_DEVICE
+from .const import (
+    CONF_ENTITY_PROFILE,
+    DEFAULT_ENTITY_PROFILE,
+    DOMAIN,
+    SIGNAL_NEW_DEVICE,
+)
 from .manager import MilesightManager
+from .models import get_model_registry
+from .profiles import include_control, replaced_by_climate
 from .numbers import MilesightTargetTempNumber
 
-_SUPPORTED_TARGET_TEMP_MODELS = {"WT101"}
+# Control key (see models/registry.py) -> entity class
+_CONTROLS = {
+    "target_temperature": MilesightTargetTempNumber,
+}
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     manager: MilesightManager = hass.data[DOMAIN][entry.entry_id]
+    profile = entry.options.get(CONF_ENTITY_PROFILE, DEFAULT_ENTITY_PROFILE)
+    models = get_model_registry()
 
     @callback
     def _async_add_device(dev_eui: str) -> None:
         device = manager.get_device(dev_eui)
         if not device:
             return
-        entities = []
-        if device.model.upper() in _SUPPORTED_TARGET_TEMP_MODELS:
-            entities.append(MilesightTargetTempNumber(manager, device, entry.entry_id))
+        descriptor = models.get(device.model)
+        if descriptor is None:
+            return
+        entities = [
+            entity_cls(manager, device, entry.entry_id)
+            for key, entity_cls in _CONTROLS.items()
+            if key in descriptor.controls
+            and include_control(profile, key)
+            and not replaced_by_climate(entry.options, device.model, key)
+        ]
         if entities:
             async_add_entities(entities)
 
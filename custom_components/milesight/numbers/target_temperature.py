@@ -9,10 +9,11 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 
 from ..const import DOMAIN, SIGNAL_DEVICE_UPDATED
+from ..entity import MilesightDeviceEntity
 from ..manager import MilesightManager, MilesightDevice
 
 
-class MilesightTargetTempNumber(NumberEntity):
+class MilesightTargetTempNumber(MilesightDeviceEntity, NumberEntity):
     """Set target temperature via downlink; reflect from telemetry."""
 
     _attr_should_poll = False
@@ -61,6 +62,7 @@ class MilesightTargetTempNumber(NumberEntity):
         self._attr_extra_state_attributes = {
             "last_seen": device.last_seen.isoformat(),
             "model": device.model,
+            "stale": device.stale,
         }
         self.async_write_ha_state()
 
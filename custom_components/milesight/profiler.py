@@ -0,0 +1,123 @@
+"""On-demand cProfile capture around the uplink/downlink hot paths."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import pstats
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from homeassistant.exceptions import HomeAssistantError
+
+
+class _Capture:
+    """One capture's profile and how many wrapped calls have it enabled."""
+
+    __slots__ = ("profile", "depth")
+
+    def __init__(self) -> None:
+        self.profile = cProfile.Profile()
+        self.depth = 0
+
+
+class HotPathProfiler:
+    """Profile selected coroutines only while a capture is running.
+
+    When idle the hot paths pay a single attribute check. While active, the
+    profiler is enabled for the duration of each wrapped call; overlapping
+    calls share one enable/disable pair. Calls still running when a capture
+    stops only touch that capture, never the next one.
+
+    cProfile hooks the thread, not the task: while a wrapped call is
+    suspended (MQTT publish, codec worker), whatever else the loop runs is
+    captured too, so times are wall-clock including interleaved loop work.
+    """
+
+    def __init__(self) -> None:
+        self._capture: Optional[_Capture] = None
+        self._max_calls: Optional[int] = None
+        self._done: Optional[asyncio.Event] = None
+        self.calls = 0
+
+    @property
+    def active(self) -> bool:
+        return self._capture is not None
+
+    def start(self, max_calls: Optional[int] = None) -> None:
+        if self._capture is not None:
+            raise HomeAssistantError("A profile capture is already running")
+        self._capture = _Capture()
+        self._max_calls = max_calls
+        self._done = asyncio.Event()
+        self.calls = 0
+
+    async def async_profile(
+        self, func: Callable[..., Awaitable[Any]], *args: Any, count: bool = True
+    ) -> Any:
+        """Await ``func(*args)`` with the profiler enabled, across its awaits.
+
+        ``count=False`` profiles without counting towards ``max_calls`` (used
+        for the second half of a queued uplink).
+        """
+        capture = self._capture
+        if capture is None:
+            return await func(*args)
+        if capture.depth == 0:
+            try:
+                capture.profile.enable()
+            except ValueError:
+                # Another profiler (e.g. HA's profiler integration) owns the hook.
+                return await func(*args)
+        capture.depth += 1
+        try:
+            return await func(*args)
+        finally:
+            capture.depth -= 1
+            # stop() already disabled a finished capture's profile.
+            if capture is self._capture:
+                if capture.depth == 0:
+                    capture.profile.disable()
+                if count:
+                    self.calls += 1
+                if self._max_calls and self.calls >= self._max_calls and self._done:
+                    self._done.set()
+
+    async def async_wait(self, timeout: float) -> None:
+        """Wait until ``max_calls`` were captured or ``timeout`` elapsed."""
+        if self._done is None:
+            return
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def stop(self) -> cProfile.Profile:
+        capture = self._capture
+        if capture is None:
+            raise HomeAssistantError("No profile capture is running")
+        if capture.depth:
+            capture.profile.disable()
+        self._capture = None
+        self._done = None
+        return capture.profile
+
+
+def summarize_profile(profile: cProfile.Profile, top: int) -> List[Dict[str, Any]]:
+    """Return the ``top`` functions by cumulative time."""
+    stats = pstats.Stats(profile)
+    rows = sorted(
+        stats.stats.items(),  # type: ignore[attr-defined]
+        key=lambda item: item[1][3],
+        reverse=True,
+    )[:top]
+    summary: List[Dict[str, Any]] = []
+    for (filename, line, func), (_cc, ncalls, tottime, cumtime, _callers) in rows:
+        summary.append(
+            {
+                "function": f"{filename}:{line}({func})",
+                "calls": ncalls,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3),
+            }
+        )
+    return summary
@@ -0,0 +1,50 @@
+"""Entity footprint profiles selecting which entities each device gets."""
+
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+from homeassistant.helpers.entity import EntityCategory
+
+from .const import (
+    CONF_CLIMATE_REPLACES_ENTITIES,
+    DEFAULT_CLIMATE_REPLACES_ENTITIES,
+    ENTITY_PROFILE_FULL,
+    ENTITY_PROFILE_MINIMAL,
+)
+from .models import get_model_registry
+
+# Controls kept in the minimal profile (everything else is config noise there).
+MINIMAL_CONTROLS = {"target_temperature"}
+
+# Keys rendered by the thermostat climate entity.
+CLIMATE_KEYS = {"temperature", "target_temperature", "valve_opening", "freeze_protection"}
+
+
+def include_description(profile: str, description: Any) -> bool:
+    """Return True if a sensor/binary sensor description is instantiated.
+
+    full keeps everything, standard drops diagnostic entities and minimal
+    keeps only uncategorised (primary) measurements.
+    """
+    if profile == ENTITY_PROFILE_FULL:
+        return True
+    category = getattr(description, "entity_category", None)
+    if profile == ENTITY_PROFILE_MINIMAL:
+        return category is None
+    return category != EntityCategory.DIAGNOSTIC
+
+
+def include_control(profile: str, key: str) -> bool:
+    """Return True if the switch/number/button with ``key`` is instantiated."""
+    return profile != ENTITY_PROFILE_MINIMAL or key in MINIMAL_CONTROLS
+
+
+def replaced_by_climate(entry_options: Mapping[str, Any], model: str, key: str) -> bool:
+    """Return True if the climate entity replaces the entity for ``key``."""
+    if key not in CLIMATE_KEYS or not entry_options.get(
+        CONF_CLIMATE_REPLACES_ENTITIES, DEFAULT_CLIMATE_REPLACES_ENTITIES
+    ):
+        return False
+    descriptor = get_model_registry().get(model)
+    return descriptor is not None and descriptor.climate
@@ -0,0 +1,271 @@
+"""Desired-state configuration reconciled against reported telemetry."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from .models import DownlinkSetting, ModelRegistry
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds to wait for a device to report a sent setting before resending it.
+RETRY_INTERVAL = 1800.0
+
+# Wait after a failed send, doubled per consecutive failure up to the max.
+FAILURE_BACKOFF = 300.0
+MAX_FAILURE_BACKOFF = 86400.0
+
+# (model, ((setting, canonical key -> desired value), ...)) for one device
+_Plan = Tuple[str, Tuple[Tuple[DownlinkSetting, Dict[str, Any]], ...]]
+
+
+class ConfigReconciler:
+    """Drive devices towards a desired configuration one uplink at a time.
+
+    Policies apply in layers: fleet, then groups in the order they were
+    defined, then per-device overrides. Keys are canonical telemetry keys
+    that the device's model can write through a ``DownlinkSetting``.
+
+    ``check`` only looks at the device that just reported. Resolved per-device
+    plans are cached until a policy changes, so one uplink costs one
+    comparison per desired key.
+    """
+
+    def __init__(self, models: ModelRegistry, retry_interval: float = RETRY_INTERVAL) -> None:
+        self._models = models
+        self.retry_interval = retry_interval
+        self._fleet: Dict[str, Any] = {}
+        self._groups: Dict[str, Tuple[frozenset[str], Dict[str, Any]]] = {}
+        self._devices: Dict[str, Dict[str, Any]] = {}
+        self._plans: Dict[str, _Plan] = {}
+        # dev_eui -> canonical key -> (value sent, when)
+        self._pending: Dict[str, Dict[str, Tuple[Any, float]]] = {}
+        # dev_eui -> (no retry before, current backoff)
+        self._backoff: Dict[str, Tuple[float, float]] = {}
+        self.checked = 0
+        self.in_sync = 0
+        self.commands = 0
+        self.fields_sent = 0
+        self.failures = 0
+
+    @property
+    def active(self) -> bool:
+        return bool(self._fleet or self._groups or self._devices)
+
+    def set_policy(
+        self,
+        config: Mapping[str, Any],
+        dev_euis: Iterable[str] = (),
+        group: Optional[str] = None,
+        replace: bool = False,
+    ) -> None:
+        """Merge ``config`` into a device, group or (neither given) fleet policy.
+
+        A ``None`` value removes the key; with ``replace`` the previous policy
+        is dropped first. Group membership is replaced when ``dev_euis`` is
+        given together with ``group``. Keys written by one command (e.g.
+        freeze protection enable and temperature) must be set together.
+        """
+        unknown = set(config) - self._models.writable
+        if unknown:
+            raise ValueError(f"Not writable: {', '.join(sorted(unknown))}")
+        dev_euis = [dev_eui.lower().strip() for dev_eui in dev_euis]
+        if group is not None:
+            members, current = self._groups.get(group, (frozenset(), {}))
+            merged = self._complete(_merge({} if replace else current, config))
+            if dev_euis:
+                members = frozenset(dev_euis)
+            if merged:
+                self._groups[group] = (members, merged)
+            else:
+                self._groups.pop(group, None)
+        elif dev_euis:
+            updates = {
+                dev_eui: self._complete(
+                    _merge({} if replace else self._devices.get(dev_eui, {}), config)
+                )
+                for dev_eui in dev_euis
+            }
+            for dev_eui, merged in updates.items():
+                if merged:
+                    self._devices[dev_eui] = merged
+                else:
+                    self._devices.pop(dev_eui, None)
+        else:
+            self._fleet = self._complete(_merge({} if replace else self._fleet, config))
+        self._plans.clear()
+        self._backoff.clear()
+
+    def _complete(self, policy: Dict[str, Any]) -> Dict[str, Any]:
+        """Return ``policy``, or raise if it sets only part of a key group."""
+        for keys in self._models.setting_keys:
+            missing = [key for key in keys if key not in policy]
+            if missing and len(missing) < len(keys):
+                present = [key for key in keys if key in policy]
+                raise ValueError(
+                    f"{', '.join(present)} must be set together with {', '.join(missing)}"
+                )
+        return policy
+
+    def desired(self, dev_eui: str) -> Dict[str, Any]:
+        """Desired config for one device with all layers applied."""
+        desired = dict(self._fleet)
+        for members, config in self._groups.values():
+            if dev_eui in members:
+                desired.update(config)
+        desired.update(self._devices.get(dev_eui, {}))
+        return desired
+
+    def _plan(self, dev_eui: str, model: str) -> _Plan:
+        plan = self._plans.get(dev_eui)
+        if plan is not None and plan[0] == model:
+            return plan
+        descriptor = self._models.get(model)
+        schema = self._models.schema(model)
+        settings = []
+        if descriptor is not None and schema is not None:
+            desired = self.desired(dev_eui)
+            for setting in descriptor.settings:
+                wanted = {}
+                for key in setting.keys:
+                    if key not in desired:
+                        continue
+                    value = schema.coerce(key, desired[key])
+                    if value is None:
+                        _LOGGER.warning(
+                            "Ignoring invalid desired %s=%r for %s", key, desired[key], dev_eui
+                        )
+                        continue
+                    wanted[key] = value
+                if wanted:
+                    settings.append((setting, wanted))
+        plan = self._plans[dev_eui] = (model, tuple(settings))
+        return plan
+
+    def check(
+        self,
+        dev_eui: str,
+        model: str,
+        reported: Mapping[str, Any],
+        now: float,
+    ) -> Optional[Dict[str, Any]]:
+        """Encoder payload for the settings that differ, or None when in sync.
+
+        The returned fields are recorded as pending: they are not resent
+        until ``retry_interval`` passes without the device confirming them.
+        A key the device never reports is assumed applied once sent. A
+        setting is skipped while any of its keys is neither desired nor
+        reported, and nothing is sent during a failure backoff.
+        """
+        _model, settings = self._plan(dev_eui, model)
+        if not settings:
+            return None
+        backoff = self._backoff.get(dev_eui)
+        if backoff is not None and now < backoff[0]:
+            return None
+        self.checked += 1
+        pending = self._pending.get(dev_eui)
+        payload: Dict[str, Any] = {}
+        sent: Dict[str, Any] = {}
+        for setting, wanted in settings:
+            values = {key: reported.get(key) for key in setting.keys}
+            values.update(wanted)
+            if any(value is None for value in values.values()):
+                continue
+            changed = False
+            for key, value in wanted.items():
+                have = reported.get(key)
+                if _equal(have, value, setting.tolerance):
+                    if pending:
+                        pending.pop(key, None)
+                    continue
+                if pending and key in pending:
+                    sent_value, sent_at = pending[key]
+                    if sent_value == value and (
+                        have is None or now - sent_at < self.retry_interval
+                    ):
+                        continue
+                changed = True
+            if changed:
+                payload.update(setting.build(values))
+                sent.update(wanted)
+        if pending is not None and not pending:
+            del self._pending[dev_eui]
+        if not payload:
+            self.in_sync += 1
+            self._backoff.pop(dev_eui, None)
+            return None
+        pending = self._pending.setdefault(dev_eui, {})
+        for key, value in sent.items():
+            pending[key] = (value, now)
+        self.commands += 1
+        self.fields_sent += len(sent)
+        return payload
+
+    def failed(self, dev_eui: str, now: float) -> None:
+        """Forget pending fields after a failed send and back off retrying."""
+        self.failures += 1
+        self._pending.pop(dev_eui, None)
+        previous = self._backoff.get(dev_eui)
+        delay = min(previous[1] * 2, MAX_FAILURE_BACKOFF) if previous else FAILURE_BACKOFF
+        self._backoff[dev_eui] = (now + delay, delay)
+
+    def forget(self, dev_eui: str) -> None:
+        self._pending.pop(dev_eui, None)
+        self._plans.pop(dev_eui, None)
+        self._backoff.pop(dev_eui, None)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Policies, for storage and diagnostics."""
+        return {
+            "fleet": self._fleet,
+            "groups": {
+                name: {"members": sorted(members), "config": config}
+                for name, (members, config) in self._groups.items()
+            },
+            "devices": self._devices,
+        }
+
+    def restore(self, stored: Mapping[str, Any]) -> None:
+        self._fleet = dict(stored.get("fleet") or {})
+        self._groups = {
+            name: (frozenset(item.get("members") or ()), dict(item.get("config") or {}))
+            for name, item in (stored.get("groups") or {}).items()
+        }
+        self._devices = {
+            dev_eui: dict(config) for dev_eui, config in (stored.get("devices") or {}).items()
+        }
+        self._plans.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "checked": self.checked,
+            "in_sync": self.in_sync,
+            "commands": self.commands,
+            "fields_sent": self.fields_sent,
+            "failures": self.failures,
+            "pending_devices": len(self._pending),
+            "backing_off": len(self._backoff),
+        }
+
+
+def _merge(current: Mapping[str, Any], changes: Mapping[str, Any]) -> Dict[str, Any]:
+    merged = dict(current)
+    for key, value in changes.items():
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _equal(have: Any, want: Any, tolerance: float) -> bool:
+    if have is None:
+        return False
+    if tolerance and isinstance(want, float):
+        try:
+            return abs(float(have) - want) <= tolerance
+        except (TypeError, ValueError):
+            return False
+    return have == want
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
@@ -9,30 +11,73 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, SIGNAL_DEVICE_UPDATED, SIGNAL_NEW_DEVICE
+from .const import (
+    CONF_ENTITY_PROFILE,
+    DEFAULT_ENTITY_PROFILE,
+    DOMAIN,
+    SIGNAL_DEVICE_UPDATED,
+    SIGNAL_NEW_DEVICE,
+    SIGNAL_NEW_LINK,
+)
+from .entity import MilesightDeviceEntity
 from .manager import MilesightManager, MilesightDevice
-from .models import MODEL_SENSORS
+from .models import get_model_registry
+from .profiles import include_description, replaced_by_climate
+from .sensors import (
+    DeadbandFilter,
+    INGEST_METRIC_SENSORS,
+    LINK_QUALITY_SENSORS,
+    MilesightIngestMetricSensor,
+    MilesightLinkQualitySensor,
+)
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     manager: MilesightManager = hass.data[DOMAIN][entry.entry_id]
+    profile = entry.options.get(CONF_ENTITY_PROFILE, DEFAULT_ENTITY_PROFILE)
+    models = get_model_registry()
+
+    async_add_entities(
+        MilesightIngestMetricSensor(manager, description, entry.entry_id, entry.title)
+        for description in INGEST_METRIC_SENSORS
+    )
+
+    def _link_sensors(device: MilesightDevice) -> list[SensorEntity]:
+        return [
+            MilesightLinkQualitySensor(manager, device, description, entry.entry_id)
+            for description in LINK_QUALITY_SENSORS
+            if include_description(profile, description)
+        ]
 
     @callback
     def _async_add_device(dev_eui: str) -> None:
         device = manager.get_device(dev_eui)
         if not device:
             return
-        descriptions = MODEL_SENSORS.get(device.model.upper())
-        if not descriptions:
-            return
-        new_entities: list[MilesightSensor] = []
+        descriptor = models.get(device.model)
+        descriptions = descriptor.sensors if descriptor else ()
+        new_entities: list[SensorEntity] = []
         for description in descriptions:
+            if not include_description(profile, description):
+                continue
+            if replaced_by_climate(entry.options, device.model, description.key):
+                continue
             new_entities.append(
                 MilesightSensor(manager, device, description, entry.entry_id)
             )
-        async_add_entities(new_entities)
+        if dev_eui in manager.link_quality.devices:
+            new_entities.extend(_link_sensors(device))
+        if new_entities:
+            async_add_entities(new_entities)
+
+    @callback
+    def _async_add_link(dev_eui: str) -> None:
+        """Add link sensors once a known device first reports link data."""
+        device = manager.get_device(dev_eui)
+        if device and (new_entities := _link_sensors(device)):
+            async_add_entities(new_entities)
 
     # Add existing devices (if any)
     for dev_eui in list(manager.devices.keys()):
@@ -43,9 +88,24 @@ async def async_setup_entry(
             hass, SIGNAL_NEW_DEVICE.format(entry_id=entry.entry_id), _async_add_device
         )
     )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_LINK.format(entry_id=entry.entry_id), _async_add_link
+        )
+    )
 
 
-class MilesightSensor(SensorEntity):
+def _resolve_path(telemetry: dict, path: str) -> Any:
+    """Follow a dotted path through nested telemetry dicts."""
+    value: Any = telemetry
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+class MilesightSensor(MilesightDeviceEntity, SensorEntity):
     """Represents a single Milesight datapoint."""
 
     _attr_should_poll = False
@@ -66,6 +126,8 @@ class MilesightSensor(SensorEntity):
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self._dev_eui)},
         )
+        self._filter = DeadbandFilter.from_description(description)
+        self._last_flags: tuple[bool, bool] | None = None
 
     async def async_added_to_hass(self) -> None:
         self.async_on_remove(
@@ -84,37 +146,28 @@ class MilesightSensor(SensorEntity):
         device = self._manager.get_device(self._dev_eui)
         if not device:
             return
-        value = device.telemetry.get(self.entity_description.key)
-        if self.entity_description.key == "lorawan_class":
-            # Map class index to friendly label, fall back to raw if unknown.
-            mapping = {
-                "0": "Class A",
-                "1": "Class B",
-                "2": "Class C",
-                "3": "Class CtoB",
-                0: "Class A",
-                1: "Class B",
-                2: "Class C",
-                3: "Class CtoB",
-            }
-            value = mapping.get(value, value)
-        elif self.entity_description.key == "motor_calibration_result":
-            mapping = {
-                "0": "success",
-                "1": "fail: out of range",
-                "2": "fail: uninstalled",
-                "3": "calibration cleared",
-                "4": "temperature control disabled",
-                0: "success",
-                1: "fail: out of range",
-                2: "fail: uninstalled",
-                3: "calibration cleared",
-                4: "temperature control disabled",
-            }
-            value = mapping.get(value, value)
+        description = self.entity_description
+        path = getattr(description, "path", None)
+        value = (
+            _resolve_path(device.telemetry, path)
+            if path
+            else device.telemetry.get(description.key)
+        )
+        value_map = getattr(description, "value_map", None)
+        if value_map and value is not None:
+            value = value_map.get(value, value)
+        if self._filter is not None:
+            flags = (device.available, device.stale)
+            if flags != self._last_flags:
+                # Availability changes must always reach the state machine.
+                self._last_flags = flags
+                self._filter.reset()
+            if not self._filter.should_write(value):
+                return
         self._attr_native_value = value
         self._attr_extra_state_attributes = {
             "last_seen": device.last_seen.isoformat(),
             "model": device.model,
+            "stale": device.stale,
         }
         self.async_write_ha_state()
@@ -0,0 +1,15 @@
+"""Sensor entity helpers for Milesight."""
+
+from __future__ import annotations
+
+from .deadband import DeadbandFilter
+from .ingest_metrics import INGEST_METRIC_SENSORS, MilesightIngestMetricSensor
+from .link_quality import LINK_QUALITY_SENSORS, MilesightLinkQualitySensor
+
+__all__ = [
+    "DeadbandFilter",
+    "INGEST_METRIC_SENSORS",
+    "LINK_QUALITY_SENSORS",
+    "MilesightIngestMetricSensor",
+    "MilesightLinkQualitySensor",
+]
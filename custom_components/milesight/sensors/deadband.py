@@ -0,0 +1,81 @@
+"""Write filtering for noisy numeric sensor values."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Optional
+
+
+class DeadbandFilter:
+    """Decide whether a new numeric value is worth a state write."""
+
+    __slots__ = (
+        "deadband",
+        "deadband_relative",
+        "min_interval",
+        "max_silence",
+        "_value",
+        "_written_at",
+    )
+
+    def __init__(
+        self,
+        deadband: Optional[float] = None,
+        deadband_relative: Optional[float] = None,
+        min_interval: Optional[float] = None,
+        max_silence: Optional[float] = None,
+    ) -> None:
+        self.deadband = deadband
+        self.deadband_relative = deadband_relative
+        self.min_interval = min_interval
+        self.max_silence = max_silence
+        self._value: Optional[float] = None
+        self._written_at = 0.0
+
+    @classmethod
+    def from_description(cls, description: Any) -> Optional["DeadbandFilter"]:
+        """Build a filter if the description configures any option."""
+        options = (
+            getattr(description, "deadband", None),
+            getattr(description, "deadband_relative", None),
+            getattr(description, "min_interval", None),
+            getattr(description, "max_silence", None),
+        )
+        if not any(option is not None for option in options):
+            return None
+        return cls(*options)
+
+    def reset(self) -> None:
+        """Force the next value through (e.g. after an availability change)."""
+        self._value = None
+
+    def should_write(self, value: Any, now: Optional[float] = None) -> bool:
+        """Return True and remember the value if it should be written."""
+        if now is None:
+            now = time.monotonic()
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            self._value = None
+            return True
+        if self._value is not None:
+            elapsed = now - self._written_at
+            heartbeat = self.max_silence is not None and elapsed >= self.max_silence
+            if not heartbeat:
+                if self.min_interval is not None and elapsed < self.min_interval:
+                    return False
+                if not self._changed(value):
+                    return False
+        self._value = float(value)
+        self._written_at = now
+        return True
+
+    def _changed(self, value: float) -> bool:
+        assert self._value is not None
+        delta = abs(value - self._value)
+        thresholds = []
+        if self.deadband is not None:
+            thresholds.append(self.deadband)
+        if self.deadband_relative is not None:
+            thresholds.append(self.deadband_relative * abs(self._value))
+        if not thresholds:
+            return True
+        return delta > 0 and delta >= min(thresholds)
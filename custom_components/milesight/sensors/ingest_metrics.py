@@ -0,0 +1,121 @@
+"""Integration-level ingest metric sensors."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import UnitOfTime
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+
+from ..const import DOMAIN
+from ..manager import MilesightManager
+from ..metrics import STAGE_TOTAL, STAGES
+
+
+@dataclass(frozen=True, kw_only=True)
+class MilesightMetricSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor that reads the manager's ingest counters."""
+
+    value_fn: Callable[[MilesightManager], float | int | None]
+
+
+def _p95_ms(manager: MilesightManager) -> float | None:
+    value = manager.metrics.stages[STAGE_TOTAL].percentile(95)
+    return round(value * 1000, 3) if value is not None else None
+
+
+INGEST_METRIC_SENSORS: tuple[MilesightMetricSensorEntityDescription, ...] = (
+    MilesightMetricSensorEntityDescription(
+        key="ingest_messages_per_second",
+        name="Ingest Messages Per Second",
+        native_unit_of_measurement="msg/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda manager: round(manager.metrics.messages.rate(), 2),
+    ),
+    MilesightMetricSensorEntityDescription(
+        key="ingest_latency_p95",
+        name="Ingest Latency P95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_p95_ms,
+    ),
+    MilesightMetricSensorEntityDescription(
+        key="ingest_dropped",
+        name="Ingest Dropped Messages",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda manager: manager.metrics.dropped,
+    ),
+    MilesightMetricSensorEntityDescription(
+        key="registry_calls_per_second",
+        name="Registry Calls Per Second",
+        native_unit_of_measurement="calls/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda manager: round(manager.metrics.registry_calls.rate(), 2),
+    ),
+    MilesightMetricSensorEntityDescription(
+        key="ingest_duplicates",
+        name="Ingest Duplicate Frames",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda manager: manager.dedupe.duplicates if manager.dedupe else None,
+    ),
+    MilesightMetricSensorEntityDescription(
+        key="ingest_queue_depth",
+        name="Ingest Queue Depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda manager: len(manager.queue) if manager.queue is not None else None,
+    ),
+    MilesightMetricSensorEntityDescription(
+        key="ingest_queue_dropped",
+        name="Ingest Queue Dropped",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda manager: manager.queue.dropped if manager.queue is not None else None,
+    ),
+)
+
+
+class MilesightIngestMetricSensor(SensorEntity):
+    """Expose one ingest metric; polled so the uplink path never writes it."""
+
+    _attr_should_poll = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        manager: MilesightManager,
+        description: MilesightMetricSensorEntityDescription,
+        entry_id: str,
+        entry_title: str,
+    ) -> None:
+        self.entity_description = description
+        self._manager = manager
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry_id)},
+            manufacturer="Milesight",
+            name=entry_title,
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_update(self) -> None:
+        metrics = self._manager.metrics
+        self._attr_native_value = self.entity_description.value_fn(self._manager)
+        if self.entity_description.key == "ingest_latency_p95":
+            attrs = {}
+            for stage in STAGES:
+                value = metrics.stages[stage].percentile(95)
+                attrs[f"{stage}_p95_ms"] = (
+                    round(value * 1000, 3) if value is not None else None
+                )
+            self._attr_extra_state_attributes = attrs
+        elif (
+            self.entity_description.key == "ingest_queue_depth"
+            and self._manager.queue is not None
+        ):
+            self._attr_extra_state_attributes = self._manager.queue.stats()
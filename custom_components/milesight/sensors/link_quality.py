@@ -0,0 +1,87 @@
+"""Per-device link-quality sensors fed by the manager's aggregates."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import SIGNAL_STRENGTH_DECIBELS
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+
+from ..const import DOMAIN, SIGNAL_DEVICE_UPDATED
+from ..entity import MilesightDeviceEntity
+from ..link_quality import LinkQualityTracker
+from ..manager import MilesightDevice, MilesightManager
+
+
+@dataclass(frozen=True, kw_only=True)
+class MilesightLinkSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor that reads a device's link-quality aggregate."""
+
+    value_fn: Callable[[LinkQualityTracker, str], float | str | None]
+
+
+LINK_QUALITY_SENSORS: tuple[MilesightLinkSensorEntityDescription, ...] = (
+    MilesightLinkSensorEntityDescription(
+        key="best_gateway",
+        name="Best Gateway",
+        icon="mdi:router-wireless",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda tracker, dev_eui: tracker.best_gateway(dev_eui),
+    ),
+    MilesightLinkSensorEntityDescription(
+        key="link_margin",
+        name="Link Margin",
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda tracker, dev_eui: tracker.link_margin(dev_eui),
+    ),
+)
+
+
+class MilesightLinkQualitySensor(MilesightDeviceEntity, SensorEntity):
+    """Link-quality summary for one device across its gateways."""
+
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        manager: MilesightManager,
+        device: MilesightDevice,
+        description: MilesightLinkSensorEntityDescription,
+        entry_id: str,
+    ) -> None:
+        self.entity_description = description
+        self._manager = manager
+        self._dev_eui = device.dev_eui.lower()
+        self._entry_id = entry_id
+        self._attr_unique_id = f"{self._dev_eui}_{description.key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, self._dev_eui)})
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_DEVICE_UPDATED.format(
+                    entry_id=self._entry_id, dev_eui=self._dev_eui
+                ),
+                self._async_handle_update,
+            )
+        )
+        self._async_handle_update(self._dev_eui)
+
+    @callback
+    def _async_handle_update(self, _dev_eui: str) -> None:
+        tracker = self._manager.link_quality
+        self._attr_native_value = self.entity_description.value_fn(tracker, self._dev_eui)
+        if self.entity_description.key == "best_gateway":
+            self._attr_extra_state_attributes = tracker.link_attributes(self._dev_eui)
+        self.async_write_ha_state()
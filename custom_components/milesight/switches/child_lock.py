@@ -8,12 +8,14 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 
 from ..const import DOMAIN, SIGNAL_DEVICE_UPDATED
+from ..entity import MilesightDeviceEntity
 from ..manager import MilesightManager, MilesightDevice
 
-_CHILD_LOCK_KEY = "child_lock_config.enable"
+# Canonical key produced by the model telemetry schema
+_CHILD_LOCK_KEY = "child_lock_enable"
 
 
-class MilesightChildLockSwitch(SwitchEntity):
+class MilesightChildLockSwitch(MilesightDeviceEntity, SwitchEntity):
     _attr_should_poll = False
     _attr_entity_registry_enabled_default = True
     _attr_entity_category = EntityCategory.CONFIG
@@ -55,17 +57,13 @@ class MilesightChildLockSwitch(SwitchEntity):
         self._attr_extra_state_attributes = {
             "last_seen": device.last_seen.isoformat(),
             "model": device.model,
+            "stale": device.stale,
         }
         self.async_write_ha_state()
 
     def _extract_child_lock(self, device: MilesightDevice) -> bool:
         """Read child lock state from telemetry."""
-        value = None
-        if isinstance(device.telemetry.get("child_lock_config"), dict):
-            value = device.telemetry["child_lock_config"].get("enable")
-        if value is None:
-            value = device.telemetry.get(_CHILD_LOCK_KEY)
-        return str(value).lower() in ("1", "on", "true", "enabled", "enable")
+        return bool(device.telemetry.get(_CHILD_LOCK_KEY))
 
     async def async_turn_on(self, **kwargs) -> None:
         await self._send_child_lock(True)
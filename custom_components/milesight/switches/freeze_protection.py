@@ -10,12 +10,14 @@ from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity import EntityCategory
 
 from ..const import DOMAIN, SIGNAL_DEVICE_UPDATED
+from ..entity import MilesightDeviceEntity
 from ..manager import MilesightManager, MilesightDevice
 
-_FREEZE_PROTECTION_KEY = "freeze_protection_config.enable"
+# Canonical key produced by the model telemetry schema
+_FREEZE_PROTECTION_KEY = "freeze_protection_enable"
 
 
-class MilesightFreezeProtectionSwitch(SwitchEntity):
+class MilesightFreezeProtectionSwitch(MilesightDeviceEntity, SwitchEntity):
     _attr_should_poll = False
     _attr_entity_registry_enabled_default = True
     _attr_entity_category = EntityCategory.CONFIG
@@ -57,16 +59,12 @@ class MilesightFreezeProtectionSwitch(SwitchEntity):
         self._attr_extra_state_attributes = {
             "last_seen": device.last_seen.isoformat(),
             "model": device.model,
+            "stale": device.stale,
         }
         self.async_write_ha_state()
 
     def _extract_state(self, device: MilesightDevice) -> bool:
-        value = None
-        if isinstance(device.telemetry.get("freeze_protection_config"), dict):
-            value = device.telemetry["freeze_protection_config"].get("enable")
-        if value is None:
-            value = device.telemetry.get(_FREEZE_PROTECTION_KEY)
-        return str(value).lower() in ("1", "on", "true", "enabled", "enable")
+        return bool(device.telemetry.get(_FREEZE_PROTECTION_KEY))
 
     async def async_turn_on(self, **kwargs) -> None:
         await self._send_state(True)
@@ -0,0 +1,244 @@
+"""Fleet-wide clock, time zone and DST configuration with staggered sends."""
+
+from __future__ import annotations
+
+import calendar
+import hashlib
+import json
+import random
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# Frame kinds: full time zone/DST config (plus a clock sync) or clock sync only.
+FRAME_CONFIG = "config"
+FRAME_SYNC = "sync"
+
+# A device with a stale config becomes due at a random point this many
+# seconds after its first uplink following a trigger (startup, time zone
+# change, DST transition); the frame goes out with the first uplink after
+# that, so sends spread over the window plus a report period.
+JITTER_WINDOW = 1800.0
+
+# Telemetry key carrying the device clock (epoch seconds), when reported.
+DEVICE_TIME_KEY = "timestamp"
+DRIFT_THRESHOLD = 120.0
+SYNC_COOLDOWN = 3600.0
+
+# (UTC instant, UTC offset before, UTC offset after)
+_Transition = Tuple[datetime, timedelta, timedelta]
+
+
+def _transitions(tz: tzinfo, year: int) -> List[_Transition]:
+    """UTC offset changes of ``tz`` during ``year``, to the minute."""
+    found: List[_Transition] = []
+    day = datetime(year, 1, 1, tzinfo=timezone.utc)
+    end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+    offset = day.astimezone(tz).utcoffset()
+    while day < end:
+        following = day + timedelta(days=1)
+        next_offset = following.astimezone(tz).utcoffset()
+        if next_offset != offset:
+            low, high = day, following
+            while high - low > timedelta(minutes=1):
+                middle = low + (high - low) / 2
+                if middle.astimezone(tz).utcoffset() == offset:
+                    low = middle
+                else:
+                    high = middle
+            found.append((high.replace(second=0, microsecond=0), offset, next_offset))
+            offset = next_offset
+        day = following
+    return found
+
+
+def _rule(instant: datetime, offset: timedelta, prefix: str) -> Dict[str, int]:
+    """Month/week/day/time rule for a transition, in local time before it."""
+    local = instant + offset
+    last_day = calendar.monthrange(local.year, local.month)[1]
+    # 5 means the last such weekday of the month ("last Sunday of March").
+    week_num = 5 if local.day + 7 > last_day else (local.day - 1) // 7 + 1
+    return {
+        f"{prefix}_month": local.month,
+        f"{prefix}_week_num": week_num,
+        f"{prefix}_week_day": local.isoweekday(),
+        f"{prefix}_time": local.hour * 60 + local.minute,
+    }
+
+
+def fleet_time_config(tz: tzinfo, year: int) -> Dict[str, Any]:
+    """``time_zone``/``dst_config`` encoder payload for ``tz`` in ``year``."""
+    transitions = _transitions(tz, year)
+    if not transitions:
+        offset = datetime(year, 1, 1, tzinfo=timezone.utc).astimezone(tz).utcoffset()
+        return {
+            "time_zone": int(offset.total_seconds() // 60),  # type: ignore[union-attr]
+            # The encoder packs every field even when DST is disabled.
+            "dst_config": {
+                "enable": 0,
+                "offset": 0,
+                **{
+                    f"{prefix}_{field}": 0
+                    for prefix in ("start", "end")
+                    for field in ("month", "week_num", "week_day", "time")
+                },
+            },
+        }
+    standard = min(min(before, after) for _instant, before, after in transitions)
+    start = next(item for item in transitions if item[2] > item[1])
+    end = next(item for item in transitions if item[2] < item[1])
+    return {
+        "time_zone": int(standard.total_seconds() // 60),
+        "dst_config": {
+            "enable": 1,
+            "offset": int((start[2] - start[1]).total_seconds() // 60),
+            **_rule(start[0], start[1], "start"),
+            **_rule(end[0], end[1], "end"),
+        },
+    }
+
+
+class TimeSyncScheduler:
+    """Keep device clocks and time zone/DST rules in line with Home Assistant.
+
+    The payload is computed once per fleet and encoded once per codec. Each
+    device remembers the fingerprint of the config it was sent; devices with
+    a stale fingerprint become due at a jittered time and get the cached
+    frame with their next uplink. A time zone change or DST transition makes
+    every fingerprint stale; a device clock drifting past
+    ``DRIFT_THRESHOLD`` only gets a clock sync.
+    """
+
+    def __init__(
+        self, spread: float = JITTER_WINDOW, rng: Optional[random.Random] = None
+    ) -> None:
+        self.spread = spread
+        self._rng = rng or random.Random()
+        self.time_zone: Optional[str] = None
+        self.payload: Optional[Dict[str, Any]] = None
+        self.transitions: List[float] = []
+        self._fingerprint: Optional[str] = None
+        self._frames: Dict[Tuple[str, str], Any] = {}
+        # Codecs that cannot encode the current payload; skipped until the
+        # time zone is configured again or the codecs are reloaded.
+        self._unencodable: set[str] = set()
+        self._applied: Dict[str, str] = {}
+        self._due: Dict[str, float] = {}
+        self._last_sync: Dict[str, float] = {}
+        self.configs_sent = 0
+        self.syncs_sent = 0
+        self.drift_detected = 0
+
+    def configure(self, time_zone: str, now: float) -> bool:
+        """Recompute the fleet payload; True when it changed."""
+        self._unencodable.clear()
+        tz = ZoneInfo(time_zone)
+        year = datetime.fromtimestamp(now, tz).year
+        self.transitions = [
+            instant.timestamp()
+            for current in (year, year + 1)
+            for instant, _before, _after in _transitions(tz, current)
+        ]
+        payload = fleet_time_config(tz, year)
+        self.time_zone = time_zone
+        if payload == self.payload:
+            return False
+        self.payload = payload
+        self._fingerprint = hashlib.sha1(
+            json.dumps(payload, sort_keys=True).encode()
+        ).hexdigest()[:12]
+        self._frames.clear()
+        self._due.clear()
+        return True
+
+    def next_transition(self, now: float) -> Optional[float]:
+        return next((instant for instant in self.transitions if instant > now), None)
+
+    def resend_all(self) -> None:
+        """Make every device due again (DST transition), jittered per device."""
+        self._applied.clear()
+        self._due.clear()
+
+    def check(self, dev_eui: str, data: Mapping[str, Any], now: float) -> Optional[str]:
+        """Frame kind to send after this uplink, or None."""
+        if self._fingerprint is None:
+            return None
+        if self._applied.get(dev_eui) != self._fingerprint:
+            due = self._due.get(dev_eui)
+            if due is None:
+                due = self._due[dev_eui] = now + self._rng.uniform(0, self.spread)
+            if due <= now:
+                del self._due[dev_eui]
+                self._applied[dev_eui] = self._fingerprint
+                self._last_sync[dev_eui] = now
+                self.configs_sent += 1
+                return FRAME_CONFIG
+        device_time = data.get(DEVICE_TIME_KEY)
+        if (
+            isinstance(device_time, (int, float))
+            and not isinstance(device_time, bool)
+            and abs(device_time - now) > DRIFT_THRESHOLD
+        ):
+            self.drift_detected += 1
+            if now - self._last_sync.get(dev_eui, float("-inf")) >= SYNC_COOLDOWN:
+                self._last_sync[dev_eui] = now
+                self.syncs_sent += 1
+                return FRAME_SYNC
+        return None
+
+    def failed(self, dev_eui: str) -> None:
+        """Forget a config that could not be published so it is retried."""
+        self._applied.pop(dev_eui, None)
+
+    def can_encode(self, codec: str) -> bool:
+        return codec not in self._unencodable
+
+    def encode_failed(self, codec: str, dev_eui: str) -> None:
+        """Stop sending frames for ``codec``; the device stays due for later."""
+        self._unencodable.add(codec)
+        self._applied.pop(dev_eui, None)
+
+    def frame(self, codec: str, kind: str, encode: Callable[[str, Dict[str, Any]], Any]) -> Any:
+        """Encoded frame for ``codec``, encoded once per fleet payload."""
+        key = (codec, kind)
+        frame = self._frames.get(key)
+        if frame is None:
+            payload = (
+                {**(self.payload or {}), "sync_time": 1}
+                if kind == FRAME_CONFIG
+                else {"sync_time": 1}
+            )
+            frame = self._frames[key] = encode(codec, payload)
+        return frame
+
+    def clear_frames(self) -> None:
+        """Drop encoded frames, e.g. after the codecs were reloaded."""
+        self._frames.clear()
+        self._unencodable.clear()
+
+    def forget(self, dev_eui: str) -> None:
+        self._applied.pop(dev_eui, None)
+        self._due.pop(dev_eui, None)
+        self._last_sync.pop(dev_eui, None)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Applied fingerprints per device, for storage."""
+        return dict(self._applied)
+
+    def restore(self, stored: Mapping[str, str]) -> None:
+        self._applied = dict(stored)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "time_zone": self.time_zone,
+            "payload": self.payload,
+            "next_transition": self.next_transition(datetime.now(timezone.utc).timestamp()),
+            "due": len(self._due),
+            "up_to_date": sum(
+                1 for value in self._applied.values() if value == self._fingerprint
+            ),
+            "configs_sent": self.configs_sent,
+            "syncs_sent": self.syncs_sent,
+            "drift_detected": self.drift_detected,
+            "unencodable": sorted(self._unencodable),
+        }